@@ -0,0 +1,244 @@
+"""
+Hit probability from weapon spread, per target size class and distance.
+
+A shot leaves the muzzle in a random direction inside the spread cone, with
+the slot's spread (vt_spread, atk_spread, hha_spread_max) as the half-angle
+in degrees, scaled by accuracy_mult as the mod resolves it
+(pri_accuracy_mult > accuracy_mult, see combat_engine). Infantry spread
+(hha) is fixed: the mod cannot change CharacterAttachment accuracy. Directions are
+uniform over the cone's cross-section. The shot hits when it lands inside
+the target's silhouette, a rectangle per size class (SIZE_CLASSES).
+
+Monte-Carlo with a fixed sample: SAMPLES unit-disc offsets are drawn once.
+An offset (x, y) lands at (x, y) * d * tan(spread) at distance d, so it
+hits iff max(|x| / half_width, |y| / half_height) <= 1 / (d tan(spread)).
+That ratio is sorted once per class, which turns every (weapon, spread,
+distance) probability into a searchsorted; all weapons are one vectorised
+lookup. Distances beyond the weapon's effective range (speed x lifetime,
+as on the detail tabs) have no probability (nan).
+
+Tables are cached per (projectile, spread, range) in memory and under
+.cache/, so a repeated run only looks them up. Saving deletes the cached
+tables of other hit models (SIZE_CLASSES, DISTANCES, ... changed).
+
+Spread-adjusted DPS = hit probability x sustained slot DPS. Misses deal
+nothing (splash from near misses is not counted).
+
+Run: E:/Anaconda/python.exe accuracy.py [--unit NAME] [--distance D]
+         [--dump PATH] [--config PATH]
+  without --unit, lists the weapons whose hit chance at --distance (default
+  300 m) changes most between vanilla and modded
+"""
+import argparse
+import hashlib
+import os
+import pickle
+
+import numpy as np
+
+from combat_engine import CombatModel
+from dump_cache import CACHE_DIR, load_indexed_dump, prune
+
+# Target silhouettes: class -> (half width, half height) in metres
+SIZE_CLASSES = {"infantry": (0.5, 0.9), "vehicle": (1.75, 1.25), "structure": (8.0, 5.0)}
+DISTANCES = (25, 50, 100, 150, 200, 300, 400, 600, 800, 1000)
+SAMPLES = 20_000
+SEED = 0
+# Bump when the hit model changes
+CACHE_VERSION = 1
+
+# ══════════════════════════════════════════════════════════════
+# SAMPLER
+# ══════════════════════════════════════════════════════════════
+
+_ratios = None
+
+def class_ratios():
+    """(classes, SAMPLES) sorted hit ratios of the fixed unit-disc sample."""
+    global _ratios
+    if _ratios is None:
+        rng = np.random.default_rng(SEED)
+        r = np.sqrt(rng.random(SAMPLES))
+        a = rng.random(SAMPLES) * 2 * np.pi
+        x, y = np.abs(r * np.cos(a)), np.abs(r * np.sin(a))
+        _ratios = np.sort([np.maximum(x / hw, y / hh) for hw, hh in SIZE_CLASSES.values()],
+                          axis=1)
+    return _ratios
+
+def hit_probability(spread, eff_range, distances=DISTANCES):
+    """(..., classes, distances) hit probability for spread / eff_range arrays.
+
+    nan beyond eff_range; 1 for a spread of 0 (within range).
+    """
+    spread = np.asarray(spread, dtype=float)[..., None, None]
+    rng = np.asarray(eff_range, dtype=float)[..., None, None]
+    d = np.asarray(distances, dtype=float)
+    with np.errstate(divide="ignore"):
+        limit = 1.0 / (d * np.tan(np.radians(np.clip(spread, 0.0, 89.0))))
+    ratios = class_ratios()
+    shape = np.broadcast(limit, np.empty((len(ratios), 1))).shape
+    limit = np.broadcast_to(limit, shape)
+    p = np.empty(shape)
+    for c, q in enumerate(ratios):
+        p[..., c, :] = np.searchsorted(q, limit[..., c, :], side="right") / len(q)
+    return np.where(d <= rng, p, np.nan)
+
+# ══════════════════════════════════════════════════════════════
+# CACHE
+# ══════════════════════════════════════════════════════════════
+
+def model_key():
+    """Hash of everything a cached table depends on besides its own key."""
+    raw = repr((CACHE_VERSION, SIZE_CLASSES, DISTANCES, SAMPLES, SEED)).encode()
+    return hashlib.blake2b(raw, digest_size=8).hexdigest()
+
+class HitTables:
+    """(projectile, spread, range) -> (classes, distances) hit table, cached."""
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(CACHE_DIR, f"hit_{model_key()}.pickle")
+        self.dirty = False
+        try:
+            with open(self.path, "rb") as f:
+                self.tables = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            self.tables = {}
+
+    @staticmethod
+    def key(proj, spread, eff_range):
+        return proj, round(float(spread), 4), round(float(eff_range), 1)
+
+    def lookup(self, keys):
+        """Tables for a list of keys; the missing ones are computed in one batch."""
+        missing = list(dict.fromkeys(k for k in keys if k not in self.tables))
+        if missing:
+            p = hit_probability([k[1] for k in missing], [k[2] for k in missing])
+            self.tables.update(zip(missing, p))
+            self.dirty = True
+        return [self.tables[k] for k in keys]
+
+    def save(self):
+        if not self.dirty:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(self.tables, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, self.path)
+        self.dirty = False
+        # Tables of other hit models (another model_key()) are never read again
+        prune("hit_", os.path.basename(self.path), os.path.dirname(self.path))
+
+# ══════════════════════════════════════════════════════════════
+# REPORT
+# ══════════════════════════════════════════════════════════════
+
+def weapon_report(units, units_cfg, tables=None):
+    """Vanilla / modded spread, range, DPS and hit tables of every projectile slot.
+
+    Returns one {slot: dict(proj, spread, range, dps, hit)} per unit record,
+    in the order of units, where spread / range / dps are (vanilla, modded)
+    floats and hit is a (vanilla, modded) pair of (classes, distances) arrays.
+    """
+    model = CombatModel(units)
+    m_v = model.empty_mults()
+    m_m = model.resolve(units_cfg)
+    out = model.evaluate({q: np.stack([m_v[q], m_m[q]]) for q in m_v})
+    # Infantry accuracy is fixed like the rest of their fire cycle
+    spread = model.spread * np.stack([np.where(model.tunable_cycle, m["accuracy"], 1.0)
+                                      for m in (m_v, m_m)])
+
+    cells = [(int(i), int(j)) for i, j in zip(*np.nonzero(model.has_proj & model.active))]
+    keys = [HitTables.key(model.proj[a][b], spread[c, a, b], out["eff_range"][c, a, b])
+            for c in (0, 1) for a, b in cells]
+    own = tables is None
+    tables = tables or HitTables()
+    hits = tables.lookup(keys)
+    if own:
+        tables.save()
+
+    report = [{} for _ in units]
+    n = len(cells)
+    for k, (a, b) in enumerate(cells):
+        report[a][model.slots[b]] = dict(
+            proj=model.proj[a][b],
+            spread=tuple(float(spread[c, a, b]) for c in (0, 1)),
+            range=tuple(float(out["eff_range"][c, a, b]) for c in (0, 1)),
+            dps=tuple(float(out["slot_dps"][c, a, b]) for c in (0, 1)),
+            hit=(hits[k], hits[n + k]),
+        )
+    return report
+
+def distance_index(d, distances=DISTANCES):
+    """Column of distance d in the tables (ValueError if it is not on the grid)."""
+    try:
+        return list(distances).index(d)
+    except ValueError:
+        raise ValueError(f"distance {d} is not on the grid {', '.join(map(str, distances))}")
+
+# ══════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════
+
+def _pct(p):
+    return f"{p:5.0%}" if np.isfinite(p) else f"{'-':>5s}"
+
+def print_weapon(name, slot, w):
+    print(f"{name} {slot} ({w['proj']}): spread {w['spread'][0]:g} -> {w['spread'][1]:g} deg, "
+          f"range {w['range'][0]:.0f} -> {w['range'][1]:.0f} m")
+    print(f"  {'distance':>8s}" + "".join(f"{c:>22s}" for c in SIZE_CLASSES))
+    for k, d in enumerate(DISTANCES):
+        cells = ""
+        for c in range(len(SIZE_CLASSES)):
+            v, m = w["hit"][0][c, k], w["hit"][1][c, k]
+            dps = f"{w['dps'][1] * m:6.0f}" if np.isfinite(m) else f"{'':6s}"
+            cells += f"  {_pct(v)} -> {_pct(m)} {dps}"
+        print(f"  {d:8d}{cells}")
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Hit probability vs target size from weapon spread.")
+    ap.add_argument("--unit", default=None, help="print the full table of one unit's weapons")
+    ap.add_argument("--distance", type=int, default=300, help="distance for the change list (m)")
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    args = ap.parse_args(argv)
+    try:
+        col = distance_index(args.distance)
+    except ValueError as ex:
+        ap.error(str(ex))
+
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    units = [u for structures, mobile in table["factions"].values() for u in structures + mobile]
+    report = weapon_report(units, config.get("units", {}))
+
+    if args.unit:
+        found = [slots for u, slots in zip(units, report) if u["name"] == args.unit and slots]
+        if not found:
+            ap.error(f"no projectile weapon on {args.unit!r}")
+        for slot, w in found[0].items():
+            print_weapon(args.unit, slot, w)
+        print("  (cells: vanilla -> modded hit chance, modded spread-adjusted DPS)")
+        return
+
+    rows = []
+    for u, slots in zip(units, report):
+        name = u["name"]
+        for slot, w in slots.items():
+            v, m = w["hit"][0][:, col], w["hit"][1][:, col]
+            change = np.nanmax(np.abs(np.where(np.isfinite(v) & np.isfinite(m), m - v, np.nan)),
+                               initial=0.0)
+            rows.append((change, name, slot, w))
+    rows.sort(key=lambda r: -r[0])
+    print(f"Hit chance at {args.distance} m, vanilla -> modded ({len(rows)} weapons)")
+    print(f"  {'unit':22s} {'slot':5s} {'spread':>13s}" + "".join(f"{c:>16s}" for c in SIZE_CLASSES))
+    for change, name, slot, w in rows[:args.top]:
+        cells = "".join(f"{_pct(w['hit'][0][c, col])} -> {_pct(w['hit'][1][c, col])}"
+                        for c in range(len(SIZE_CLASSES)))
+        print(f"  {name[:22]:22s} {slot:5s} {w['spread'][0]:5.2f} -> {w['spread'][1]:5.2f}"
+              f"   {cells}")
+
+if __name__ == "__main__":
+    main()
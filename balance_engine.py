@@ -0,0 +1,276 @@
+"""
+Columnar modded-value engine.
+
+BalanceTable puts every numeric dump field the writers use into a float64
+column (one row per unit record) and every config multiplier into an aligned
+column (absent = 1.0), then computes all modded columns in one batch with the
+same rules build_balance_sheet.py has always used:
+
+  mul   round(v * m, 2)          (was _m)
+  int   max(1, round(v * m))     (was _mi)
+  div   round(v / m, 4)          (was _div — fire_rate_mult is a rate, so it
+                                  divides the fire interval)
+  whole round(round(v * m, 2))   (creature damage / AI range, shown whole)
+
+each applied only where v > 0 and |m - 1| > 0.001 (otherwise the vanilla
+value, source "-"). The faction sheets use the ungated sheet_* columns
+(max(1, round(cost * cost_mult)) etc.), projectile damage follows
+absolute override > damage_mult (round 1) > vanilla.
+
+VehicleTurret columns (vt_fire_interval ... vt3.impact ...) are read from
+the units' turrets.Turret records, one set per turret slot any unit has.
+
+Rounding matches Python's round() exactly: np.rint is already half-even on
+the exact binary value, and the rare near-tie elements of an n-digit round
+are redone with round() itself.
+
+Writers never recompute: table.of(u) returns a UnitValues view with
+van(field), mod(field), src(field) and mult(key), all plain Python numbers.
+"""
+import numpy as np
+
+from turrets import slot_number
+from unit_records import column
+
+# Config multiplier keys (absent from a units_cfg entry = 1.0)
+MULT_KEYS = (
+    "damage_mult", "health_mult", "cost_mult", "build_time_mult",
+    "range_mult", "proj_speed_mult", "accuracy_mult", "magazine_mult",
+    "fire_rate_mult", "reload_time_mult", "move_speed_mult", "turn_radius_mult",
+)
+
+# Modded per-unit fields: field -> (multiplier key, rule)
+FIELD_RULES = {
+    "hp":               ("health_mult", "int"),
+    "cost":             ("cost_mult", "int"),
+    "build_time":       ("build_time_mult", "mul"),
+    "move_speed":       ("move_speed_mult", "mul"),
+    "fly_speed":        ("move_speed_mult", "mul"),
+    "walk_speed":       ("move_speed_mult", "mul"),
+    "run_speed":        ("move_speed_mult", "mul"),
+    "veh_turn_radius":  ("turn_radius_mult", "mul"),
+    "target_dist":      ("range_mult", "mul"),
+    "atk_damage":       ("damage_mult", "whole"),
+    "atk_range":        ("range_mult", "whole"),
+    "atk_spread":       ("accuracy_mult", "mul"),
+    "atk2_damage":      ("damage_mult", "whole"),
+    "atk2_range":       ("range_mult", "whole"),
+    "atk2_spread":      ("accuracy_mult", "mul"),
+}
+
+# Modded VehicleTurret fields, for every turret slot the units have (column
+# "<slot>_<field>", e.g. vt3_fire_interval): Turret attribute -> (key, rule)
+TURRET_RULES = {
+    "fire_interval": ("fire_rate_mult", "div"),
+    "spread":        ("accuracy_mult", "mul"),
+    "magazine":      ("magazine_mult", "int"),
+    "reload":        ("reload_time_mult", "mul"),
+}
+
+# Faction-sheet columns: ungated, 0 where the vanilla value is 0
+SHEET_RULES = {
+    "sheet_cost":       ("cost", "cost_mult", 0),        # max(1, round(v * m))
+    "sheet_build_time": ("build_time", "build_time_mult", 1),  # round(v * m, 1)
+    "sheet_hp":         ("hp", "health_mult", 0),
+}
+
+# Projectile slots besides the turrets: dump fields of the weapon's
+# projectile. pen is None for creature attacks (the dump has no penetrating
+# damage for them).
+PROJ_SLOTS = {
+    "atk":  dict(proj="atk_proj", impact="proj_impact_dmg", ricochet="proj_ricochet_dmg",
+                 splash="proj_splash_dmg", pen=None, speed="proj_speed",
+                 life="proj_lifetime", instant="instant_hit"),
+    "atk2": dict(proj="atk2_proj", impact="proj2_impact_dmg", ricochet="proj2_ricochet_dmg",
+                 splash="proj2_splash_dmg", pen=None, speed="proj2_speed",
+                 life="proj2_lifetime", instant="instant_hit2"),
+}
+# Projectile fields of a turret slot: part -> Turret attribute
+TURRET_PROJ = dict(impact="impact", ricochet="ricochet", splash="splash", pen="pen",
+                   speed="speed", life="life")
+# Damage part -> ProjectileData field name used by absolute overrides
+DMG_FIELDS = {
+    "impact": "m_fImpactDamage", "ricochet": "m_fRicochetDamage",
+    "splash": "m_fSplashDamageMax", "pen": "m_fPenetratingDamage",
+}
+
+# Vanilla defaults for fields that are not 0 when missing
+FIELD_DEFAULTS = {"min_tier": -1}
+
+def py_round(x, ndigits=0):
+    """Vectorised round() that gives exactly what Python's round() gives."""
+    if ndigits == 0:
+        return np.rint(x)
+    out = np.round(x, ndigits)
+    scaled = x * 10.0 ** ndigits
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        out[i] = round(float(x[i]), ndigits)
+    return out
+
+def _gate(v, m):
+    """Rows where a multiplier applies (detail-tab rule)."""
+    return (v > 0) & (np.abs(m - 1.0) > 0.001)
+
+def _apply(v, m, rule):
+    """(modded column, applied mask) for one FIELD_RULES rule."""
+    on = _gate(v, m)
+    if rule == "div":
+        raw = py_round(np.divide(v, m, out=np.zeros_like(v), where=m != 0), 4)
+    elif rule == "int":
+        raw = np.maximum(1.0, py_round(v * m))
+    else:
+        raw = py_round(v * m, 2)
+    mod = np.where(on, raw, v)
+    if rule == "whole":
+        mod = py_round(mod)
+    return mod, on
+
+class UnitValues:
+    """One unit's row of a BalanceTable, as plain Python numbers."""
+    __slots__ = ("table", "i")
+
+    def __init__(self, table, i):
+        self.table = table
+        self.i = i
+
+    def van(self, field):
+        return self.table.vanilla[field][self.i]
+
+    def mod(self, field):
+        return self.table.modded[field][self.i]
+
+    def src(self, field):
+        return self.table.source[field][self.i]
+
+    def mult(self, key):
+        return self.table.mults[key][self.i]
+
+    @property
+    def cfg(self):
+        """The unit's raw units_cfg entry ({} if absent) for non-numeric keys."""
+        return self.table.cfgs[self.i]
+
+class BalanceTable:
+    """Vanilla, multiplier and modded columns for a list of unit records."""
+
+    def __init__(self, units, units_cfg):
+        self.units = units
+        self.row = {id(u): i for i, u in enumerate(units)}
+        cfgs = [units_cfg.get(u["name"], {}) for u in units]
+        n = len(units)
+
+        fields = set(FIELD_RULES) | {f for f, _, _ in SHEET_RULES.values()} | {"min_tier"}
+        for slot in PROJ_SLOTS.values():
+            fields.update(slot[k] for k in ("impact", "ricochet", "splash", "pen", "speed", "life")
+                          if slot[k])
+        van = {f: np.array(column(units, f, FIELD_DEFAULTS.get(f, 0)), dtype=float)
+               for f in fields}
+        mult = {k: np.array([c.get(k, 1.0) for c in cfgs], dtype=float) for k in MULT_KEYS}
+
+        # Turret slots (any number) -> per-unit Turret record or None
+        slots = sorted({t.slot for u in units for t in u.turrets}, key=slot_number)
+        turrets = {slot: [None] * n for slot in slots}
+        for i, u in enumerate(units):
+            for t in u.turrets:
+                turrets[t.slot][i] = t
+        rules = dict(FIELD_RULES)
+        for slot, ts in turrets.items():
+            for attr, rule in TURRET_RULES.items():
+                van[f"{slot}_{attr}"] = np.array([getattr(t, attr) if t else 0 for t in ts],
+                                                 dtype=float)
+                rules[f"{slot}_{attr}"] = rule
+
+        mod, src = {}, {}
+        for f, (key, rule) in rules.items():
+            mod[f], on = _apply(van[f], mult[key], rule)
+            src[f] = np.where(on, key, "-")
+
+        for name, (f, key, nd) in SHEET_RULES.items():
+            x = py_round(van[f] * mult[key], nd)
+            if nd == 0:
+                x = np.maximum(1.0, x)
+            mod[name] = np.where(van[f] > 0, x, 0.0)
+
+        # min_tier: absolute override (None = keep vanilla)
+        tier_ov = np.array([c.get("min_tier") for c in cfgs], dtype=object)
+        has_ov = tier_ov != None  # noqa: E711 — elementwise on an object array
+        ov = np.where(has_ov, tier_ov, 0).astype(float)
+        mod["min_tier"] = np.where(has_ov, ov, van["min_tier"])
+        src["min_tier"] = np.where(has_ov & (ov != van["min_tier"]), "min_tier", "-")
+
+        for slot, ts in turrets.items():
+            cols = {part: np.array([getattr(t, attr) if t else 0 for t in ts], dtype=float)
+                    for part, attr in TURRET_PROJ.items()}
+            self._projectile(slot, cols, [t.proj if t else "" for t in ts],
+                             np.array([bool(t and t.instant) for t in ts]), cfgs, van, mult, mod, src)
+        for slot, fld in PROJ_SLOTS.items():
+            cols = {part: van[fld[part]] if fld[part] else np.zeros(n) for part in TURRET_PROJ}
+            self._projectile(slot, cols, [u.get(fld["proj"], "") for u in units],
+                             np.array([bool(u.get(fld["instant"], False)) for u in units]),
+                             cfgs, van, mult, mod, src)
+
+        # Materialise as Python lists: writers index them per unit
+        self.cfgs = cfgs
+        self.vanilla = {f: a.tolist() for f, a in van.items()}
+        self.mults = {k: a.tolist() for k, a in mult.items()}
+        self.modded = {f: a.tolist() for f, a in mod.items()}
+        self.source = {f: a.tolist() for f, a in src.items()}
+        self.n = n
+
+    @staticmethod
+    def _projectile(slot, cols, names, instant, cfgs, van, mult, mod, src):
+        """Projectile columns of one slot from its vanilla damage / speed / life
+        columns (cols), projectile names and instant-hit flags."""
+        dmg_m = mult["damage_mult"]
+        for part, pfield in DMG_FIELDS.items():
+            key = f"{slot}.{part}"
+            v = cols[part]
+            on = (dmg_m != 1.0) & (v > 0)
+            m = np.where(on, py_round(v * dmg_m, 1), v)
+            s = np.where(m != v, "damage_mult", "-").astype(object)
+            # Absolute overrides are sparse: config projectiles -> {name: {field: val}}
+            for i, (name, c) in enumerate(zip(names, cfgs)):
+                projs = c.get("projectiles")
+                if not projs:
+                    continue
+                ov = projs.get(name or "", {}).get(pfield)
+                if ov is not None:
+                    m[i] = ov
+                    s[i] = "absolute" if ov != v[i] else "-"
+            van[key] = v
+            mod[key], src[key] = m, s
+
+        speed, life = cols["speed"], cols["life"]
+        rng_m, spd_m = mult["range_mult"], mult["proj_speed_mult"]
+        rng_on = np.abs(rng_m - 1.0) > 0.001
+        spd_on = np.abs(spd_m - 1.0) > 0.001
+
+        # Instant-hit: m_fBaseSpeed IS the raycast distance (= range)
+        i_spd = py_round(speed * np.where(rng_on, rng_m, 1.0) * np.where(spd_on, spd_m, 1.0), 1)
+        i_src = np.where(rng_on & spd_on, "range_mult+proj_speed_mult",
+                         np.where(rng_on, "range_mult", np.where(spd_on, "proj_speed_mult", "-")))
+
+        # Normal projectile: range = speed * lifetime
+        n_spd, n_spd_on = _apply(speed, spd_m, "mul")
+        n_lt, n_lt_on = _apply(life, rng_m, "mul")
+        eff_v = np.where((speed > 0) & (life > 0), py_round(speed * life), 0.0)
+        eff_m = np.where((n_spd > 0) & (n_lt > 0), py_round(n_spd * n_lt), 0.0)
+        n_rng_src = np.where(n_spd_on & n_lt_on, "proj_speed_mult+range_mult",
+                             np.where(n_spd_on, "proj_speed_mult",
+                                      np.where(n_lt_on, "range_mult", "-")))
+        n_rng_src = np.where(eff_v != eff_m, n_rng_src, "-")
+
+        van[f"{slot}.speed"], van[f"{slot}.life"] = speed, life
+        van[f"{slot}.instant"] = instant
+        mod[f"{slot}.speed"] = np.where(instant, i_spd, n_spd)
+        src[f"{slot}.speed"] = np.where(instant, i_src, np.where(n_spd_on, "proj_speed_mult", "-"))
+        mod[f"{slot}.life"] = np.where(instant, life, n_lt)
+        src[f"{slot}.life"] = np.where(instant, "-", np.where(n_lt_on, "range_mult", "-"))
+        van[f"{slot}.eff"] = np.where(instant, py_round(speed), eff_v)
+        mod[f"{slot}.eff"] = np.where(instant, py_round(i_spd), eff_m)
+        src[f"{slot}.eff"] = np.where(instant, i_src, n_rng_src)
+
+    def of(self, u):
+        """UnitValues view for a unit record from the table's unit list."""
+        return UnitValues(self, self.row[id(u)])
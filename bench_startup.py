@@ -0,0 +1,95 @@
+"""
+Startup-time guard for the Python tools.
+
+Each probe runs in a fresh interpreter (best of --runs) and must finish under
+--budget milliseconds of wall time without importing a heavy backend
+(openpyxl, matplotlib, numpy). Exit code 1 on any regression, so this can
+run before committing changes to the scripts.
+
+Run: E:/Anaconda/python.exe bench_startup.py [--dump PATH] [--budget MS] [--runs N]
+  --dump  also time a quick query against that dump (cache warmed first)
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY = ("openpyxl", "matplotlib", "numpy")
+
+PROBES = {
+    "import build_balance_sheet": "import build_balance_sheet",
+    "import gen_default_config": "import gen_default_config",
+    "import generate_tech_trees": "import generate_tech_trees",
+    "import regen_all": "import regen_all",
+}
+
+QUERY = (
+    "import build_balance_sheet as b\n"
+    "t = b.load_dump({dump!r})\n"
+    "u = t['units'][0]\n"
+    "print(u['name'], u.get('hp'), t['by_name'][u['name']].get('cost'))\n"
+)
+
+# Appended to every probe: report heavy modules that got imported anyway
+HEAVY_CHECK = (
+    "\nimport sys\n"
+    "_heavy = [m for m in {heavy!r} if m in sys.modules]\n"
+    "if _heavy: print('HEAVY:' + ','.join(_heavy), file=sys.stderr)\n"
+)
+
+def run_probe(code, runs):
+    """Best wall time (ms) over runs, plus the heavy modules it pulled in."""
+    src = code + HEAVY_CHECK.format(heavy=HEAVY)
+    best, heavy = float("inf"), []
+    for _ in range(runs):
+        t = time.perf_counter()
+        r = subprocess.run([sys.executable, "-c", src], cwd=HERE,
+                           capture_output=True, text=True)
+        ms = (time.perf_counter() - t) * 1000
+        if r.returncode != 0:
+            raise RuntimeError(r.stderr.strip().splitlines()[-1])
+        best = min(best, ms)
+        for line in r.stderr.splitlines():
+            if line.startswith("HEAVY:"):
+                heavy = line[len("HEAVY:"):].split(",")
+    return best, heavy
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Guard tool start-up time.")
+    ap.add_argument("--dump", default=None, help="dump for the quick-query probe")
+    ap.add_argument("--budget", type=float, default=100.0, help="per-probe wall-time budget (ms)")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    probes = dict(PROBES)
+    if args.dump:
+        # Warm .cache/ so the probe measures the cached path
+        import build_balance_sheet
+        build_balance_sheet.load_dump(args.dump)
+        probes["quick query (cached dump)"] = QUERY.format(dump=os.path.abspath(args.dump))
+
+    baseline, _ = run_probe("pass", args.runs)
+    print(f"{'interpreter start-up':32s} {baseline:7.1f} ms")
+
+    failed = False
+    for label, code in probes.items():
+        try:
+            ms, heavy = run_probe(code, args.runs)
+        except RuntimeError as err:
+            print(f"{label:32s}   ERROR  {err}")
+            failed = True
+            continue
+        status = "ok"
+        if ms > args.budget:
+            status = f"OVER {args.budget:.0f} ms"
+        if heavy:
+            status += f", imports {', '.join(heavy)}"
+        failed |= status != "ok"
+        print(f"{label:32s} {ms:7.1f} ms  {status}")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
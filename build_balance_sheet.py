@@ -1,187 +1,244 @@
 """
 Generate Si_UnitBalance Excel balance sheet from JSON dump + config.
 Reads Si_UnitBalance_Dump.json (generated by mod) and overlay config.
-Run: E:/Anaconda/python.exe build_balance_sheet.py
+Run: E:/Anaconda/python.exe build_balance_sheet.py [--stream] [--no-cache] [--incremental]
+                 [--dump PATH] [--config PATH] [--output PATH] [--ttk-csv PATH]
+                 [--sensitivity-json PATH]
+  --stream    write-only workbook: each sheet is flushed to disk as soon as it
+              is finished instead of keeping every tab in memory until save.
+  --no-cache  parse the dump even if .cache/ holds an entry for its content.
+  --incremental  only rewrite the tabs whose inputs changed since the last
+              build; the other tabs are copied from .cache/tabs/ (tab_cache.py).
+  --ttk-csv   also write the attacker x defender TTK matrix (combat_engine.py).
+  --sensitivity-json  also write the multiplier -> metric elasticities
+              (sensitivity.py) behind the Sensitivity sheet.
+
+Library use (nothing is read or written at import time):
+  table = load_dump(path); config = load_config(path)
+  build_workbook(table, config, output_path, stream=False, incremental=False)
 """
+import argparse
 import json
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.utils import get_column_letter
+from dump_cache import is_listed_unit, is_tech_tier, load_indexed_dump
+import turrets
+
+# openpyxl is imported on first use (_load_backend), so that importing this
+# module for its data helpers or load_dump() costs no workbook-backend time.
+Workbook = WriteOnlyCell = get_column_letter = None
+
+def _load_backend():
+    global Workbook, WriteOnlyCell, get_column_letter
+    if Workbook is None:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
 
 # ── Paths ──
 DUMP_PATH = r"E:\Steam\steamapps\common\Silica Dedicated Server\Mods\Si_UnitBalance_Dump.json"
 CONFIG_PATH = r"E:\Steam\steamapps\common\Silica Dedicated Server\Mods\Si_UnitBalance_Config.json"
 OUTPUT_PATH = r"C:\Users\schwe\Projects\Si_UnitBalance\Si_UnitBalance_Sheet.xlsx"
-
-# ── Load data ──
-with open(DUMP_PATH, "r") as f:
-    dump = json.load(f)
-with open(CONFIG_PATH, "r") as f:
-    config = json.load(f)
-
-units_cfg = config.get("units", {})
-tech_cfg = config.get("tech_time", {})
 DEFAULT_TECH_TIME = 30
-all_units = dump["units"]
-prod_tree = dump["production_tree"]
-
-# ── Skip list: entries that aren't real game units ──
-SKIP_NAMES = {
-    "Spawn Point", "Unit Spawner", "Anchor", "Zone", "Sports Car",
-    "Troop Transport",
-}
-# Tech tier entries (shown on separate sheet)
-TECH_PREFIXES = ("Alpha ", "Beta ", "Gamma ", "Delta ", "Theta ",
-                 "Lambda ", "Sigma ", "Omega ", "Mark ")
-
-def is_tech_tier(name):
-    return any(name.startswith(p) for p in TECH_PREFIXES)
-
-# ── Faction classification ──
-
-def classify_faction(unit):
-    """Return 'Sol', 'Centauri', 'Alien', or None."""
-    f = unit.get("faction", "")
-    if f == "Sol":
-        return "Sol"
-    if f == "Centauri":
-        return "Centauri"
-    if f == "Alien":
-        return "Alien"
-    return None
-
-# ── Build faction data ──
-sol_structures, sol_units = [], []
-cent_structures, cent_units = [], []
-alien_structures, alien_units = [], []
-
-for u in all_units:
-    name = u["name"]
-    if name in SKIP_NAMES or is_tech_tier(name):
-        continue
-    # Worms are Team_AlienWorms — skip for main sheets
-    if u.get("team") == "Team_AlienWorms":
-        continue
-
-    faction = classify_faction(u)
-    is_struct = u.get("is_structure", False)
-
-    if faction == "Sol":
-        if is_struct:
-            sol_structures.append(u)
-        else:
-            sol_units.append(u)
-    elif faction == "Centauri":
-        if is_struct:
-            cent_structures.append(u)
-        else:
-            cent_units.append(u)
-    elif faction == "Alien":
-        if is_struct:
-            alien_structures.append(u)
-        else:
-            alien_units.append(u)
-
-# ── Sort helpers ──
-# Sort structures by: Headquarters first, then factories, then turrets
-STRUCT_ORDER = {
-    "Headquarters": 0, "Refinery": 1, "Barracks": 2, "Research Facility": 3,
-    "Light Factory": 4, "Heavy Factory": 5, "Air Factory": 6,
-    "Ultra Heavy Factory": 7, "Silo": 8, "Radar Station": 9,
-    "Turret": 10, "Heavy Turret": 11, "Anti-Air Rocket Turret": 12,
-    "Fusion Reactor": 13, "Outpost": 14, "Solar Panel": 15,
-    # Alien
-    "Nest": 0, "Node": 1, "Bio Cache": 2,
-    "Lesser Spawning Cyst": 3, "Greater Spawning Cyst": 4,
-    "Grand Spawning Cyst": 5, "Colossal Spawning Cyst": 6,
-    "Quantum Cortex": 7, "Thorn Spire": 8, "Hive Spire": 9,
-}
-
-# Sort units by production building, then tier, then cost
-FACTORY_ORDER = {
-    "Barracks": 0, "Light Factory": 1, "Heavy Factory": 2,
-    "Ultra Heavy Factory": 3, "Air Factory": 4,
-    # Alien
-    "Lesser Spawning Cyst": 0, "Greater Spawning Cyst": 1,
-    "Grand Spawning Cyst": 2, "Colossal Spawning Cyst": 3,
-}
-
-def struct_sort_key(u):
-    return STRUCT_ORDER.get(u["name"], 99)
-
-def unit_sort_key(u):
-    return (FACTORY_ORDER.get(u["built_at"], 99),
-            u.get("min_tier", -1),
-            u.get("cost", 0))
-
-sol_structures.sort(key=struct_sort_key)
-cent_structures.sort(key=struct_sort_key)
-alien_structures.sort(key=struct_sort_key)
-sol_units.sort(key=unit_sort_key)
-cent_units.sort(key=unit_sort_key)
-alien_units.sort(key=unit_sort_key)
+# Distances (m, on accuracy.DISTANCES) of the detail tabs' hit chance rows
+HIT_DISTANCES = (100, 300)
 
 # ══════════════════════════════════════════════════════════════
 # CONFIG HELPERS
 # ══════════════════════════════════════════════════════════════
 
-def get_cfg(name, key, default=None):
-    entry = units_cfg.get(name, {})
-    return entry.get(key, default)
+# All modded values come from balance_engine.BalanceTable, built once per
+# workbook in build_workbook(); writers get a per-unit view via values.of(u).
+
+# ══════════════════════════════════════════════════════════════
+# STYLES
+# ══════════════════════════════════════════════════════════════
 
-def modded_val(name, vanilla, key):
-    mult = get_cfg(name, key)
-    if mult is None:
-        return vanilla
-    return vanilla * mult
+# Plain data so that importing this module never touches openpyxl; the
+# Font / PatternFill / Alignment objects are built in register_styles().
+HEADER_FONT = dict(bold=True, color="FFFFFF", size=9)
+HEADER_FILL_SOL = "2E5090"
+HEADER_FILL_CENT = "8B0000"
+HEADER_FILL_ALIEN = "2D6B2D"
+HEADER_FILL_TECH = "5C3D7A"
+SUBHEADER_FONT = dict(bold=True, size=9)
+SUBHEADER_FILL = "D9E1F2"
+CHANGED_FILL = "FFFFCC"
+STRUCT_FILL = "F2F2F2"
+WEAPON_FILL = "D6DCE4"
+MODDED_FILL = "FFFFCC"
+# Sensitivity heatmap: |elasticity| >= HEAT_LEVELS[k] gets shade k, metric up / down
+HEAT_LEVELS = (0.1, 0.5, 1.0)
+HEAT_UP_FILLS = ("E2EFDA", "A9D08E", "70AD47")
+HEAT_DOWN_FILLS = ("FCE4D6", "F4B084", "ED7D31")
+CENTER = dict(horizontal="center", vertical="center")
+LEFT = dict(horizontal="left", vertical="center")
+TITLE_FONT = dict(bold=True, color="FFFFFF", size=11)
+HEADER_ALIGN = dict(horizontal="center", wrap_text=True)
+
+# Every cell style the writers use, registered once per workbook as a named
+# style. Writers only assign names (cell.style = "ub_cell"), so no Font /
+# Alignment objects are built or hashed per cell.
+STYLE_DEFS = {
+    # Faction / tech sheets
+    "ub_header_sol":   dict(font=HEADER_FONT, fill=HEADER_FILL_SOL, alignment=HEADER_ALIGN),
+    "ub_header_cent":  dict(font=HEADER_FONT, fill=HEADER_FILL_CENT, alignment=HEADER_ALIGN),
+    "ub_header_alien": dict(font=HEADER_FONT, fill=HEADER_FILL_ALIEN, alignment=HEADER_ALIGN),
+    "ub_header_tech":  dict(font=HEADER_FONT, fill=HEADER_FILL_TECH, alignment=HEADER_ALIGN),
+    "ub_subheader":    dict(font=SUBHEADER_FONT, fill=SUBHEADER_FILL),
+    "ub_cell":         dict(alignment=CENTER),
+    "ub_cell_changed": dict(alignment=CENTER, fill=CHANGED_FILL),
+    "ub_cell_struct":  dict(alignment=CENTER, fill=STRUCT_FILL),
+    "ub_name":         dict(alignment=LEFT),
+    "ub_name_changed": dict(alignment=LEFT, fill=CHANGED_FILL),
+    "ub_name_struct":  dict(alignment=LEFT, fill=STRUCT_FILL),
+    "ub_tree":         dict(alignment=dict(vertical="center")),
+    # Detail tabs
+    "ub_title_sol":    dict(font=TITLE_FONT, fill=HEADER_FILL_SOL),
+    "ub_title_cent":   dict(font=TITLE_FONT, fill=HEADER_FILL_CENT),
+    "ub_title_alien":  dict(font=TITLE_FONT, fill=HEADER_FILL_ALIEN),
+    "ub_title_tech":   dict(font=TITLE_FONT, fill=HEADER_FILL_TECH),
+    "ub_section":      dict(font=dict(bold=True, size=10), fill=WEAPON_FILL),
+    "ub_param_header": dict(font=dict(bold=True, size=9), alignment=dict(horizontal="center")),
+    "ub_param":        dict(alignment=dict(horizontal="left")),
+    "ub_value":        dict(alignment=dict(horizontal="center")),
+    "ub_value_modded": dict(alignment=dict(horizontal="center"), fill=MODDED_FILL),
+    # Sensitivity heatmap
+    **{f"ub_heat_up_{k}": dict(alignment=CENTER, fill=f) for k, f in enumerate(HEAT_UP_FILLS, 1)},
+    **{f"ub_heat_down_{k}": dict(alignment=CENTER, fill=f) for k, f in enumerate(HEAT_DOWN_FILLS, 1)},
+}
 
-def modded_int(name, vanilla, key):
-    return max(1, round(modded_val(name, vanilla, key)))
+def register_styles(wb):
+    """Add STYLE_DEFS to wb as named styles (all with a thin border)."""
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+    from openpyxl.styles.fonts import DEFAULT_FONT
+
+    thin = Side(style="thin")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    for name, d in STYLE_DEFS.items():
+        font = Font(**d["font"]) if "font" in d else DEFAULT_FONT
+        st = NamedStyle(name=name, font=font, border=border)
+        if "fill" in d:
+            st.fill = PatternFill("solid", fgColor=d["fill"])
+        if "alignment" in d:
+            st.alignment = Alignment(**d["alignment"])
+        wb.add_named_style(st)
+        # Intern the cell format now, so its index in styles.xml depends on
+        # STYLE_DEFS order only and not on which tab used it first (cached
+        # tab XML refers to these indices; see tab_cache.py). openpyxl has no
+        # public call for this: add_named_style() leaves the cell format out
+        # until a cell uses it, and a write-only workbook has no sheet to put
+        # a scratch cell on. _cell_styles is why requirements.txt pins
+        # openpyxl; tab_cache fingerprints the openpyxl version as well.
+        wb._cell_styles.add(st.as_tuple())
+
+def style_row(cells, is_struct=False, changed=None):
+    changed = changed or ()
+    base = "ub_cell_struct" if is_struct else "ub_cell"
+    for c, cell in enumerate(cells, 1):
+        cell.style = "ub_cell_changed" if c in changed else base
+    if 1 in changed:
+        cells[0].style = "ub_name_changed"
+    else:
+        cells[0].style = "ub_name_struct" if is_struct else "ub_name"
 
 # ══════════════════════════════════════════════════════════════
-# STYLES
+# SHEET OUTPUT
 # ══════════════════════════════════════════════════════════════
 
-HEADER_FONT = Font(bold=True, color="FFFFFF", size=9)
-HEADER_FILL_SOL = PatternFill("solid", fgColor="2E5090")
-HEADER_FILL_CENT = PatternFill("solid", fgColor="8B0000")
-HEADER_FILL_ALIEN = PatternFill("solid", fgColor="2D6B2D")
-HEADER_FILL_TECH = PatternFill("solid", fgColor="5C3D7A")
-SUBHEADER_FONT = Font(bold=True, size=9)
-SUBHEADER_FILL = PatternFill("solid", fgColor="D9E1F2")
-CHANGED_FILL = PatternFill("solid", fgColor="FFFFCC")
-STRUCT_FILL = PatternFill("solid", fgColor="F2F2F2")
-THIN_BORDER = Border(
-    left=Side(style="thin"), right=Side(style="thin"),
-    top=Side(style="thin"), bottom=Side(style="thin"),
-)
-
-def style_header(ws, row, fill, cols):
-    for c in range(1, cols + 1):
-        cell = ws.cell(row=row, column=c)
-        cell.font = HEADER_FONT
-        cell.fill = fill
-        cell.alignment = Alignment(horizontal="center", wrap_text=True)
-        cell.border = THIN_BORDER
-
-def style_subheader(ws, row, cols):
-    for c in range(1, cols + 1):
-        cell = ws.cell(row=row, column=c)
-        cell.font = SUBHEADER_FONT
-        cell.fill = SUBHEADER_FILL
-        cell.border = THIN_BORDER
-
-def style_row(ws, row, cols, is_struct=False, changed=None):
-    changed = changed or set()
-    for c in range(1, cols + 1):
-        cell = ws.cell(row=row, column=c)
-        cell.border = THIN_BORDER
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        if c in changed:
-            cell.fill = CHANGED_FILL
-        elif is_struct:
-            cell.fill = STRUCT_FILL
-    ws.cell(row=row, column=1).alignment = Alignment(horizontal="left", vertical="center")
+class ColumnWidths:
+    """Running maximum of the rendered width of every column.
+
+    Fed by SheetOut.append() as rows are written, so auto-width costs one
+    len(str()) per cell written instead of a second pass over the sheet.
+    lo may be a single minimum or a {column: minimum} dict.
+    """
+
+    def __init__(self, lo=6, hi=22):
+        self.lo = lo
+        self.hi = hi
+        self.max_len = []
+
+    def feed(self, cells):
+        max_len = self.max_len
+        if len(cells) > len(max_len):
+            max_len.extend([0] * (len(cells) - len(max_len)))
+        for i, cell in enumerate(cells):
+            n = len(str(cell.value or ""))
+            if n > max_len[i]:
+                max_len[i] = n
+
+    def widths(self):
+        lo = self.lo
+        out = {}
+        for c, n in enumerate(self.max_len, 1):
+            floor = lo.get(c, 6) if isinstance(lo, dict) else lo
+            out[c] = min(max(n + 2, floor), max(self.hi, floor))
+        return out
+
+class SheetOut:
+    """Row-at-a-time sheet writer, shared by the normal and --stream modes.
+
+    Cells are created detached and appended a whole row at a time, so the same
+    writer code works on a write-only worksheet. widths is either a fixed
+    {column: width} dict or a ColumnWidths tracker (default). A write-only
+    sheet must get its column widths and frozen panes before the first row, so
+    fixed-width sheets stream straight through while tracked sheets hold their
+    rows until close().
+    """
+
+    def __init__(self, wb, title, widths=None, freeze=None):
+        _load_backend()
+        self.ws = wb.create_sheet(title=title)
+        self.freeze = freeze
+        self.tracker = widths if isinstance(widths, ColumnWidths) else None
+        if widths is None:
+            self.tracker = ColumnWidths()
+        self.pending = []
+        self.merges = []
+        self.row = 0
+        if self.tracker is None:
+            self._layout(widths)
+
+    def _layout(self, widths):
+        for c, width in widths.items():
+            self.ws.column_dimensions[get_column_letter(c)].width = width
+        if self.freeze:
+            self.ws.freeze_panes = self.freeze
+
+    def cells(self, values, style=None):
+        cells = [WriteOnlyCell(self.ws, value=val) for val in values]
+        if style is not None:
+            for cell in cells:
+                cell.style = style
+        return cells
+
+    def append(self, cells=(), track=True):
+        """Append one row of cells. Returns its row number.
+
+        Pass track=False for merged title rows that should not size columns.
+        """
+        self.row += 1
+        if self.tracker is None:
+            self.ws.append(cells)
+            return self.row
+        if track:
+            self.tracker.feed(cells)
+        self.pending.append(cells)
+        return self.row
+
+    def merge(self, row, first_col, last_col):
+        self.merges.append(f"{get_column_letter(first_col)}{row}:{get_column_letter(last_col)}{row}")
+
+    def close(self):
+        if self.tracker is not None:
+            self._layout(self.tracker.widths())
+            for cells in self.pending:
+                self.ws.append(cells)
+            self.pending = []
+        # Every cell of a merged row already carries its border from the
+        # registry, so record the range only; ws.merge_cells() would rebuild
+        # the edge borders cell by cell.
+        for ref in self.merges:
+            self.ws.merged_cells.add(ref)
 
 # ══════════════════════════════════════════════════════════════
 # COLUMNS
@@ -238,31 +295,26 @@ def v(x):
 # WRITE FACTION SHEET
 # ══════════════════════════════════════════════════════════════
 
-def write_sheet(wb, title, structures, units, hfill):
-    ws = wb.create_sheet(title=title)
+def write_sheet(wb, title, structures, units, header_style, values):
+    out = SheetOut(wb, title, freeze="A2")
 
     # Header
-    row = 1
-    for ci, cn in enumerate(COLUMNS, 1):
-        ws.cell(row=row, column=ci, value=cn)
-    style_header(ws, row, hfill, NC)
-    row += 1
+    out.append(out.cells(COLUMNS, header_style))
 
     def write_entries(entries, section_label, is_struct):
-        nonlocal row
-        ws.cell(row=row, column=1, value=section_label)
-        style_subheader(ws, row, NC)
-        row += 1
+        out.append(out.cells([section_label] + [None] * (NC - 1), "ub_subheader"))
 
         for e in entries:
             name = e["name"]
+            uv = values.of(e)
+            cfg = uv.cfg
             changed = set()
 
             # ── Vanilla values from dump ──
-            v_cost = e.get("cost", 0)
-            v_build = e.get("build_time", 0)
-            v_tier = e.get("min_tier", -1)
-            v_hp = e.get("hp", 0)
+            v_cost = uv.van("cost")
+            v_build = uv.van("build_time")
+            v_tier = uv.van("min_tier")
+            v_hp = uv.van("hp")
             move_spd = e.get("move_speed", 0)
             fly_spd = e.get("fly_speed", 0)
 
@@ -281,14 +333,9 @@ def write_sheet(wb, title, structures, units, hfill):
             proj2_life = e.get("proj2_lifetime", 0)
             inst_hit2 = e.get("instant_hit2", False)
 
-            # Vehicle turret
-            vt_intv = e.get("vt_fire_interval", 0)
-            vt_spread = e.get("vt_spread", 0)
-            vt_mag = e.get("vt_magazine", 0)
-            vt_reload = e.get("vt_reload", 0)
-            vt2_intv = e.get("vt2_fire_interval", 0)
-            vt2_spread = e.get("vt2_spread", 0)
-            vt2_mag = e.get("vt2_magazine", 0)
+            # Vehicle turret: the mod's primary / secondary weapon slots
+            pri_t = turrets.primary(e) or turrets.EMPTY
+            sec_t = turrets.secondary(e) or turrets.EMPTY
 
             # Detection
             fow = e.get("fow_view", 0)
@@ -296,25 +343,24 @@ def write_sheet(wb, title, structures, units, hfill):
             max_dist = e.get("max_dist", 0)
 
             # ── Modded values ──
-            m_cost = modded_int(name, v_cost, "cost_mult") if v_cost > 0 else 0
-            m_build = round(modded_val(name, v_build, "build_time_mult"), 1) if v_build > 0 else 0
-            m_tier_raw = get_cfg(name, "min_tier")
-            m_tier = m_tier_raw if m_tier_raw is not None else v_tier
-            m_hp = modded_int(name, v_hp, "health_mult") if v_hp > 0 else 0
+            m_cost = uv.mod("sheet_cost")
+            m_build = uv.mod("sheet_build_time")
+            m_tier = uv.mod("min_tier")
+            m_hp = uv.mod("sheet_hp")
 
             # Config multipliers for display
-            dmg_m = get_cfg(name, "damage_mult", 1.0)
-            spd_m = get_cfg(name, "proj_speed_mult", 1.0)
-            rng_m = get_cfg(name, "range_mult", 1.0)
-            acc_m = get_cfg(name, "accuracy_mult", 1.0)
-            mag_m = get_cfg(name, "magazine_mult", 1.0)
-            fr_m = get_cfg(name, "fire_rate_mult", 1.0)
-            mv_m = get_cfg(name, "move_speed_mult", 1.0)
-            tr_m = get_cfg(name, "turn_radius_mult", 1.0)
-            br = get_cfg(name, "build_radius")
+            dmg_m = uv.mult("damage_mult")
+            spd_m = uv.mult("proj_speed_mult")
+            rng_m = uv.mult("range_mult")
+            acc_m = uv.mult("accuracy_mult")
+            mag_m = uv.mult("magazine_mult")
+            fr_m = uv.mult("fire_rate_mult")
+            mv_m = uv.mult("move_speed_mult")
+            tr_m = uv.mult("turn_radius_mult")
+            br = cfg.get("build_radius")
 
             # Config notes
-            cfg_note = get_cfg(name, "_note", "")
+            cfg_note = cfg.get("_note", "")
 
             # ── Highlight changed cells ──
             if v_cost > 0 and m_cost != v_cost: changed.update({3, 4})
@@ -352,9 +398,9 @@ def write_sheet(wb, title, structures, units, hfill):
                 v(atk2_range), v(atk2_spread), v(atk2_proj),
                 v(proj2_spd), v(proj2_life), v(inst_hit2),
                 # Vehicle turret primary
-                v(vt_intv), v(vt_spread), v(vt_mag), v(vt_reload),
+                v(pri_t.fire_interval), v(pri_t.spread), v(pri_t.magazine), v(pri_t.reload),
                 # Vehicle turret secondary
-                v(vt2_intv), v(vt2_spread), v(vt2_mag),
+                v(sec_t.fire_interval), v(sec_t.spread), v(sec_t.magazine),
                 # Detection
                 v(fow), v(targ_dist), v(max_dist),
                 # Mod multipliers (show only if != 1.0)
@@ -369,30 +415,20 @@ def write_sheet(wb, title, structures, units, hfill):
                 v(br) if br else "-",
                 cfg_note,
             ]
-            for ci, val in enumerate(vals, 1):
-                ws.cell(row=row, column=ci, value=val)
-            style_row(ws, row, NC, is_struct=is_struct, changed=changed)
-            row += 1
+            cells = out.cells(vals)
+            style_row(cells, is_struct=is_struct, changed=changed)
+            out.append(cells)
 
     write_entries(structures, "── STRUCTURES ──", True)
     write_entries(units, "── UNITS ──", False)
 
     # Auto-width
-    for c in range(1, NC + 1):
-        max_len = max(
-            len(str(ws.cell(row=r, column=c).value or ""))
-            for r in range(1, row)
-        )
-        ws.column_dimensions[get_column_letter(c)].width = min(max(max_len + 2, 6), 22)
-
-    ws.freeze_panes = "A2"
+    out.close()
 
-def write_tech_sheet(wb):
-    ws = wb.create_sheet(title="Tech Tiers")
+def write_tech_sheet(wb, tech_cfg):
     headers = ["Tier", "Name (Cent)", "Name (Alien)", "Default (s)", "Modded (s)", "Cumul. (s)", "Cumul. (min)"]
-    for ci, h in enumerate(headers, 1):
-        ws.cell(row=1, column=ci, value=h)
-    style_header(ws, 1, HEADER_FILL_TECH, len(headers))
+    out = SheetOut(wb, "Tech Tiers", widths=ColumnWidths(lo=16), freeze="A2")
+    out.append(out.cells(headers, "ub_header_tech"))
 
     cent_names = ["Mark I", "Mark II", "Mark III", "Mark IV",
                   "Mark V", "Mark VI", "Mark VII", "Mark VIII"]
@@ -406,140 +442,190 @@ def write_tech_sheet(wb):
         changed = {4, 5} if modded != DEFAULT_TECH_TIME else set()
         vals = [tier, cent_names[tier-1], alien_names[tier-1],
                 DEFAULT_TECH_TIME, modded, cumulative, round(cumulative / 60, 1)]
-        row = tier + 1
-        for ci, val in enumerate(vals, 1):
-            ws.cell(row=row, column=ci, value=val)
-        style_row(ws, row, len(headers), changed=changed)
+        cells = out.cells(vals)
+        style_row(cells, changed=changed)
+        out.append(cells)
+    out.close()
 
-    for c in range(1, len(headers) + 1):
-        ws.column_dimensions[get_column_letter(c)].width = 16
-    ws.freeze_panes = "A2"
-
-def write_production_tree_sheet(wb):
+def write_production_tree_sheet(wb, prod_tree):
     """Write production tree as a reference sheet."""
-    ws = wb.create_sheet(title="Production Tree")
     headers = ["Producer", "Builds"]
-    for ci, h in enumerate(headers, 1):
-        ws.cell(row=1, column=ci, value=h)
-    style_header(ws, 1, HEADER_FILL_TECH, len(headers))
+    out = SheetOut(wb, "Production Tree", widths={1: 28, 2: 80}, freeze="A2")
+    out.append(out.cells(headers, "ub_header_tech"))
 
-    row = 2
     for producer in sorted(prod_tree.keys()):
         items = prod_tree[producer]
-        ws.cell(row=row, column=1, value=producer)
-        ws.cell(row=row, column=2, value=", ".join(items))
-        for c in range(1, 3):
-            cell = ws.cell(row=row, column=c)
-            cell.border = THIN_BORDER
-            cell.alignment = Alignment(vertical="center")
-        row += 1
-
-    ws.column_dimensions["A"].width = 28
-    ws.column_dimensions["B"].width = 80
-    ws.freeze_panes = "A2"
+        out.append(out.cells([producer, ", ".join(items)], "ub_tree"))
+    out.close()
 
 # ══════════════════════════════════════════════════════════════
-# PER-UNIT WEAPON DETAIL TABS
+# TIME-TO-KILL MATRIX
+# ══════════════════════════════════════════════════════════════
+
+TTK_FIXED_COLS = ["Attacker", "Faction", "V.DPS", "M.DPS"]
+
+def _ttk(t):
+    """Display a TTK in seconds: 1 decimal, '-' when the attacker can't kill."""
+    return round(float(t), 1) if t != float("inf") else "-"
+
+def write_ttk_sheet(wb, units, units_cfg):
+    """Attacker x defender time-to-kill (s) against modded HP, with sustained DPS."""
+    from combat_engine import ttk_report
+
+    rep = ttk_report(units, units_cfg)
+    defenders = rep["defenders"]
+    nf = len(TTK_FIXED_COLS)
+    widths = {1: 22, 2: 10, 3: 9, 4: 9}
+    widths.update({nf + 1 + j: 10 for j in range(len(defenders))})
+    out = SheetOut(wb, "TTK Matrix", widths=widths, freeze="E3")
+
+    out.append(out.cells(TTK_FIXED_COLS + [d["name"] for d in defenders], "ub_header_tech"))
+    hp_row = out.cells(["Defender HP (modded)", None, None, None]
+                       + [v(float(h)) for h in rep["hp_m"]], "ub_subheader")
+    out.append(hp_row)
+
+    for i, a in enumerate(rep["attackers"]):
+        dps_v, dps_m = round(float(rep["dps_v"][i]), 1), round(float(rep["dps_m"][i]), 1)
+        ttk_v = [_ttk(t) for t in rep["ttk_v"][i]]
+        ttk_m = [_ttk(t) for t in rep["ttk_m"][i]]
+        changed = {nf + 1 + j for j, (tv, tm) in enumerate(zip(ttk_v, ttk_m)) if tv != tm}
+        if dps_v != dps_m:
+            changed.update({3, 4})
+        cells = out.cells([a["name"], a.get("faction", ""), v(dps_v), v(dps_m)] + ttk_m)
+        style_row(cells, changed=changed)
+        out.append(cells)
+    out.close()
+
 # ══════════════════════════════════════════════════════════════
+# TECH REACH
+# ══════════════════════════════════════════════════════════════
+
+REACH_COLS = ["Faction", "Item", "Kind", "Built at", "Min Tier",
+              "V.Tier", "M.Tier", "V.Research (s)", "M.Research (s)"]
+
+def write_reach_sheet(wb, table, config):
+    """Earliest tier / research time of every item, grouped by what unlocks when."""
+    from reachability import ReachIndex
+
+    van, mod = ReachIndex(table), ReachIndex(table, config)
+    nc = len(REACH_COLS)
+    out = SheetOut(wb, "Tech Reach", widths={1: 10, 2: 26, 3: 10, 4: 22, 5: 9,
+                                             6: 8, 7: 8, 8: 14, 9: 14}, freeze="A2")
+    out.append(out.cells(REACH_COLS, "ub_header_tech"))
+    never = 99
+    for faction in mod.entries:
+        entries = sorted(mod.entries[faction].values(),
+                         key=lambda e: (never if e.tier is None else e.tier, e.order))
+        group = None
+        for e in entries:
+            tier = never if e.tier is None else e.tier
+            if tier != group:
+                group = tier
+                label = (f"{faction} — unreachable" if tier == never else
+                         f"{faction} — Tier {tier} ({e.seconds:.0f} s of research)")
+                out.append(out.cells([label] + [None] * (nc - 1), "ub_subheader"))
+                out.merge(out.row, 1, nc)
+            ve = van.entries[faction].get(e.name)
+            v_tier = ve.tier if ve else None
+            v_sec = ve.seconds if ve else None
+            vals = [faction, e.name, e.kind, e.producer, e.min_tier if e.min_tier >= 0 else "-",
+                    "-" if v_tier is None else v_tier, "-" if e.tier is None else e.tier,
+                    "-" if v_sec is None else round(v_sec), "-" if e.seconds is None else round(e.seconds)]
+            changed = set()
+            if v_tier != e.tier:
+                changed.update({2, 6, 7})
+            if v_sec != e.seconds:
+                changed.update({8, 9})
+            cells = out.cells(vals)
+            style_row(cells, is_struct=e.kind in ("structure", "start"), changed=changed)
+            out.append(cells)
+    out.close()
+
+# ══════════════════════════════════════════════════════════════
+# SENSITIVITY HEATMAP
+# ══════════════════════════════════════════════════════════════
+
+SENS_FIXED_COLS = ["Unit", "Faction", "Key", "Value"]
+
+def heat_style(e):
+    """Cell style for an elasticity: shaded by size, green up / orange down."""
+    level = sum(abs(e) >= t for t in HEAT_LEVELS)
+    if not level:
+        return "ub_cell"
+    return f"ub_heat_{'up' if e > 0 else 'down'}_{level}"
+
+def write_sensitivity_sheet(wb, table, config):
+    """Elasticity of each unit's derived metrics to every multiplier key it has."""
+    from sensitivity import METRICS, METRIC_LABELS, jacobian
+
+    nf = len(SENS_FIXED_COLS)
+    widths = {1: 22, 2: 10, 3: 28, 4: 8}
+    widths.update({nf + 1 + k: 11 for k in range(len(METRICS))})
+    out = SheetOut(wb, "Sensitivity", widths=widths, freeze="E2")
+    out.append(out.cells(SENS_FIXED_COLS + [METRIC_LABELS[k] for k in METRICS], "ub_header_tech"))
+    try:
+        report = jacobian(table, config)
+    except KeyError as ex:
+        out.append(out.cells([f"Dump has no unit {ex}, which gen_default_config lists"]))
+        out.close()
+        return
+    note = (f"% change of the metric per % change of the key "
+            f"(central difference, +-{report['step']:.0%}); Avail. time = research to the "
+            f"earliest reachable tier (Tech Reach) + own build time")
+    out.append(out.cells([note] + [None] * (nf - 1 + len(METRICS)), "ub_subheader"))
+    out.merge(out.row, 1, nf + len(METRICS))
+
+    last = None
+    for r in report["rows"]:
+        if not r["modelled"]:
+            continue
+        first = r["unit"] != last
+        last = r["unit"]
+        es = [r["elasticity"][k] for k in METRICS]
+        cells = out.cells([r["unit"] if first else None, r["faction"] if first else None,
+                           r["key"], round(r["value"], 3)]
+                          + [round(e, 2) if e is not None else "-" for e in es])
+        style_row(cells)
+        for cell, e in zip(cells[nf:], es):
+            if e is not None:
+                cell.style = heat_style(e)
+        out.append(cells)
+    out.close()
 
-WEAPON_FILL = PatternFill("solid", fgColor="D6DCE4")
-MODDED_FILL = PatternFill("solid", fgColor="FFFFCC")
+# ══════════════════════════════════════════════════════════════
+# PER-UNIT WEAPON DETAIL TABS
+# ══════════════════════════════════════════════════════════════
 
 def has_weapons(u):
     """Return True if unit has any weapon data (VT or creature attacks)."""
-    if u.get("vt_proj") or u.get("vt2_proj"):
+    if any(t.armed for t in u.turrets):
         return True
     if u.get("atk_proj") or u.get("atk2_proj"):
         return True
-    if u.get("vt_fire_interval", 0) > 0 or u.get("vt2_fire_interval", 0) > 0:
-        return True
     if u.get("atk_damage", 0) > 0 or u.get("atk2_damage", 0) > 0:
         return True
     return False
 
-def get_proj_override(name, proj_name, field):
-    """Get absolute projectile override from config, or None."""
-    entry = units_cfg.get(name, {})
-    projs = entry.get("projectiles", {})
-    p = projs.get(proj_name, {})
-    return p.get(field)
-
-def modded_proj_dmg(name, proj_name, field, vanilla):
-    """Get modded damage: absolute override > damage_mult > vanilla."""
-    abs_val = get_proj_override(name, proj_name, field)
-    if abs_val is not None:
-        return abs_val
-    dmg_m = get_cfg(name, "damage_mult", 1.0)
-    if dmg_m != 1.0 and vanilla > 0:
-        return round(vanilla * dmg_m, 1)
-    return vanilla
-
-def dmg_source(name, proj, field, van, mod):
-    """Return source label for a modded damage value."""
-    if van == mod: return "-"
-    if get_proj_override(name, proj, field) is not None: return "absolute"
-    return "damage_mult"
-
-def write_section(ws, row, label, params):
-    """Write a section block with vanilla/modded/source columns. Returns next row."""
+def write_section(out, label, params):
+    """Write a section block with vanilla/modded/source columns, then a blank row."""
     # Section header
-    ws.cell(row=row, column=1, value=label)
-    ws.merge_cells(start_row=row, start_column=1, end_row=row, end_column=4)
-    for c in range(1, 5):
-        cell = ws.cell(row=row, column=c)
-        cell.font = Font(bold=True, size=10)
-        cell.fill = WEAPON_FILL
-        cell.border = THIN_BORDER
-    row += 1
+    row = out.append(out.cells([label, None, None, None], "ub_section"), track=False)
+    out.merge(row, 1, 4)
 
     # Column headers
-    for ci, h in enumerate(["Parameter", "Vanilla", "Modded", "Source"], 1):
-        cell = ws.cell(row=row, column=ci, value=h)
-        cell.font = Font(bold=True, size=9)
-        cell.border = THIN_BORDER
-        cell.alignment = Alignment(horizontal="center")
-    row += 1
+    out.append(out.cells(["Parameter", "Vanilla", "Modded", "Source"], "ub_param_header"))
 
     # Data rows
     for pname, vanilla, modded, source in params:
-        ws.cell(row=row, column=1, value=pname)
-        ws.cell(row=row, column=2, value=v(vanilla))
-        ws.cell(row=row, column=3, value=v(modded))
-        ws.cell(row=row, column=4, value=source)
-        for c in range(1, 5):
-            ws.cell(row=row, column=c).border = THIN_BORDER
-            ws.cell(row=row, column=c).alignment = Alignment(horizontal="center" if c > 1 else "left")
+        cells = out.cells([pname, v(vanilla), v(modded), source], "ub_value")
+        cells[0].style = "ub_param"
         if vanilla != modded and modded not in (0, "-", False, ""):
-            ws.cell(row=row, column=3).fill = MODDED_FILL
-        row += 1
-
-    return row + 1  # blank row
+            cells[2].style = "ub_value_modded"
+        out.append(cells)
 
-# ── Helpers for modded value computation ──
+    out.append()  # blank row
 
-def _m(val, mult, source_key):
-    """Apply multiplier. Returns (modded, source)."""
-    if abs(mult - 1.0) > 0.001 and val > 0:
-        return round(val * mult, 2), source_key
-    return val, "-"
-
-def _mi(val, mult, source_key):
-    """Apply multiplier, round to int. Returns (modded, source)."""
-    if abs(mult - 1.0) > 0.001 and val > 0:
-        return max(1, round(val * mult)), source_key
-    return val, "-"
-
-def _div(val, mult, source_key):
-    """Apply divisor (for fire_rate_mult). Returns (modded, source)."""
-    if abs(mult - 1.0) > 0.001 and val > 0:
-        return round(val / mult, 4), source_key
-    return val, "-"
-
-def _ov(val, override, source_key):
-    """Apply absolute override. Returns (modded, source)."""
-    if override is not None and override != val:
-        return override, source_key
-    return val, "-"
+# ── Helpers for detail rows ──
 
 def _row(label, vanilla, modded, source):
     """Create a param row tuple, auto-detect unchanged."""
@@ -547,147 +633,133 @@ def _row(label, vanilla, modded, source):
         source = "-"
     return (label, vanilla, modded, source)
 
-def build_proj_section(name, proj_name, impact_v, ricochet_v, splash_v, pen_v,
-                       speed_v, lifetime_v, is_instant, has_splash, has_pen,
-                       dmg_m, rng_m, spd_m, proj_overrides):
-    """Build projectile parameter list with computed vanilla/modded values."""
+def _frow(label, uv, field):
+    """Param row for an engine field: vanilla, modded and its source."""
+    return _row(label, uv.van(field), uv.mod(field), uv.src(field))
+
+def build_proj_section(uv, slot, has_splash, has_pen):
+    """Build projectile parameter list for one weapon slot (see PROJ_SLOTS)."""
     params = []
 
-    # Damage fields
-    impact_m = modded_proj_dmg(name, proj_name, "m_fImpactDamage", impact_v)
-    ricochet_m = modded_proj_dmg(name, proj_name, "m_fRicochetDamage", ricochet_v)
-    splash_m = modded_proj_dmg(name, proj_name, "m_fSplashDamageMax", splash_v)
-    pen_m = modded_proj_dmg(name, proj_name, "m_fPenetratingDamage", pen_v)
-
-    params.append(_row("Impact Damage", impact_v, impact_m,
-                        dmg_source(name, proj_name, "m_fImpactDamage", impact_v, impact_m)))
-    if ricochet_v > 0 or ricochet_m > 0:
-        params.append(_row("Ricochet Damage", ricochet_v, ricochet_m,
-                            dmg_source(name, proj_name, "m_fRicochetDamage", ricochet_v, ricochet_m)))
-    if splash_v > 0 or has_splash:
-        params.append(_row("Splash Damage", splash_v, splash_m,
-                            dmg_source(name, proj_name, "m_fSplashDamageMax", splash_v, splash_m)))
-    if pen_v > 0 or has_pen:
-        params.append(_row("Penetrating Dmg", pen_v, pen_m,
-                            dmg_source(name, proj_name, "m_fPenetratingDamage", pen_v, pen_m)))
+    # Damage fields (absolute override > damage_mult > vanilla)
+    params.append(_frow("Impact Damage", uv, f"{slot}.impact"))
+    if uv.van(f"{slot}.ricochet") > 0 or uv.mod(f"{slot}.ricochet") > 0:
+        params.append(_frow("Ricochet Damage", uv, f"{slot}.ricochet"))
+    if uv.van(f"{slot}.splash") > 0 or has_splash:
+        params.append(_frow("Splash Damage", uv, f"{slot}.splash"))
+    if uv.van(f"{slot}.pen") > 0 or has_pen:
+        params.append(_frow("Penetrating Dmg", uv, f"{slot}.pen"))
 
     # Speed / Lifetime / Range
-    if is_instant:
+    speed_v = uv.van(f"{slot}.speed")
+    lifetime_v = uv.van(f"{slot}.life")
+    if uv.van(f"{slot}.instant"):
         # Instant-hit: m_fBaseSpeed IS the raycast distance (= range)
-        m_spd = speed_v
-        src_parts = []
-        if abs(rng_m - 1.0) > 0.001:
-            m_spd *= rng_m
-            src_parts.append("range_mult")
-        if abs(spd_m - 1.0) > 0.001:
-            m_spd *= spd_m
-            src_parts.append("proj_speed_mult")
-        m_spd = round(m_spd, 1)
-        spd_src = "+".join(src_parts) if src_parts else "-"
-
         params.append(("Instant Hit", "Yes", "Yes", ""))
-        params.append(_row("Speed (= Range)", speed_v, m_spd, spd_src))
+        params.append(_frow("Speed (= Range)", uv, f"{slot}.speed"))
         if lifetime_v > 0:
             params.append(("Lifetime (visual only)", lifetime_v, lifetime_v, "-"))
-        params.append(_row("Effective Range (m)", round(speed_v), round(m_spd), spd_src))
+        params.append(_frow("Effective Range (m)", uv, f"{slot}.eff"))
     else:
         # Normal projectile: range = speed * lifetime
-        m_spd, spd_src = _m(speed_v, spd_m, "proj_speed_mult")
-        m_lt, lt_src = _m(lifetime_v, rng_m, "range_mult")
-
         params.append(("Instant Hit", "No", "No", ""))
         if speed_v > 0:
-            params.append(_row("Proj Speed", speed_v, m_spd, spd_src))
+            params.append(_frow("Proj Speed", uv, f"{slot}.speed"))
         if lifetime_v > 0:
-            params.append(_row("Proj Lifetime (s)", lifetime_v, m_lt, lt_src))
-
-        eff_v = round(speed_v * lifetime_v) if speed_v > 0 and lifetime_v > 0 else 0
-        eff_m = round(m_spd * m_lt) if m_spd > 0 and m_lt > 0 else 0
-        if eff_v > 0:
-            rng_src = "-"
-            if eff_v != eff_m:
-                parts = []
-                if spd_src != "-": parts.append("proj_speed_mult")
-                if lt_src != "-": parts.append("range_mult")
-                rng_src = "+".join(parts) if parts else "-"
-            params.append(_row("Effective Range (m)", eff_v, eff_m, rng_src))
+            params.append(_frow("Proj Lifetime (s)", uv, f"{slot}.life"))
+        if uv.van(f"{slot}.eff") > 0:
+            params.append(_frow("Effective Range (m)", uv, f"{slot}.eff"))
 
     return params
 
-def write_unit_detail_tab(wb, u):
-    """Create a comprehensive detail tab for a single unit."""
-    name = u["name"]
+def build_hit_section(w):
+    """Hit chance / spread-adjusted DPS rows for one weapon (see accuracy.py)."""
+    from accuracy import DISTANCES, SIZE_CLASSES
+
+    params = [_row("Spread (deg)", round(w["spread"][0], 4), round(w["spread"][1], 4),
+                   "accuracy_mult")]
+    cols = [DISTANCES.index(d) for d in HIT_DISTANCES]
+    for c, cls in enumerate(SIZE_CLASSES):
+        for k, d in zip(cols, HIT_DISTANCES):
+            hit = [w["hit"][x][c, k] for x in (0, 1)]
+            if not any(h == h for h in hit):
+                continue  # out of range either way
+            pct = [round(100 * h) if h == h else "out of range" for h in hit]
+            dps = [round(w["dps"][x] * h, 1) if h == h else "out of range"
+                   for x, h in enumerate(hit)]
+            params.append(_row(f"Hit % vs {cls} @ {d} m", *pct, "spread model"))
+            params.append(_row(f"DPS vs {cls} @ {d} m", *dps, "spread model"))
+    return params
+
+def build_splash_section(w):
+    """Splash falloff and formation damage rows for one weapon (see splash.py)."""
+    from splash import FORMATIONS
+
+    params = [_row("Splash Radius Max (m)", *w["r_max"], "splash_radius_max_mult"),
+              _row("Splash Radius Min (m)", *w["r_min"], "splash_radius_min_mult"),
+              _row("Splash Falloff Power", *w["r_pow"], "splash_radius_pow_mult")]
+    for r, van, mod in zip(w["radii"], *w["profile"]):
+        params.append(_row(f"Splash Dmg @ {r} m", round(van, 1), round(mod, 1), "falloff"))
+    for name, (hit, dmg) in w["formations"].items():
+        label = f"{name}, {FORMATIONS[name]:g} m"
+        params.append(_row(f"Units Hit ({label})", *(round(x) for x in hit), "falloff"))
+        params.append(_row(f"Splash on Them ({label})", *(round(x) for x in dmg), "falloff"))
+    return params
+
+def detail_tab_title(wb, name):
+    """Tab title for a unit's detail tab, given the tabs wb already has."""
     tab_name = name[:31]  # Excel 31 char limit
     existing = [ws.title for ws in wb.worksheets]
     if tab_name in existing:
         tab_name = tab_name[:28] + "..."
-    ws = wb.create_sheet(title=tab_name)
+    return tab_name
+
+def write_unit_detail_tab(wb, u, values, tab_name=None, weapons=None, splash=None):
+    """Create a comprehensive detail tab for a single unit.
+
+    weapons / splash are the unit's accuracy.weapon_report() /
+    splash.splash_report() entries; with them, projectiles with a spread get
+    a hit chance section and splash projectiles a splash profile.
+    """
+    name = u["name"]
+    if tab_name is None:
+        tab_name = detail_tab_title(wb, name)
+    out = SheetOut(wb, tab_name, widths=ColumnWidths(lo={1: 26, 2: 18, 3: 18, 4: 16}, hi=40))
 
     # Title row
     faction = u.get("faction", "?")
-    fill_map = {"Sol": HEADER_FILL_SOL, "Centauri": HEADER_FILL_CENT, "Alien": HEADER_FILL_ALIEN}
-    title_fill = fill_map.get(faction, HEADER_FILL_TECH)
+    style_map = {"Sol": "ub_title_sol", "Centauri": "ub_title_cent", "Alien": "ub_title_alien"}
+    title_style = style_map.get(faction, "ub_title_tech")
 
-    ws.cell(row=1, column=1, value=f"{name} — Weapon Detail ({faction})")
-    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=4)
-    for c in range(1, 5):
-        cell = ws.cell(row=1, column=c)
-        cell.font = Font(bold=True, color="FFFFFF", size=11)
-        cell.fill = title_fill
-        cell.border = THIN_BORDER
+    title = out.cells([f"{name} — Weapon Detail ({faction})", None, None, None], title_style)
+    row = out.append(title, track=False)
+    out.merge(row, 1, 4)
+    out.append()
 
     # ── Config ──
-    cfg = units_cfg.get(name, {})
-    dmg_m = cfg.get("damage_mult", 1.0)
-    hp_m = cfg.get("health_mult", 1.0)
-    cost_m = cfg.get("cost_mult", 1.0)
-    bt_m = cfg.get("build_time_mult", 1.0)
-    rng_m = cfg.get("range_mult", 1.0)
-    spd_m = cfg.get("proj_speed_mult", 1.0)
-    acc_m = cfg.get("accuracy_mult", 1.0)
-    mag_m = cfg.get("magazine_mult", 1.0)
-    fr_m = cfg.get("fire_rate_mult", 1.0)
-    rld_m = cfg.get("reload_time_mult", 1.0)
-    mv_m = cfg.get("move_speed_mult", 1.0)
-    tr_m = cfg.get("turn_radius_mult", 1.0)
-    min_tier_ov = cfg.get("min_tier")
-    build_rad = cfg.get("build_radius")
-    cfg_note = cfg.get("_note", "")
-
-    row = 3
+    uv = values.of(u)
+    cfg_note = uv.cfg.get("_note", "")
 
     # ── Overview section ──
     overview = []
-    hp = u.get("hp", 0)
-    if hp > 0:
-        m, s = _mi(hp, hp_m, "health_mult")
-        overview.append(_row("HP", hp, m, s))
-    cost = u.get("cost", 0)
-    if cost > 0:
-        m, s = _mi(cost, cost_m, "cost_mult")
-        overview.append(_row("Cost", cost, m, s))
-    bt = u.get("build_time", 0)
-    if bt > 0:
-        m, s = _m(bt, bt_m, "build_time_mult")
-        overview.append(_row("Build Time (s)", bt, m, s))
-    tier = u.get("min_tier", -1)
-    if tier >= 0:
-        m, s = _ov(tier, min_tier_ov, "min_tier")
-        overview.append(_row("Min Tier", tier, m, s))
-    ms = u.get("move_speed", 0)
+    if uv.van("hp") > 0:
+        overview.append(_frow("HP", uv, "hp"))
+    if uv.van("cost") > 0:
+        overview.append(_frow("Cost", uv, "cost"))
+    if uv.van("build_time") > 0:
+        overview.append(_frow("Build Time (s)", uv, "build_time"))
+    if uv.van("min_tier") >= 0:
+        overview.append(_frow("Min Tier", uv, "min_tier"))
+    ms = uv.van("move_speed")
+    veh_type = u.get("veh_type", "")
     if ms > 0:
-        m, s = _m(ms, mv_m, "move_speed_mult")
-        veh_type = u.get("veh_type", "")
         label = "Move Speed (m/s)"
         if veh_type == "Wheeled":
             label = f"Move Speed (m/s, top={round(ms*2.03)})"
-        overview.append(_row(label, ms, m, s))
-    fs = u.get("fly_speed", 0)
-    if fs > 0:
-        m, s = _m(fs, mv_m, "move_speed_mult")
-        overview.append(_row("Fly Speed (m/s)", fs, m, s))
+        overview.append(_frow(label, uv, "move_speed"))
+    if uv.van("fly_speed") > 0:
+        overview.append(_frow("Fly Speed (m/s)", uv, "fly_speed"))
     # Vehicle-specific movement
-    veh_type = u.get("veh_type", "")
     if veh_type == "Wheeled":
         va = u.get("veh_accel", 0)
         if va > 0:
@@ -695,10 +767,8 @@ def write_unit_detail_tab(wb, u):
         vr = u.get("veh_reverse_scale", 0)
         if vr > 0:
             overview.append(("Reverse Speed Scale", vr, vr, "-"))
-        vtr = u.get("veh_turn_radius", 0)
-        if vtr > 0:
-            m, s = _m(vtr, tr_m, "turn_radius_mult")
-            overview.append(_row("Turn Radius (m)", vtr, m, s))
+        if uv.van("veh_turn_radius") > 0:
+            overview.append(_frow("Turn Radius (m)", uv, "veh_turn_radius"))
     elif veh_type == "Hovered":
         va = u.get("veh_accel", 0)
         if va > 0:
@@ -707,18 +777,12 @@ def write_unit_detail_tab(wb, u):
         if vts > 0:
             overview.append(("Turn Speed (deg/s)", vts, vts, "-"))
     # Soldier movement
-    ws_val = u.get("walk_speed", 0)
-    rs_val = u.get("run_speed", 0)
-    if ws_val > 0:
-        m, s = _m(ws_val, mv_m, "move_speed_mult")
-        overview.append(_row("Walk Speed", ws_val, m, s))
-    if rs_val > 0:
-        m, s = _m(rs_val, mv_m, "move_speed_mult")
-        overview.append(_row("Run Speed", rs_val, m, s))
-    td = u.get("target_dist", 0)
-    if td > 0:
-        m, s = _m(td, rng_m, "range_mult")
-        overview.append(_row("Targeting Distance", td, m, s))
+    if uv.van("walk_speed") > 0:
+        overview.append(_frow("Walk Speed", uv, "walk_speed"))
+    if uv.van("run_speed") > 0:
+        overview.append(_frow("Run Speed", uv, "run_speed"))
+    if uv.van("target_dist") > 0:
+        overview.append(_frow("Targeting Distance", uv, "target_dist"))
     fow = u.get("fow_view", 0)
     if fow > 0:
         overview.append(("FoW View Distance", fow, fow, "-"))
@@ -726,188 +790,241 @@ def write_unit_detail_tab(wb, u):
         overview.append(("Config Note", cfg_note, "", ""))
 
     if overview:
-        row = write_section(ws, row, "Overview", overview)
-
-    # ── VehicleTurret Primary ──
-    vt_proj = u.get("vt_proj", "")
-    if u.get("vt_fire_interval", 0) > 0 or vt_proj:
+        write_section(out, "Overview", overview)
+
+    # ── VehicleTurret weapons, primary first ──
+    armed = sorted((t for t in u.turrets if t.armed), key=lambda t: t.scope != "pri")
+    multi = len({t.index for t in armed}) > 1 or any(t.index for t in armed)
+    for t in armed:
+        label = "Primary Turret" if t.scope == "pri" else "Secondary Turret"
+        if multi:
+            label += f" (VehicleTurret {t.index + 1} {t.weapon})"
         turret = []
-        fi = u.get("vt_fire_interval", 0)
-        if fi > 0:
-            m, s = _div(fi, fr_m, "fire_rate_mult")
-            turret.append(_row("Fire Interval (s)", fi, m, s))
-        sp = u.get("vt_spread", 0)
-        if sp > 0:
-            m, s = _m(sp, acc_m, "accuracy_mult")
-            turret.append(_row("Muzzle Spread", sp, m, s))
-        mg = u.get("vt_magazine", 0)
-        if mg > 0:
-            m, s = _mi(mg, mag_m, "magazine_mult")
-            turret.append(_row("Magazine Size", mg, m, s))
-        sc = u.get("vt_shot_count", 0)
-        if sc > 0:
-            turret.append(("Shot Count", sc, sc, "-"))
-        rl = u.get("vt_reload", 0)
-        if rl > 0:
-            m, s = _m(rl, rld_m, "reload_time_mult")
-            turret.append(_row("Reload Time (s)", rl, m, s))
+        if t.fire_interval > 0:
+            turret.append(_frow("Fire Interval (s)", uv, t.key("fire_interval")))
+        if t.spread > 0:
+            turret.append(_frow("Muzzle Spread", uv, t.key("spread")))
+        if t.magazine > 0:
+            turret.append(_frow("Magazine Size", uv, t.key("magazine")))
+        if t.shot_count > 0:
+            turret.append(("Shot Count", t.shot_count, t.shot_count, "-"))
+        if t.reload > 0:
+            turret.append(_frow("Reload Time (s)", uv, t.key("reload")))
         if turret:
-            row = write_section(ws, row, "Primary Turret", turret)
-
-        if vt_proj:
-            proj = build_proj_section(name, vt_proj,
-                u.get("vt_impact_dmg", 0), u.get("vt_ricochet_dmg", 0),
-                u.get("vt_splash_dmg", 0), u.get("vt_pen_dmg", 0),
-                u.get("vt_proj_speed", 0), u.get("vt_proj_lifetime", 0),
-                u.get("vt_instant_hit", False),
-                u.get("vt_has_splash", False), u.get("vt_has_pen", False),
-                dmg_m, rng_m, spd_m, cfg.get("projectiles", {}))
-            if proj:
-                row = write_section(ws, row, f"Projectile: {vt_proj}", proj)
-
-    # ── VehicleTurret Secondary ──
-    vt2_proj = u.get("vt2_proj", "")
-    if u.get("vt2_fire_interval", 0) > 0 or vt2_proj:
-        turret2 = []
-        fi = u.get("vt2_fire_interval", 0)
-        if fi > 0:
-            m, s = _div(fi, fr_m, "fire_rate_mult")
-            turret2.append(_row("Fire Interval (s)", fi, m, s))
-        sp = u.get("vt2_spread", 0)
-        if sp > 0:
-            m, s = _m(sp, acc_m, "accuracy_mult")
-            turret2.append(_row("Muzzle Spread", sp, m, s))
-        mg = u.get("vt2_magazine", 0)
-        if mg > 0:
-            m, s = _mi(mg, mag_m, "magazine_mult")
-            turret2.append(_row("Magazine Size", mg, m, s))
-        sc = u.get("vt2_shot_count", 0)
-        if sc > 0:
-            turret2.append(("Shot Count", sc, sc, "-"))
-        rl = u.get("vt2_reload", 0)
-        if rl > 0:
-            m, s = _m(rl, rld_m, "reload_time_mult")
-            turret2.append(_row("Reload Time (s)", rl, m, s))
-        if turret2:
-            row = write_section(ws, row, "Secondary Turret", turret2)
-
-        if vt2_proj:
-            proj = build_proj_section(name, vt2_proj,
-                u.get("vt2_impact_dmg", 0), u.get("vt2_ricochet_dmg", 0),
-                u.get("vt2_splash_dmg", 0), u.get("vt2_pen_dmg", 0),
-                u.get("vt2_proj_speed", 0), u.get("vt2_proj_lifetime", 0),
-                u.get("vt2_instant_hit", False),
-                u.get("vt2_has_splash", False), u.get("vt2_has_pen", False),
-                dmg_m, rng_m, spd_m, cfg.get("projectiles", {}))
-            if proj:
-                row = write_section(ws, row, f"Projectile: {vt2_proj}", proj)
+            write_section(out, label, turret)
 
-    # ── Creature Primary Attack ──
-    atk_proj = u.get("atk_proj", "")
-    if u.get("atk_damage", 0) > 0 or atk_proj:
+        if t.proj:
+            proj = build_proj_section(uv, t.slot, t.has_splash, t.has_pen)
+            if proj:
+                write_section(out, f"Projectile: {t.proj}", proj)
+            write_hit_section(out, weapons, t.slot, t.proj)
+            write_splash_section(out, splash, t.slot, t.proj)
+
+    # ── Creature Primary / Secondary Attack ──
+    for p, label in (("atk_", "Primary Attack"), ("atk2_", "Secondary Attack")):
+        proj_name = u.get(f"{p}proj", "")
+        if not (u.get(f"{p}damage", 0) > 0 or proj_name):
+            continue
         atk = []
-        ad = u.get("atk_damage", 0)
-        if ad > 0:
-            m, s = _m(ad, dmg_m, "damage_mult")
-            atk.append(_row("Melee/Attack Damage", ad, round(m), s))
-        ac = u.get("atk_cooldown", 0)
+        if uv.van(f"{p}damage") > 0:
+            atk.append(_frow("Melee/Attack Damage", uv, f"{p}damage"))
+        ac = u.get(f"{p}cooldown", 0)
         if ac > 0:
             atk.append(("Cooldown (s)", ac, ac, "-"))
-        ar = u.get("atk_range", 0)
-        if ar > 0:
-            m, s = _m(ar, rng_m, "range_mult")
-            atk.append(_row("AI Range (AimDistMax)", ar, round(m), s))
-        asp = u.get("atk_spread", 0)
-        if asp > 0:
-            m, s = _m(asp, acc_m, "accuracy_mult")
-            atk.append(_row("Spread", asp, m, s))
+        if uv.van(f"{p}range") > 0:
+            atk.append(_frow("AI Range (AimDistMax)", uv, f"{p}range"))
+        if uv.van(f"{p}spread") > 0:
+            atk.append(_frow("Spread", uv, f"{p}spread"))
         if atk:
-            row = write_section(ws, row, "Primary Attack", atk)
-
-        if atk_proj:
-            proj = build_proj_section(name, atk_proj,
-                u.get("proj_impact_dmg", 0), u.get("proj_ricochet_dmg", 0),
-                u.get("proj_splash_dmg", 0), 0,
-                u.get("proj_speed", 0), u.get("proj_lifetime", 0),
-                u.get("instant_hit", False), False, False,
-                dmg_m, rng_m, spd_m, cfg.get("projectiles", {}))
-            if proj:
-                row = write_section(ws, row, f"Projectile: {atk_proj}", proj)
-
-    # ── Creature Secondary Attack ──
-    atk2_proj = u.get("atk2_proj", "")
-    if u.get("atk2_damage", 0) > 0 or atk2_proj:
-        atk2 = []
-        ad = u.get("atk2_damage", 0)
-        if ad > 0:
-            m, s = _m(ad, dmg_m, "damage_mult")
-            atk2.append(_row("Melee/Attack Damage", ad, round(m), s))
-        ac = u.get("atk2_cooldown", 0)
-        if ac > 0:
-            atk2.append(("Cooldown (s)", ac, ac, "-"))
-        ar = u.get("atk2_range", 0)
-        if ar > 0:
-            m, s = _m(ar, rng_m, "range_mult")
-            atk2.append(_row("AI Range (AimDistMax)", ar, round(m), s))
-        asp = u.get("atk2_spread", 0)
-        if asp > 0:
-            m, s = _m(asp, acc_m, "accuracy_mult")
-            atk2.append(_row("Spread", asp, m, s))
-        if atk2:
-            row = write_section(ws, row, "Secondary Attack", atk2)
-
-        if atk2_proj:
-            proj = build_proj_section(name, atk2_proj,
-                u.get("proj2_impact_dmg", 0), u.get("proj2_ricochet_dmg", 0),
-                u.get("proj2_splash_dmg", 0), 0,
-                u.get("proj2_speed", 0), u.get("proj2_lifetime", 0),
-                u.get("instant_hit2", False), False, False,
-                dmg_m, rng_m, spd_m, cfg.get("projectiles", {}))
+            write_section(out, label, atk)
+
+        if proj_name:
+            proj = build_proj_section(uv, p[:-1], False, False)
             if proj:
-                row = write_section(ws, row, f"Projectile: {atk2_proj}", proj)
+                write_section(out, f"Projectile: {proj_name}", proj)
+            write_hit_section(out, weapons, p[:-1], proj_name)
+            write_splash_section(out, splash, p[:-1], proj_name)
 
-    # Auto-width
-    ws.column_dimensions["A"].width = 26
-    ws.column_dimensions["B"].width = 18
-    ws.column_dimensions["C"].width = 18
-    ws.column_dimensions["D"].width = 16
+    out.close()
+
+def write_hit_section(out, weapons, slot, proj_name):
+    w = (weapons or {}).get(slot)
+    if w and max(w["spread"]) > 0:
+        write_section(out, f"Hit Chance: {proj_name}", build_hit_section(w))
+
+def write_splash_section(out, splash, slot, proj_name):
+    w = (splash or {}).get(slot)
+    if w:
+        write_section(out, f"Splash Profile: {proj_name}", build_splash_section(w))
 
-def write_all_unit_detail_tabs(wb):
+def write_all_unit_detail_tabs(wb, table, values, units_cfg=None):
     """Write per-unit weapon detail tabs for all units with weapons."""
-    count = 0
-    for u in all_units:
-        name = u["name"]
-        if name in SKIP_NAMES or is_tech_tier(name):
-            continue
-        if u.get("team") == "Team_AlienWorms":
-            continue
-        if not has_weapons(u):
-            continue
-        write_unit_detail_tab(wb, u)
-        count += 1
-    return count
+    from accuracy import weapon_report
+    from splash import splash_report
+
+    detail = [u for u in table["detail_units"] if has_weapons(u)]
+    units_cfg = units_cfg or {}
+    for u, weapons, splash in zip(detail, weapon_report(detail, units_cfg),
+                                  splash_report(detail, units_cfg)):
+        write_unit_detail_tab(wb, u, values, weapons=weapons, splash=splash)
+    return len(detail)
 
 # ══════════════════════════════════════════════════════════════
 # BUILD
 # ══════════════════════════════════════════════════════════════
 
-wb = Workbook()
-wb.remove(wb.active)
-
-write_sheet(wb, "Sol", sol_structures, sol_units, HEADER_FILL_SOL)
-write_sheet(wb, "Centauri", cent_structures, cent_units, HEADER_FILL_CENT)
-write_sheet(wb, "Alien", alien_structures, alien_units, HEADER_FILL_ALIEN)
-write_tech_sheet(wb)
-write_production_tree_sheet(wb)
-detail_count = write_all_unit_detail_tabs(wb)
-
-wb.save(OUTPUT_PATH)
-print(f"Saved: {OUTPUT_PATH}")
-print(f"Sheets: {wb.sheetnames}")
-print(f"Columns per sheet: {NC}")
-
-# Summary
-print(f"\nSol: {len(sol_structures)} structures, {len(sol_units)} units")
-print(f"Centauri: {len(cent_structures)} structures, {len(cent_units)} units")
-print(f"Alien: {len(alien_structures)} structures, {len(alien_units)} units")
-print(f"Unit detail tabs: {detail_count}")
+def load_dump(path=DUMP_PATH, use_cache=True):
+    """Parsed + indexed dump table (see dump_cache.py), cached by content."""
+    return load_indexed_dump(path, use_cache=use_cache)
+
+def load_config(path=CONFIG_PATH):
+    with open(path, "r") as f:
+        return json.load(f)
+
+def tab_jobs(table, config, values):
+    """[(title or None, inputs, writer(wb, title))] for every tab, in order.
+
+    inputs is everything the writer reads from the dump and config, for the
+    incremental fingerprint; a title of None is resolved against the tabs
+    created so far (detail_tab_title).
+    """
+    units_cfg = config.get("units", {})
+    factions = table["factions"]
+    jobs = []
+    for title, header_style in (("Sol", "ub_header_sol"), ("Centauri", "ub_header_cent"),
+                                ("Alien", "ub_header_alien")):
+        structures, units = factions[title]
+        inputs = [(e, units_cfg.get(e["name"])) for e in structures + units]
+        jobs.append((title, inputs,
+                     lambda wb, t, s=structures, u=units, h=header_style:
+                         write_sheet(wb, t, s, u, h, values)))
+    tech_cfg = config.get("tech_time", {})
+    jobs.append(("Tech Tiers", tech_cfg, lambda wb, t: write_tech_sheet(wb, tech_cfg)))
+    prod_tree = table["production_tree"]
+    jobs.append(("Production Tree", prod_tree,
+                 lambda wb, t: write_production_tree_sheet(wb, prod_tree)))
+    # Only what ReachIndex reads, so other config edits leave the tab alone
+    gating = [(u.name, u.built_at, u.is_structure, u.min_tier,
+               (units_cfg.get(u.name) or {}).get("min_tier"))
+              for u in table["units"]
+              if u.faction in factions and (is_listed_unit(u) or is_tech_tier(u.name))]
+    jobs.append(("Tech Reach", [tech_cfg, prod_tree, gating],
+                 lambda wb, t: write_reach_sheet(wb, table, config)))
+    combat = [u for structures, units in factions.values() for u in units]
+    jobs.append(("TTK Matrix", [(u, units_cfg.get(u["name"])) for u in combat],
+                 lambda wb, t: write_ttk_sheet(wb, combat, units_cfg)))
+    listed = [u for structures, units in factions.values() for u in structures + units]
+    jobs.append(("Sensitivity", [tech_cfg, [(u, units_cfg.get(u["name"])) for u in listed]],
+                 lambda wb, t: write_sensitivity_sheet(wb, table, config)))
+    detail = [u for u in table["detail_units"] if has_weapons(u)]
+    report = []
+
+    def weapons(k):
+        # Hit tables and splash profiles for every detail tab, each in one
+        # batch, once a tab needs them
+        if not report:
+            from accuracy import weapon_report
+            from splash import splash_report
+            report.extend([weapon_report(detail, units_cfg), splash_report(detail, units_cfg)])
+        return report[0][k], report[1][k]
+
+    for k, u in enumerate(detail):
+        jobs.append((None, (u, units_cfg.get(u["name"])),
+                     lambda wb, t, u=u, k=k: write_unit_detail_tab(wb, u, values, t, *weapons(k))))
+    return jobs
+
+def build_workbook(table, config, output_path=None, stream=False, incremental=False):
+    """Build the balance workbook from a dump table and overlay config.
+
+    Saves to output_path when given (required for stream=True, since a
+    write-only workbook can only be saved) and returns the Workbook.
+
+    incremental=True (implies stream) reuses the XML of every tab whose
+    inputs are unchanged since a previous build (see tab_cache.py);
+    wb.rebuilt_tabs then lists the tabs that were actually written.
+    """
+    from balance_engine import BalanceTable
+
+    if incremental:
+        if output_path is None:
+            raise ValueError("incremental build needs an output_path")
+        import tab_cache
+        stream = True
+
+    values = BalanceTable(table["units"], config.get("units", {}))
+
+    _load_backend()
+    wb = Workbook(write_only=stream)
+    if not stream:
+        wb.remove(wb.active)
+    register_styles(wb)
+
+    tabs, rebuilt = [], []
+    for title, inputs, writer in tab_jobs(table, config, values):
+        if title is None:
+            title = detail_tab_title(wb, inputs[0]["name"])
+        if not incremental:
+            writer(wb, title)
+            continue
+        fp = tab_cache.fingerprint(title, inputs)
+        reused = tab_cache.has_tab(fp)
+        if reused:
+            wb.create_sheet(title=title)  # placeholder, replaced after save
+        else:
+            writer(wb, title)
+            rebuilt.append(title)
+        tabs.append((fp, reused))
+
+    if output_path is not None:
+        wb.save(output_path)
+    if incremental:
+        tab_cache.splice(output_path, tabs)
+        tab_cache.prune()
+        wb.rebuilt_tabs = rebuilt
+    return wb
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Build the Si_UnitBalance balance sheet.")
+    ap.add_argument("--dump", default=DUMP_PATH)
+    ap.add_argument("--config", default=CONFIG_PATH)
+    ap.add_argument("--output", default=OUTPUT_PATH)
+    ap.add_argument("--stream", action="store_true",
+                    help="write-only workbook, flushed one sheet at a time")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="parse the dump even if .cache/ has it")
+    ap.add_argument("--incremental", action="store_true",
+                    help="only rewrite tabs whose inputs changed (implies --stream)")
+    ap.add_argument("--ttk-csv", default=None,
+                    help="also write the TTK Matrix sheet's data to this CSV")
+    ap.add_argument("--sensitivity-json", default=None,
+                    help="also write the Sensitivity sheet's data to this JSON file")
+    args = ap.parse_args(argv)
+
+    table = load_dump(args.dump, use_cache=not args.no_cache)
+    config = load_config(args.config)
+    wb = build_workbook(table, config, args.output, stream=args.stream,
+                        incremental=args.incremental)
+    print(f"Saved: {args.output}")
+    if args.ttk_csv:
+        from combat_engine import combat_units, ttk_report, write_ttk_csv
+        write_ttk_csv(ttk_report(combat_units(table), config.get("units", {})), args.ttk_csv)
+        print(f"Saved: {args.ttk_csv}")
+    if args.sensitivity_json:
+        from sensitivity import jacobian, write_json
+        write_json(jacobian(table, config), args.sensitivity_json)
+        print(f"Saved: {args.sensitivity_json}")
+    if args.incremental:
+        print(f"Tabs rebuilt: {len(wb.rebuilt_tabs)} / {len(wb.sheetnames)}")
+    print(f"Sheets: {wb.sheetnames}")
+    print(f"Columns per sheet: {NC}")
+
+    # Summary
+    print()
+    for faction in ("Sol", "Centauri", "Alien"):
+        structures, units = table["factions"][faction]
+        print(f"{faction}: {len(structures)} structures, {len(units)} units")
+    detail_count = sum(1 for u in table["detail_units"] if has_weapons(u))
+    print(f"Unit detail tabs: {detail_count}")
+
+if __name__ == "__main__":
+    main()
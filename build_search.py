@@ -0,0 +1,241 @@
+"""
+Beam search for the fastest build order to a target composition.
+
+Answers "how soon can Sol field 3 Siege Tanks / Alien a Colossus" for the
+vanilla and the modded config, per faction, instead of estimating it by
+hand from TECH_CUMULATIVE:
+
+  build_search.py --target "Sol: 3 Siege Tank" --target "Alien: Colossus"
+  build_search.py --target "Centauri: 2 Heavy Tank + 4 Trooper" --income 25
+
+Orders are grown one item at a time. The candidate next items of an order
+are the things that can still help:
+  - the next research tier, while a target needs a higher min_tier
+  - a missing structure on the producer chain of a remaining target (or of
+    the research structure), once the planned tier allows it
+  - another copy of a target's producer, up to the number still needed
+    (parallel production queues), at most MAX_COPIES
+  - a target unit whose producer and tier are planned
+Every order is run through build_order.simulate (with --income / --start
+costs gate it too) and scored by a lower bound on when the composition
+can be complete. Only the WIDTH best orders are kept per step, and an order
+is dropped when another one with the same items (in any order) already
+scored as well or better, so equivalent permutations are simulated once.
+
+--baseline PATH compares against another config instead of vanilla.
+
+Run: E:/Anaconda/python.exe build_search.py --target "Faction: [N] Unit [+ ...]"
+         [--target ...] [--width N] [--income R] [--start R] [--show]
+         [--baseline PATH] [--dump PATH] [--config PATH]
+  --show  print the best order's timeline for every target and config
+"""
+import argparse
+import math
+import sys
+import time
+from collections import Counter
+
+from build_order import INF, TechTree, print_timeline, simulate
+from dump_cache import FACTIONS, load_indexed_dump
+
+WIDTH = 64
+# Most copies of one producer an order may build
+MAX_COPIES = 4
+
+# ══════════════════════════════════════════════════════════════
+# TARGETS
+# ══════════════════════════════════════════════════════════════
+
+def parse_target(spec):
+    """'Sol: 3 Siege Tank + Light Quad' -> ('Sol', Counter({...}))."""
+    faction, sep, body = spec.partition(":")
+    faction = faction.strip()
+    if not sep or faction not in FACTIONS:
+        raise ValueError(f"bad target {spec!r} (want 'Faction: [N] Unit [+ ...]', "
+                         f"faction one of {', '.join(FACTIONS)})")
+    want = Counter()
+    for part in body.split("+"):
+        words = part.strip().split(None, 1)
+        if not words:
+            raise ValueError(f"bad target {spec!r}: empty entry")
+        count = words[0].rstrip("x")
+        if count.isdigit() and len(words) == 2:
+            want[words[1].strip()] += int(count)
+        else:
+            want[part.strip()] += 1
+    return faction, want
+
+def describe(want):
+    return " + ".join(f"{n} {name}" if n > 1 else name for name, n in want.items())
+
+# ══════════════════════════════════════════════════════════════
+# SEARCH
+# ══════════════════════════════════════════════════════════════
+
+class Search:
+    """Beam search over build orders for one tech tree and composition."""
+
+    def __init__(self, tree, want, start=0.0, income=None, width=WIDTH):
+        self.tree = tree
+        self.want = want
+        self.start = start
+        self.income = income
+        self.width = width
+        items = tree.items
+        missing = [n for n in want if n not in items]
+        if missing:
+            raise ValueError(f"not buildable: {', '.join(missing)}")
+        self.research = tree.research_items()
+        lab = next(iter(self.research.values()), None)
+        needed = [s for n in want for s in tree.producer_chain(n)]
+        # Structures on a chain need every tier their own producers need
+        self.gate = {}
+        for s in dict.fromkeys(needed):
+            self.gate[s] = max(items[p].min_tier for p in tree.producer_chain(s) + [s])
+        self.top = max([items[n].min_tier for n in want] + list(self.gate.values()))
+        if lab is not None and self.top > 0:
+            for s in tree.producer_chain(lab.name):
+                self.gate.setdefault(s, -1)
+                needed.append(s)
+        self.needed = [s for s in dict.fromkeys(needed) if s not in tree.start]
+        self.simulated = 0
+
+    def moves(self, have, tier):
+        """Items worth appending to an order that has issued Counter have."""
+        items, tree = self.tree.items, self.tree
+        built = lambda s: s in tree.start or have[s] > 0  # noqa: E731
+        out = []
+        nxt = self.research.get(tier + 1)
+        if tier < self.top and nxt is not None and built(nxt.producer):
+            out.append(nxt.name)
+        for s in self.needed:
+            if not have[s] and self.gate[s] <= tier and built(items[s].producer):
+                out.append(s)
+        for name, n in self.want.items():
+            left = n - have[name]
+            it = items[name]
+            if left <= 0 or not built(it.producer):
+                continue
+            if it.min_tier <= tier:
+                out.append(name)
+            copies = have[it.producer] + (it.producer in tree.start)
+            if left > copies and copies < MAX_COPIES and it.producer not in tree.start \
+                    and built(items[it.producer].producer):
+                out.append(it.producer)
+        return list(dict.fromkeys(out))
+
+    def score(self, order, have, tier):
+        """(lower bound on completion, makespan so far) of a partial order."""
+        finish = simulate(self.tree, order, self.start, self.income)
+        self.simulated += 1
+        if finish and finish[-1] == INF:
+            return INF, INF
+        items = self.tree.items
+        last = order[-1]
+        clock = finish[-1] - items[last].time if order else 0.0
+        done = max((f for n, f in zip(order, finish) if n in self.want), default=0.0)
+        research = sum(self.research[k].time for k in range(tier + 1, self.top + 1)
+                       if k in self.research)
+        bound = done
+        for name, n in self.want.items():
+            left = n - have[name]
+            if left <= 0:
+                continue
+            it = items[name]
+            queues = max(1, have[it.producer] + (it.producer in self.tree.start))
+            wait = research if it.min_tier > tier else 0.0
+            bound = max(bound, clock + wait + math.ceil(left / queues) * it.time)
+        return bound, done
+
+    def run(self):
+        """(best order, its completion time); (None, INF) if none is found."""
+        beam = [((0.0, 0.0), [], Counter(), 0)]
+        seen = {}
+        best, best_t = None, INF
+        total = sum(self.want.values())
+        while beam:
+            grown = []
+            for _, order, have, tier in beam:
+                for name in self.moves(have, tier):
+                    h = have.copy()
+                    h[name] += 1
+                    t = self.tree.items[name].tier or tier
+                    o = order + [name]
+                    key = tuple(sorted(h.items()))
+                    s = self.score(o, h, t)
+                    if s[0] == INF or seen.get(key, (INF,)) <= s:
+                        continue
+                    seen[key] = s
+                    if sum(min(h[n], c) for n, c in self.want.items()) == total:
+                        if s[1] < best_t:
+                            best, best_t = o, s[1]
+                    elif s[0] < best_t:
+                        grown.append((s, o, h, t))
+            grown.sort(key=lambda g: g[0])
+            beam = grown[:self.width]
+        return best, best_t
+
+# ══════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════
+
+def _fmt(t):
+    return f"{t:8.1f}" if t != INF else f"{'-':>8s}"
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Fastest build order to a target composition.")
+    ap.add_argument("--target", action="append", required=True,
+                    help="'Faction: [N] Unit [+ [N] Unit ...]' (repeatable)")
+    ap.add_argument("--width", type=int, default=WIDTH, help="beam width")
+    ap.add_argument("--income", type=float, default=None, help="resources per second")
+    ap.add_argument("--start", type=float, default=0.0, help="starting resources (with --income)")
+    ap.add_argument("--show", action="store_true", help="print the best orders' timelines")
+    ap.add_argument("--baseline", default=None, help="compare against this config, not vanilla")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    args = ap.parse_args(argv)
+
+    try:
+        targets = [parse_target(s) for s in args.target]
+    except ValueError as ex:
+        ap.error(str(ex))
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    baseline = build_balance_sheet.load_config(args.baseline) if args.baseline else None
+    base_label = "baseline" if args.baseline else "vanilla"
+
+    print(f"  {'target':40s} {base_label:>8s} {'modded':>8s} {'delta':>8s}")
+    shown = []
+    for faction, want in targets:
+        times = []
+        for cfg in (baseline, config):
+            tree = TechTree.from_table(table, faction, cfg)
+            t0 = time.perf_counter()
+            try:
+                search = Search(tree, want, args.start, args.income, args.width)
+            except ValueError as ex:
+                ap.error(f"{faction}: {ex}")
+            order, done = search.run()
+            times.append(done)
+            shown.append((faction, want, tree, order, search.simulated,
+                          time.perf_counter() - t0))
+        v, m = times
+        delta = f"{m - v:+8.1f}" if INF not in (v, m) else f"{'':8s}"
+        print(f"  {(faction + ': ' + describe(want))[:40]:40s} {_fmt(v)} {_fmt(m)} {delta}")
+
+    for k, (faction, want, tree, order, n, dt) in enumerate(shown):
+        label = (base_label, "modded")[k % 2]
+        if args.show:
+            print(f"\n{faction}: {describe(want)} ({label}, {n} orders simulated in {dt:.2f}s)")
+            if order:
+                print_timeline(tree, order, simulate(tree, order, args.start, args.income))
+            else:
+                print("  no order reaches it")
+    if not args.show:
+        n = sum(s[4] for s in shown)
+        print(f"{n} orders simulated in {sum(s[5] for s in shown):.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""
+Vectorised DPS / time-to-kill engine.
+
+CombatModel puts every weapon slot of a list of unit records into (unit, slot)
+NumPy arrays once. resolve(units_cfg) turns a config into aligned multiplier
+arrays, and evaluate() computes modded HP and per-slot sustained DPS from
+them. Every multiplier array may carry leading batch dimensions (one entry
+per candidate config), so thousands of configs evaluate in one call.
+
+Weapon slots (dump field prefixes):
+  vt, vt2   VehicleTurret[0] primary / secondary weapon
+  vt3       VehicleTurret[1] (Bomber, Freighter, Shuttle, Gunship, ...)
+  vt4, ...  further VehicleTurret weapons, when a unit in the model has them
+            (the vt slots are read from u.turrets, see turrets.py)
+  atk, atk2 creature primary / secondary attack (melee or projectile)
+  hha       infantry hand weapon
+
+Config resolution follows the mod: a weapon slot maps to the "pri" or "sec"
+scope, and the most specific key that is set wins, e.g.
+  pri_impact_damage_mult > pri_damage_mult > impact_damage_mult > damage_mult
+VehicleTurret slots have two scopes (see turrets.py): Turret.scope for
+damage, speed, lifetime, range and splash radii, Turret.cycle_scope for
+CYCLE_MULTS (fire rate, magazine, reload, accuracy), which the mod always
+maps VT[0].Primary -> pri, every other turret weapon -> sec.
+Like the mod, a value within 0.001 of 1.0 counts as not set. Absolute
+projectile damage overrides (units_cfg[name]["projectiles"]) replace the
+vanilla damage, as on the detail tabs.
+
+Splash radii are not in the dump; they come from
+gen_default_config.projectile_db and scale with splash_radius_max_mult /
+_min_mult / _pow_mult (pri_ / sec_ first). splash_falloff() turns them
+into the damage share at a distance from the impact.
+
+Sustained DPS of one slot:
+  per_shot = hit damage * shot_count        (melee damage for melee attacks)
+  interval = fire_interval / fire_rate_mult (min 0.01 s)
+  magazine = max(1, round(magazine * magazine_mult)), reload * reload_time_mult
+  dps      = per_shot * magazine / (magazine * interval + reload)
+             (per_shot / interval without a magazine)
+A unit's DPS is the sum of its slots. TTK[attacker, defender] is the
+defender's modded HP over the attacker's DPS (inf if it has none).
+
+Run: E:/Anaconda/python.exe combat_engine.py [--dump PATH] [--config PATH]
+         [--csv PATH] [--top N]
+"""
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from dump_cache import load_indexed_dump
+from gen_default_config import projectile_db
+from turrets import slot_name
+from unit_records import column
+
+# VehicleTurret slots every model has, read from the unit's turrets.Turret
+# records. A model whose units have more (vt4, vt5, ...) widens its own slot
+# axis to the widest u.turrets: CombatModel.turret_slots / .slots.
+TURRET_SLOTS = ("vt", "vt2", "vt3")
+# Turret attribute per quantity. None = turrets have no such field.
+TURRET_FIELDS = dict(proj="proj", interval="fire_interval", magazine="magazine",
+                     reload="reload", shots="shot_count", spread="spread",
+                     impact="impact", ricochet="ricochet", splash="splash", pen="pen",
+                     speed="speed", life="life", instant="instant", melee=None)
+# Per-slot dump fields of the other slots. None = the dump has no such field.
+WEAPON_SLOTS = {
+    "atk":  dict(proj="atk_proj", interval="atk_cooldown", magazine=None, reload=None,
+                 shots=None, spread="atk_spread", impact="proj_impact_dmg",
+                 ricochet="proj_ricochet_dmg", splash="proj_splash_dmg", pen=None,
+                 speed="proj_speed", life="proj_lifetime", instant="instant_hit",
+                 melee="atk_damage"),
+    "atk2": dict(proj="atk2_proj", interval="atk2_cooldown", magazine=None, reload=None,
+                 shots=None, spread="atk2_spread", impact="proj2_impact_dmg",
+                 ricochet="proj2_ricochet_dmg", splash="proj2_splash_dmg", pen=None,
+                 speed="proj2_speed", life="proj2_lifetime", instant="instant_hit2",
+                 melee="atk2_damage"),
+    "hha":  dict(proj="hha_proj", interval="hha_fire_delay", magazine="hha_magazine",
+                 reload="hha_reload_time", shots=None, spread="hha_spread_max",
+                 impact="hha_impact_dmg", ricochet=None, splash=None, pen=None,
+                 speed="hha_proj_speed", life="hha_proj_lifetime", instant="hha_instant_hit",
+                 melee=None),
+}
+# Slot axis of a model without extra turrets
+SLOTS = TURRET_SLOTS + tuple(WEAPON_SLOTS)
+# Infantry fire rate / magazine / reload / accuracy live on
+# CharacterAttachment, which the mod cannot override
+FIXED_CYCLE_SLOTS = ("hha",)
+
+DAMAGE_PARTS = ("impact", "ricochet", "splash", "pen")
+# Config spelling of each damage part (pri_penetrating_damage_mult, ...)
+DAMAGE_KEYS = {"impact": "impact", "ricochet": "ricochet", "splash": "splash", "pen": "penetrating"}
+# ProjectileData field used by absolute overrides (as in balance_engine)
+DAMAGE_FIELDS = {
+    "impact": "m_fImpactDamage", "ricochet": "m_fRicochetDamage",
+    "splash": "m_fSplashDamageMax", "pen": "m_fPenetratingDamage",
+}
+# Share of each damage part that lands on the unit that was hit: the impact
+# plus full splash at the point of impact. Ricochets and penetration only
+# happen on glancing / through hits.
+HIT_WEIGHTS = {"impact": 1.0, "ricochet": 0.0, "splash": 1.0, "pen": 0.0}
+
+# Per-slot multipliers: quantity -> config key (tried as "<scope>_<key>", then "<key>")
+SLOT_MULTS = {
+    "fire_rate": "fire_rate_mult",
+    "magazine":  "magazine_mult",
+    "reload":    "reload_time_mult",
+    "accuracy":  "accuracy_mult",
+    "speed":     "proj_speed_mult",
+    "life":      "proj_lifetime_mult",
+    "range":     "range_mult",
+    "splash_r_max": "splash_radius_max_mult",
+    "splash_r_min": "splash_radius_min_mult",
+    "splash_r_pow": "splash_radius_pow_mult",
+}
+# SLOT_MULTS resolved with the slot's cycle scope (VehicleTurret weapon
+# params, set on the turret rather than the ProjectileData)
+CYCLE_MULTS = ("fire_rate", "magazine", "reload", "accuracy")
+# Splash radius fields of gen_default_config.projectile_db and their game
+# defaults (the dump does not carry them)
+SPLASH_RADIUS = {"splash_r_max": 10.0, "splash_r_min": 1.0, "splash_r_pow": 3.0}
+# Per-unit multipliers: quantity -> config key
+UNIT_MULTS = {"health": "health_mult", "cost": "cost_mult", "build_time": "build_time_mult"}
+
+def is_set(v):
+    """The mod ignores multipliers within 0.001 of 1.0."""
+    return v is not None and abs(v - 1.0) > 0.001
+
+def first_set(cfg, keys):
+    """Value of the first key in keys that is set in cfg (1.0 if none is)."""
+    for k in keys:
+        v = cfg.get(k)
+        if is_set(v):
+            return v
+    return 1.0
+
+def weapon_scopes(u, turret_slots=TURRET_SLOTS):
+    """Weapon slot -> (scope, cycle scope), each 'pri' / 'sec', for one unit record."""
+    scopes = {slot: ("sec", "sec") for slot in turret_slots}
+    scopes.update((t.slot, (t.scope, t.cycle_scope)) for t in u.turrets)
+    scopes.update(atk=("pri", "pri"), atk2=("sec", "sec"), hha=("pri", "pri"))
+    return scopes
+
+def slot_chains(scope):
+    """Quantity -> config keys in precedence order, for one weapon scope."""
+    chains = {q: (f"{scope}_{key}", key) for q, key in SLOT_MULTS.items()}
+    for part, key in DAMAGE_KEYS.items():
+        chains[part] = (f"{scope}_{key}_damage_mult", f"{scope}_damage_mult",
+                        f"{key}_damage_mult", "damage_mult")
+    chains["melee"] = (f"{scope}_damage_mult", "damage_mult")
+    return chains
+
+CHAINS = {scope: slot_chains(scope) for scope in ("pri", "sec")}
+
+# ══════════════════════════════════════════════════════════════
+# MODEL
+# ══════════════════════════════════════════════════════════════
+
+class CombatModel:
+    """Weapon and survivability arrays for a list of unit records.
+
+    Base arrays are (n units,) or (n units, n slots); see evaluate() for the
+    multiplier arrays it combines them with.
+    """
+
+    def __init__(self, units):
+        self.units = units
+        self.names = [u["name"] for u in units]
+        self.index = {name: i for i, name in reversed(list(enumerate(self.names)))}
+        n_vt = max([len(TURRET_SLOTS)] + [len(u.turrets) for u in units])
+        self.turret_slots = tuple(slot_name(k) for k in range(n_vt))
+        self.slots = self.turret_slots + tuple(WEAPON_SLOTS)
+        n, s = len(units), len(self.slots)
+        self.n = n
+
+        def col(field, default=0):
+            return np.array(column(units, field, default), dtype=float)
+
+        # Turret records per unit, aligned with turret_slots (None where absent);
+        # load_turrets() keeps slot k at position k
+        turrets = [list(u.turrets) + [None] * (n_vt - len(u.turrets)) for u in units]
+
+        def grid(key, default=0, dtype=float):
+            out = np.zeros((n, s), dtype=dtype)
+            attr = TURRET_FIELDS[key]
+            for j, slot in enumerate(self.slots):
+                if j < n_vt:
+                    if attr:
+                        out[:, j] = [getattr(row[j], attr) or default if row[j] else default
+                                     for row in turrets]
+                elif WEAPON_SLOTS[slot][key]:
+                    field = WEAPON_SLOTS[slot][key]
+                    out[:, j] = [v or default for v in column(units, field, default)]
+            return out
+
+        self.hp = col("hp")
+        self.cost = col("cost")
+        self.build_time = col("build_time")
+        self.interval = grid("interval")
+        self.magazine = grid("magazine")
+        self.reload = grid("reload")
+        self.shots = np.maximum(1.0, grid("shots"))
+        self.spread = grid("spread")
+        self.speed = grid("speed")
+        self.life = grid("life")
+        self.instant = grid("instant", False, bool)
+        self.melee = grid("melee")
+        self.damage = {p: grid(p) for p in DAMAGE_PARTS}
+        self.proj = [[t.proj if t else "" for t in row]
+                     + [u.get(WEAPON_SLOTS[slot]["proj"], "") or "" for slot in WEAPON_SLOTS]
+                     for row, u in zip(turrets, units)]
+        self.has_proj = np.array([[bool(p) for p in row] for row in self.proj])
+        self.splash_r = {}
+        for q, default in SPLASH_RADIUS.items():
+            self.splash_r[q] = np.array([[(projectile_db.get(p) or {}).get(q, default) if p else 0.0
+                                          for p in row] for row in self.proj], dtype=float)
+            self.splash_r[q][self.damage["splash"] <= 0] = 0.0
+        self.scope = [[weapon_scopes(u, self.turret_slots)[slot] for slot in self.slots]
+                      for u in units]
+        self.tunable_cycle = np.array([slot not in FIXED_CYCLE_SLOTS for slot in self.slots])
+
+        hit = sum(HIT_WEIGHTS[p] * self.damage[p] for p in DAMAGE_PARTS)
+        self.active = (self.interval > 0) & (np.where(self.has_proj, hit, self.melee) > 0)
+
+    # ── Config -> multiplier arrays ──
+
+    def empty_mults(self):
+        """Multiplier arrays for an empty config (all 1.0, no overrides)."""
+        n, s = self.n, len(self.slots)
+        m = {q: np.ones(n) for q in UNIT_MULTS}
+        for q in list(SLOT_MULTS) + list(DAMAGE_PARTS) + ["melee"]:
+            m[q] = np.ones((n, s))
+        for p in DAMAGE_PARTS:
+            m[f"ov_{p}"] = np.full((n, s), np.nan)
+        return m
+
+    def resolve_unit(self, m, i, cfg):
+        """Fill row i of the multiplier arrays m from one units_cfg entry."""
+        for q, key in UNIT_MULTS.items():
+            m[q][i] = cfg.get(key, 1.0) if is_set(cfg.get(key)) else 1.0
+        projs = cfg.get("projectiles") or {}
+        for j in range(len(self.slots)):
+            scope, cycle = self.scope[i][j]
+            for q, keys in CHAINS[scope].items():
+                m[q][i, j] = first_set(cfg, CHAINS[cycle][q] if q in CYCLE_MULTS else keys)
+            ov = projs.get(self.proj[i][j]) if self.proj[i][j] else None
+            for p in DAMAGE_PARTS:
+                v = ov.get(DAMAGE_FIELDS[p]) if ov else None
+                m[f"ov_{p}"][i, j] = np.nan if v is None else v
+
+    def resolve(self, units_cfg):
+        """Multiplier arrays for a config's "units" section."""
+        m = self.empty_mults()
+        for i, name in enumerate(self.names):
+            cfg = units_cfg.get(name)
+            if cfg:
+                self.resolve_unit(m, i, cfg)
+        return m
+
+    # ── Evaluation ──
+
+    def evaluate(self, m):
+        """Modded HP and DPS for multiplier arrays m (see resolve()).
+
+        Arrays in m may have leading batch dimensions, e.g. (configs, n) and
+        (configs, n, slots); every output then has the same leading dims.
+        Returns a dict of arrays:
+          hp, cost, build_time       (..., n)
+          slot_dps, slot_burst       (..., n, slots) sustained / in-magazine DPS
+          dps, burst                 (..., n) summed over slots
+          per_shot, interval         (..., n, slots)
+          eff_range                  (..., n, slots) projectile range (m)
+          range                      (..., n) longest range of an armed slot
+          splash_share               (..., n, slots) share of per_shot that is splash
+          splash_r_max, splash_r_min, splash_r_pow
+                                     (..., n, slots) modded splash radius fields
+                                     (0 for slots without splash)
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            hit = splash = 0.0
+            for p in DAMAGE_PARTS:
+                if HIT_WEIGHTS[p]:
+                    dmg = self.damage[p] * m[p]
+                    ov = m[f"ov_{p}"]
+                    part = HIT_WEIGHTS[p] * np.where(np.isnan(ov), dmg, ov)
+                    hit = hit + part
+                    if p == "splash":
+                        splash = part
+            splash_share = np.where(self.has_proj & (hit > 0), splash / hit, 0.0)
+            per_shot = np.where(self.has_proj, hit, self.melee * m["melee"]) * self.shots
+
+            tunable = self.tunable_cycle
+            fire_rate = np.where(tunable, m["fire_rate"], 1.0)
+            interval = np.where(self.interval > 0,
+                                np.maximum(0.01, self.interval / fire_rate), 0.0)
+            magazine = np.where(self.magazine > 0, np.maximum(
+                1.0, np.rint(self.magazine * np.where(tunable, m["magazine"], 1.0))), 0.0)
+            reload = np.where(self.reload > 0, np.maximum(
+                0.1, self.reload * np.where(tunable, m["reload"], 1.0)), 0.0)
+
+            burst = np.where(self.active, per_shot / interval, 0.0)
+            cycle = np.where(magazine > 0, magazine * interval + reload, interval)
+            per_cycle = np.where(magazine > 0, per_shot * magazine, per_shot)
+            slot_dps = np.where(self.active, per_cycle / cycle, 0.0)
+
+            rng = m["range"]
+            eff_range = np.where(self.instant, self.speed * rng * m["speed"],
+                                 self.speed * m["speed"] * self.life * rng * m["life"])
+
+        hp = np.where(self.hp > 0, np.maximum(1.0, np.rint(self.hp * m["health"])), 0.0)
+        return dict(
+            hp=hp,
+            cost=self.cost * m["cost"],
+            build_time=self.build_time * m["build_time"],
+            slot_dps=slot_dps, slot_burst=burst,
+            dps=slot_dps.sum(axis=-1), burst=burst.sum(axis=-1),
+            per_shot=per_shot, interval=interval, eff_range=eff_range,
+            range=np.where(self.active, eff_range, 0.0).max(axis=-1),
+            splash_share=splash_share,
+            **{q: self.splash_r[q] * m[q] for q in SPLASH_RADIUS},
+        )
+
+def splash_falloff(r, r_min, r_max, power):
+    """Share of the splash damage at distance r from the impact point.
+
+    Full damage inside r_min, falling to 0 at r_max as (1 - t) ** power with
+    t = (r - r_min) / (r_max - r_min). Arrays broadcast.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.clip((r - r_min) / (r_max - r_min), 0.0, 1.0)
+        share = np.where(r <= r_min, 1.0, (1.0 - t) ** power)
+    return np.where(r <= r_max, share, 0.0)
+
+def ttk_matrix(dps, hp):
+    """TTK[..., attacker, defender] = hp[defender] / dps[attacker] (inf if no DPS)."""
+    with np.errstate(divide="ignore"):
+        return np.where(dps[..., :, None] > 0, hp[..., None, :] / dps[..., :, None], np.inf)
+
+# ══════════════════════════════════════════════════════════════
+# REPORT
+# ══════════════════════════════════════════════════════════════
+
+def combat_units(table):
+    """Mobile listed units of every faction, in faction-sheet order."""
+    return [u for structures, units in table["factions"].values() for u in units]
+
+def ttk_report(units, units_cfg):
+    """Vanilla and modded DPS / HP / TTK for units (attackers = armed units)."""
+    model = CombatModel(units)
+    van = model.evaluate(model.empty_mults())
+    mod = model.evaluate(model.resolve(units_cfg))
+    armed = np.flatnonzero((van["dps"] > 0) | (mod["dps"] > 0))
+    return dict(
+        attackers=[units[i] for i in armed],
+        defenders=units,
+        dps_v=van["dps"][armed], dps_m=mod["dps"][armed],
+        hp_v=van["hp"], hp_m=mod["hp"],
+        ttk_v=ttk_matrix(van["dps"][armed], van["hp"]),
+        ttk_m=ttk_matrix(mod["dps"][armed], mod["hp"]),
+    )
+
+def write_ttk_csv(report, path):
+    """Modded TTK matrix as CSV: one row per attacker, one column per defender."""
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["attacker", "faction", "dps_vanilla", "dps_modded"]
+                   + [d["name"] for d in report["defenders"]])
+        w.writerow(["hp_modded", "", "", ""] + [int(h) for h in report["hp_m"]])
+        for i, a in enumerate(report["attackers"]):
+            row = [round(float(t), 2) if np.isfinite(t) else "" for t in report["ttk_m"][i]]
+            w.writerow([a["name"], a.get("faction", ""), round(float(report["dps_v"][i]), 2),
+                        round(float(report["dps_m"][i]), 2)] + row)
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="DPS / time-to-kill matrix for every unit pair.")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    ap.add_argument("--csv", default=None, help="write the modded TTK matrix here")
+    ap.add_argument("--top", type=int, default=10, help="print the N highest modded DPS")
+    args = ap.parse_args(argv)
+
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    t = time.perf_counter()
+    report = ttk_report(combat_units(table), config.get("units", {}))
+    ms = (time.perf_counter() - t) * 1000
+    na, nd = report["ttk_m"].shape
+    print(f"{na} attackers x {nd} defenders in {ms:.1f} ms")
+
+    order = np.argsort(-report["dps_m"])[:args.top]
+    for i in order:
+        a = report["attackers"][i]
+        print(f"  {a['name']:24s} DPS {report['dps_v'][i]:9.1f} -> {report['dps_m'][i]:9.1f}")
+    if args.csv:
+        write_ttk_csv(report, args.csv)
+        print(f"Written {args.csv}")
+
+if __name__ == "__main__":
+    main()
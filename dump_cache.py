@@ -0,0 +1,196 @@
+"""
+Parsed-dump cache for Si_UnitBalance_Dump.json.
+
+Parsing the full dump and rebuilding the name / faction indexes costs more
+than most of the scripts that read it. load_indexed_dump() does that once per
+dump content and keeps the result as a pickle under .cache/, keyed on a hash
+of the dump bytes, so later runs against the same dump skip json.load and
+the indexing pass entirely.
+
+Cached table:
+  units            all unit records, in dump order
+  production_tree  producer -> [unit names]
+  by_name          name -> unit (first seen, Sol preferred on duplicates)
+  factions         "Sol"/"Centauri"/"Alien" -> (structures, units), sorted
+  detail_units     listed units (no spawners, tech tiers or worms), dump order
+
+Unit records are unit_records.UnitRecord, not the parsed dicts: compact,
+with typed core fields (u.name, u.faction, u.cost, ...) and the dump's keys
+readable as before (u["hp"], u.get(...)). Every record also gets u.turrets,
+its VehicleTurret weapon slots as turrets.Turret records (see turrets.py).
+
+The lists and by_name share the same records; pickle keeps that sharing, so
+the cache holds each record once.
+
+A new dump (or CACHE_VERSION) writes a new pickle; prune() deletes the ones
+of other versions and those no run has read for MAX_AGE_DAYS. The other
+.cache/ pickles (proj_, fields_, hit_) are pruned the same way.
+"""
+import hashlib
+import json
+import os
+import pickle
+import time
+
+from turrets import load_turrets
+from unit_records import load_units
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+# Bump when the cached layout or the indexing rules below change
+CACHE_VERSION = 4
+# Cached pickles not read for this long are deleted by prune()
+MAX_AGE_DAYS = 7
+
+# ── Skip list: entries that aren't real game units ──
+SKIP_NAMES = {
+    "Spawn Point", "Unit Spawner", "Anchor", "Zone", "Sports Car",
+    "Troop Transport",
+}
+# Tech tier entries (shown on separate sheet)
+TECH_PREFIXES = ("Alpha ", "Beta ", "Gamma ", "Delta ", "Theta ",
+                 "Lambda ", "Sigma ", "Omega ", "Mark ")
+
+FACTIONS = ("Sol", "Centauri", "Alien")
+
+def is_tech_tier(name):
+    return any(name.startswith(p) for p in TECH_PREFIXES)
+
+def classify_faction(unit):
+    """Return 'Sol', 'Centauri', 'Alien', or None."""
+    f = unit.faction
+    return f if f in FACTIONS else None
+
+def is_listed_unit(u):
+    """True for real playable units (not spawners, tech tiers or worms)."""
+    name = u.name
+    if name in SKIP_NAMES or is_tech_tier(name):
+        return False
+    # Worms are Team_AlienWorms — skip for main sheets
+    return u.team != "Team_AlienWorms"
+
+# ── Sort helpers ──
+# Sort structures by: Headquarters first, then factories, then turrets
+STRUCT_ORDER = {
+    "Headquarters": 0, "Refinery": 1, "Barracks": 2, "Research Facility": 3,
+    "Light Factory": 4, "Heavy Factory": 5, "Air Factory": 6,
+    "Ultra Heavy Factory": 7, "Silo": 8, "Radar Station": 9,
+    "Turret": 10, "Heavy Turret": 11, "Anti-Air Rocket Turret": 12,
+    "Fusion Reactor": 13, "Outpost": 14, "Solar Panel": 15,
+    # Alien
+    "Nest": 0, "Node": 1, "Bio Cache": 2,
+    "Lesser Spawning Cyst": 3, "Greater Spawning Cyst": 4,
+    "Grand Spawning Cyst": 5, "Colossal Spawning Cyst": 6,
+    "Quantum Cortex": 7, "Thorn Spire": 8, "Hive Spire": 9,
+}
+
+# Sort units by production building, then tier, then cost
+FACTORY_ORDER = {
+    "Barracks": 0, "Light Factory": 1, "Heavy Factory": 2,
+    "Ultra Heavy Factory": 3, "Air Factory": 4,
+    # Alien
+    "Lesser Spawning Cyst": 0, "Greater Spawning Cyst": 1,
+    "Grand Spawning Cyst": 2, "Colossal Spawning Cyst": 3,
+}
+
+def struct_sort_key(u):
+    return STRUCT_ORDER.get(u.name, 99)
+
+def unit_sort_key(u):
+    return (FACTORY_ORDER.get(u.built_at, 99), u.min_tier, u.cost)
+
+# ══════════════════════════════════════════════════════════════
+# INDEXING
+# ══════════════════════════════════════════════════════════════
+
+def index_dump(dump):
+    """Build the cached table from a parsed dump dict."""
+    units = load_units(dump["units"])
+    for u in units:
+        u.turrets = load_turrets(u)
+
+    by_name = {}
+    for u in units:
+        name = u.name
+        if name not in by_name:
+            by_name[name] = u
+        elif u.faction == "Sol" and by_name[name].faction != "Sol":
+            by_name[name] = u
+
+    factions = {f: ([], []) for f in FACTIONS}
+    detail_units = []
+    for u in units:
+        if not is_listed_unit(u):
+            continue
+        detail_units.append(u)
+        faction = classify_faction(u)
+        if faction is None:
+            continue
+        structures, mobile = factions[faction]
+        (structures if u.is_structure else mobile).append(u)
+
+    for structures, mobile in factions.values():
+        structures.sort(key=struct_sort_key)
+        mobile.sort(key=unit_sort_key)
+
+    return {
+        "units": units,
+        "production_tree": dump.get("production_tree", {}),
+        "by_name": by_name,
+        "factions": factions,
+        "detail_units": detail_units,
+    }
+
+# ══════════════════════════════════════════════════════════════
+# CACHE
+# ══════════════════════════════════════════════════════════════
+
+def dump_hash(raw):
+    return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+def cache_path(digest):
+    return os.path.join(CACHE_DIR, f"dump_v{CACHE_VERSION}_{digest}.pickle")
+
+def prune(prefix, keep, directory=None, max_age_days=MAX_AGE_DAYS):
+    """Delete <prefix>*.pickle files in directory (default .cache/) whose name
+    does not start with keep (another cache version) or that were not read
+    for max_age_days. Returns the count."""
+    directory = directory or CACHE_DIR
+    if not os.path.isdir(directory):
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for entry in os.scandir(directory):
+        name = entry.name
+        if name.startswith(prefix) and name.endswith(".pickle") \
+                and (not name.startswith(keep) or entry.stat().st_mtime < cutoff):
+            os.remove(entry.path)
+            removed += 1
+    return removed
+
+def load_indexed_dump(path, use_cache=True):
+    """Return the indexed table for the dump at path, using .cache/ if possible."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if not use_cache:
+        return index_dump(json.loads(raw))
+
+    cpath = cache_path(dump_hash(raw))
+    try:
+        with open(cpath, "rb") as f:
+            table = pickle.load(f)
+        os.utime(cpath)  # keep it from being pruned
+        return table
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        # Truncated or stale entry — rebuild it below
+        pass
+
+    table = index_dump(json.loads(raw))
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = cpath + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(table, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cpath)
+    prune("dump_v", f"dump_v{CACHE_VERSION}_")
+    return table
@@ -0,0 +1,287 @@
+"""
+Streaming index of the mod's field-discovery log (dump_fields).
+
+With dump_fields on, DumpFieldDiscovery (FieldDump.cs) writes every public
+field and property of the dumped components to the MelonLoader log, one
+DumpTypeFields block per component:
+
+  [Si_UnitBalance]   --- CRAB DEEP COMPONENT DUMP ---
+  [Si_UnitBalance]   --- Referenced Object: AttackPrimary (type ...) ---
+  [Si_UnitBalance]   [CreatureAttack:AttackPrimary] Type: CreatureAttack
+  [Si_UnitBalance]   [CreatureAttack:AttackPrimary] field Single  Damage = 240
+  [Si_UnitBalance]   [CreatureAttack:AttackPrimary] prop  Boolean IsMelee = True
+
+dump_knowledge.md was written from these by hand. build_index() reads the
+log once, line by line (never the whole file), and records the byte range
+of every block with the unit it belongs to:
+
+  deep dumps          --- NAME DEEP COMPONENT DUMP --- ... --- END NAME DUMP ---
+  first-found dumps   --- Unit / ConstructionData / Structure fields (from 'NAME') ---
+  projectile assets   === ProjectileData: NAME === (the unit is the asset name)
+  ObjectInfo          the first block of a run, unit ""
+
+Each block also keeps the last --- header --- before it (root / child
+component, referenced object, VT projectile) as its label, and the number of
+the discovery run it is in; a log can hold several.
+
+The index is kept under .cache/ per log path and reused while the log's
+size, mtime and first bytes are unchanged, so a query is a seek plus a read
+of one block, however large the log.
+
+Run: E:/Anaconda/python.exe field_dump.py [--log PATH] [--unit NAME]
+         [--component NAME] [--field TEXT] [--run N] [--markdown] [--rebuild]
+  without --unit, lists the units; without --component, a unit's components
+  e.g. field_dump.py --unit Crab --component CreatureAttack:AttackPrimary
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import time
+
+from dump_cache import CACHE_DIR, prune
+
+LOG_PATH = r"E:\Steam\steamapps\common\Silica Dedicated Server\MelonLoader\Latest.log"
+# Bump when the parsing rules below change
+CACHE_VERSION = 1
+# Bytes of the log hashed to tell a rewritten log from the indexed one
+HEAD_BYTES = 64 * 1024
+
+# Component line: [TypeName] Type: / field / prop
+_BLOCK = re.compile(rb"\[([^\]\r\n]+)\] (?:Type: |field |prop  )")
+_FIELD = re.compile(r"\[([^\]]+)\] (field|prop)\s+(\S+)\s+(\S+) = (.*)$")
+_TYPE = re.compile(r"\[[^\]]+\] Type: (.*)$")
+# Log prefix: [HH:MM:SS.mmm] [Si_UnitBalance]
+_PREFIX = re.compile(rb"^(?:\[[\d:.]+\] )?(?:\[[^\]]*\] )?")
+_HEADER = re.compile(rb"--- (.+?) ---\s*$")
+_FROM = re.compile(rb"\w+ fields \(from '(.*)'\)$")
+_DEEP = re.compile(rb"(.+) DEEP COMPONENT DUMP$")
+_ROOTS = re.compile(rb"^\s*(.+) has \d+ root components:")
+_PROJECTILE = re.compile(rb"=== ProjectileData: (.+) ===")
+_RUN_START = b"========== Field Discovery =========="
+_RUN_END = b"========== End Field Discovery =========="
+# --- headers that leave the current unit
+_SECTION_ENDS = (b"Production Trees", b"ProjectileData Asset Dump")
+
+# ══════════════════════════════════════════════════════════════
+# INDEX
+# ══════════════════════════════════════════════════════════════
+
+class Block:
+    """One DumpTypeFields block: bytes [start, end) of the log."""
+    __slots__ = ("run", "unit", "component", "label", "start", "end")
+
+    def __init__(self, run, unit, component, label, start, end):
+        self.run = run
+        self.unit = unit
+        self.component = component
+        self.label = label
+        self.start = start
+        self.end = end
+
+def _text(b):
+    return b.decode("utf-8", "replace").strip()
+
+def scan(f):
+    """Blocks of an open binary log, streamed line by line."""
+    blocks = []
+    run, unit, label = 0, "", ""
+    tag, block = None, None
+    pos = 0
+    for line in f:
+        start, pos = pos, pos + len(line)
+        if tag is not None and tag in line:
+            block.end = pos
+            continue
+        m = _BLOCK.search(line)
+        if m:
+            tag = b"[" + m.group(1) + b"] "
+            block = Block(run, unit, _text(m.group(1)), label, start, pos)
+            blocks.append(block)
+            continue
+        tag = None
+        if b"---" in line:
+            h = _HEADER.search(line)
+            if h is None:
+                continue
+            h = h.group(1)
+            m = _FROM.match(h) or _DEEP.match(h)
+            if m:
+                unit, label = _text(m.group(1)), ""
+            elif h.startswith(b"END ") or h.startswith(_SECTION_ENDS):
+                unit, label = "", ""
+            else:
+                label = _text(h)
+        elif b"===" in line:
+            if _RUN_START in line:
+                run, unit, label = run + 1, "", ""
+            elif _RUN_END in line:
+                unit, label = "", ""
+            else:
+                m = _PROJECTILE.search(line)
+                if m:
+                    unit, label = _text(m.group(1)), ""
+        elif b" root components:" in line:
+            # Deep dumps announce the unit upper-cased; this line has its name
+            m = _ROOTS.match(line[_PREFIX.match(line).end():])
+            if m and _text(m.group(1)).upper() == unit.upper():
+                unit = _text(m.group(1))
+    return blocks
+
+def _stamp(path):
+    st = os.stat(path)
+    with open(path, "rb") as f:
+        head = hashlib.blake2b(f.read(HEAD_BYTES), digest_size=16).hexdigest()
+    return st.st_size, st.st_mtime_ns, head
+
+def cache_path(path):
+    key = hashlib.blake2b(os.path.abspath(path).encode(), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIR, f"fields_v{CACHE_VERSION}_{key}.pickle")
+
+class FieldIndex:
+    """Byte-offset index of one field-discovery log.
+
+    idx = FieldIndex.load(path)
+    idx.units()                                         # unit names
+    idx.find("Crab", "CreatureAttack:AttackPrimary")    # -> [Block]
+    idx.read(block)                                     # -> (type, rows)
+    """
+
+    def __init__(self, path, blocks, stamp):
+        self.path = path
+        self.blocks = blocks
+        self.stamp = stamp
+        self.runs = max((b.run for b in blocks), default=0)
+        self.by_unit = {}
+        for b in blocks:
+            self.by_unit.setdefault(b.unit.lower(), []).append(b)
+
+    @classmethod
+    def build(cls, path):
+        stamp = _stamp(path)
+        with open(path, "rb") as f:
+            return cls(path, scan(f), stamp)
+
+    @classmethod
+    def load(cls, path, use_cache=True):
+        """The index of the log at path, from .cache/ while the log is unchanged."""
+        stamp = _stamp(path)
+        cpath = cache_path(path)
+        if use_cache:
+            try:
+                with open(cpath, "rb") as f:
+                    cached_stamp, blocks = pickle.load(f)
+                if cached_stamp == stamp:
+                    os.utime(cpath)  # keep it from being pruned
+                    return cls(path, blocks, stamp)
+            except FileNotFoundError:
+                pass
+            except (pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+                pass
+
+        idx = cls.build(path)
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = cpath + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump((idx.stamp, idx.blocks), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cpath)
+        prune("fields_v", f"fields_v{CACHE_VERSION}_")
+        return idx
+
+    def units(self, run=None):
+        """Unit names with blocks in run (default: any run), in log order."""
+        seen = {}
+        for b in self.blocks:
+            if b.unit and (run is None or b.run == run):
+                seen.setdefault(b.unit, None)
+        return list(seen)
+
+    def find(self, unit, component=None, run=None):
+        """Blocks of a unit (any case), from run or the last run that has it.
+
+        component matches exactly (any case), else as a prefix:
+        "CreatureAttack" finds both CreatureAttack:AttackPrimary and
+        :AttackSecondary.
+        """
+        blocks = self.by_unit.get(unit.lower(), [])
+        if not blocks:
+            return []
+        run = blocks[-1].run if run is None else run
+        blocks = [b for b in blocks if b.run == run]
+        if component is None:
+            return blocks
+        c = component.lower()
+        exact = [b for b in blocks if b.component.lower() == c]
+        return exact or [b for b in blocks if b.component.lower().startswith(c)]
+
+    def read(self, block):
+        """(type name, [(field/prop, value type, name, value)]) of one block."""
+        with open(self.path, "rb") as f:
+            f.seek(block.start)
+            raw = f.read(block.end - block.start)
+        type_name, rows = "", []
+        for line in raw.decode("utf-8", "replace").splitlines():
+            m = _FIELD.search(line)
+            if m:
+                rows.append(m.group(2, 3, 4, 5))
+                continue
+            m = _TYPE.search(line)
+            if m:
+                type_name = m.group(1).strip()
+        return type_name, rows
+
+# ══════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════
+
+def print_block(idx, b, field=None, markdown=False):
+    type_name, rows = idx.read(b)
+    if field:
+        rows = [r for r in rows if field.lower() in r[2].lower()]
+    if markdown:
+        print(f"### {b.component}" + (f" ({b.label})" if b.label else ""))
+        for kind, vtype, name, value in rows:
+            print(f"- `{name} = {value}`")
+        print()
+        return
+    print(f"{b.unit} [{b.component}] {type_name}" + (f"  ({b.label})" if b.label else ""))
+    for kind, vtype, name, value in rows:
+        print(f"  {kind:5s} {vtype:16s} {name:32s} {value}")
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Query the mod's field-discovery log.")
+    ap.add_argument("--log", default=LOG_PATH)
+    ap.add_argument("--unit", default=None, help="unit, structure or ProjectileData name")
+    ap.add_argument("--component", default=None,
+                    help="component, e.g. CreatureAttack:AttackPrimary (prefix matches)")
+    ap.add_argument("--field", default=None, help="only fields whose name contains this")
+    ap.add_argument("--run", type=int, default=None,
+                    help="discovery run (1 = first in the log; default the last with the unit)")
+    ap.add_argument("--markdown", action="store_true", help="print as dump_knowledge.md bullets")
+    ap.add_argument("--rebuild", action="store_true", help="re-index even if .cache/ has it")
+    args = ap.parse_args(argv)
+
+    t = time.perf_counter()
+    idx = FieldIndex.load(args.log, use_cache=not args.rebuild)
+    if args.unit is None:
+        units = idx.units(args.run)
+        print(f"{len(idx.blocks)} blocks, {len(units)} units, {idx.runs} run(s) "
+              f"({time.perf_counter() - t:.2f}s)")
+        for name in units:
+            print(f"  {name}")
+        return
+
+    blocks = idx.find(args.unit, args.component, args.run)
+    if not blocks:
+        what = f"{args.component!r} for " if args.component else ""
+        ap.error(f"no {what}{args.unit!r} in the log")
+    if args.component is None and args.field is None:
+        for b in blocks:
+            print(f"  {b.component:40s} {b.label}")
+        return
+    for b in blocks:
+        print_block(idx, b, args.field, args.markdown)
+
+if __name__ == "__main__":
+    main()
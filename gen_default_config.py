@@ -1,15 +1,33 @@
+"""
+Generate Si_UnitBalance_Config_Default.json (vanilla values, all mults 1.00)
+from a multi-turret Si_UnitBalance_Dump.json, then audit the keys per unit type.
+Projectile damage / speed / lifetime come from the dump itself
+(projectile_index.py, cached per dump); projectile_db below supplies the splash
+radii and anything the dump does not fire. Differences between the two are
+listed before the audit.
+Run: python gen_default_config.py [--dump PATH] [--output PATH] [--no-cache]
+         [--hand-table]
+  --hand-table  use projectile_db as written, ignoring the dump's projectiles
+
+Library use (nothing is read or written at import time):
+  config = build_default_config(load_dump(path)['by_name']); audit_config(config)
+  db = projectile_index.merged_db(projectile_index.load_projectile_index(path))
+  config = build_default_config(by_name, db)
+"""
+import argparse
 import json
 
-data = json.load(open('C:/Users/schwe/Projects/Si_UnitBalance/dumps/Si_UnitBalance_Dump_2026-03-04_v4_multiturret.json'))
-units_list = data['units']
+import turrets
+from dump_cache import load_indexed_dump
+
+DUMP_PATH = 'C:/Users/schwe/Projects/Si_UnitBalance/dumps/Si_UnitBalance_Dump_2026-03-04_v4_multiturret.json'
+OUTPUT_PATH = 'C:/Users/schwe/Projects/Si_UnitBalanceUI/Si_UnitBalance_Config_Default.json'
+
+
+def load_dump(path=DUMP_PATH, use_cache=True):
+    """Parsed dump + name index (first seen, Sol preferred) — cached in .cache/"""
+    return load_indexed_dump(path, use_cache=use_cache)
 
-by_name = {}
-for u in units_list:
-    name = u['name']
-    if name not in by_name:
-        by_name[name] = u
-    elif u.get('faction') == 'Sol' and by_name[name].get('faction') != 'Sol':
-        by_name[name] = u
 
 # =============================================================================
 # PROJECTILE DATA — from Si_UnitBalance_Dump.json + unit_data_reference.md
@@ -106,9 +124,9 @@ projectile_db = {
     'ProjectileData_DropTank':           {'impact': 3000, 'splash': 3000, 'splash_r_max': 20, 'splash_r_min': 1, 'splash_r_pow': 3, 'speed': 1, 'life': 30},
 }
 
-def pd_get(pd_name, field, default=0):
-    """Get a field from projectile_db, with backward-compat for old tuple format."""
-    entry = projectile_db.get(pd_name, {})
+def pd_get(pd_name, field, default=0, db=None):
+    """Get a field from projectile_db (or db), with backward-compat for old tuple format."""
+    entry = (projectile_db if db is None else db).get(pd_name, {})
     if isinstance(entry, dict):
         return entry.get(field, default)
     # Legacy tuple: (impact, speed, lifetime)
@@ -164,17 +182,6 @@ vehicle_projectiles = {
     # Hover Bike — no VehicleTurret (passengers use infantry weapons)
 }
 
-# Per-unit turret stat source from dump fields.
-# Default: pri from 'vt_', sec from 'vt2_'. Only list exceptions.
-# Multi-turret dump showed weapons on unexpected turret slots for these units.
-turret_stats_prefix = {
-    'Bomber':         {'pri': 'vt3_', 'sec': 'vt_'},    # cannon=vt3_(pri), bombs=vt_(sec)
-    'Freighter':      {'pri': 'vt3_', 'sec': 'vt_'},    # cannon=vt3_(pri), bomb=vt_(sec)
-    'Shuttle':        {'pri': 'vt3_'},                   # cannon=vt3_ (only weapon)
-    'Gunship':        {'pri': 'vt3_'},                   # gun=vt3_
-    'Platoon Hauler': {'pri': 'vt3_'},                   # weapon on 2nd VehicleTurret
-}
-
 # =============================================================================
 # INFANTRY WEAPON DATA — from projectile reference
 # =============================================================================
@@ -248,14 +255,14 @@ vehicle_movement = {
 }
 
 
-def get_proj_stats(pd_name):
-    """Get projectile stats dict from projectile_db, or None."""
-    return projectile_db.get(pd_name)
+def get_proj_stats(pd_name, db=None):
+    """Get projectile stats dict from projectile_db (or db), or None."""
+    return (projectile_db if db is None else db).get(pd_name)
 
 
-def fmt_damage_parts(pd_name):
+def fmt_damage_parts(pd_name, db=None):
     """Format damage sub-type annotation: 'imp:1000 spl:600/r15 pen:5000' (only non-zero)."""
-    stats = projectile_db.get(pd_name, {})
+    stats = (projectile_db if db is None else db).get(pd_name, {})
     if isinstance(stats, tuple):
         return f"dmg:{stats[0]}"  # legacy
     parts = []
@@ -268,12 +275,12 @@ def fmt_damage_parts(pd_name):
     return ' '.join(parts) if parts else 'dmg:0'
 
 
-def fmt_weapon_vehicle(pd_name, vt_fi, vt_spread, vt_mag, vt_reload):
+def fmt_weapon_vehicle(pd_name, vt_fi, vt_spread, vt_mag, vt_reload, db=None):
     """Format weapon annotation with damage sub-types + 6 base values for vehicles."""
     clean = pd_name.replace('ProjectileData_', '') if pd_name else '?'
-    dmg_str = fmt_damage_parts(pd_name) if pd_name else 'dmg:?'
-    spd = int(pd_get(pd_name, 'speed')) if pd_name else '?'
-    life = pd_get(pd_name, 'life') if pd_name else '?'
+    dmg_str = fmt_damage_parts(pd_name, db) if pd_name else 'dmg:?'
+    spd = int(pd_get(pd_name, 'speed', db=db)) if pd_name else '?'
+    life = pd_get(pd_name, 'life', db=db) if pd_name else '?'
     spread_s = vt_spread if vt_spread is not None else '?'
     mag_s = vt_mag if vt_mag is not None else '?'
     fi_s = vt_fi if vt_fi is not None else '?'
@@ -288,19 +295,19 @@ def fmt_weapon_infantry(proj_name, damage, speed, lifetime):
     return f"{proj_name} | imp:{damage} spd:{speed} life:{lifetime}"
 
 
-def fmt_weapon_creature_ranged(pd_name, speed, lifetime, spread):
+def fmt_weapon_creature_ranged(pd_name, speed, lifetime, spread, db=None):
     """Format weapon annotation with damage sub-types for creature ranged attacks."""
     clean = pd_name.replace('ProjectileData_', '') if pd_name else '?'
-    dmg_str = fmt_damage_parts(pd_name) if pd_name else 'dmg:?'
+    dmg_str = fmt_damage_parts(pd_name, db) if pd_name else 'dmg:?'
     return f"{clean} | {dmg_str} spd:{speed} life:{lifetime} spread:{spread}"
 
 
-def emit_damage_keys(e, pd_name, prefix=''):
+def emit_damage_keys(e, pd_name, prefix='', db=None):
     """Emit per-damage-subtype multiplier keys for a projectile, only for non-zero fields.
     Also emits splash radius keys when splash damage exists.
     prefix: '' for structures, 'pri_' or 'sec_' for vehicles/creatures.
     """
-    stats = projectile_db.get(pd_name, {})
+    stats = (projectile_db if db is None else db).get(pd_name, {})
     if isinstance(stats, tuple):
         e[f'{prefix}damage_mult'] = 1.00
         return
@@ -326,7 +333,7 @@ def emit_damage_keys(e, pd_name, prefix=''):
         e[f'{prefix}splash_radius_pow_mult'] = 1.00
 
 
-def build_unit(name, u, ctype):
+def build_unit(name, u, ctype, db=None):
     """Build a unit config entry with only applicable multipliers for its type.
 
     Unit types and their applicable multipliers:
@@ -339,6 +346,9 @@ def build_unit(name, u, ctype):
     - creature_flying_melee: 1 weapon (dmg), move, target+fow
     - structure:          build_radius only, no weapons/movement/vision
     - structure_armed:    build_radius + simplified weapons (dmg/range/accuracy)
+
+    db: projectile table to read damage/speed/life from (default projectile_db;
+    projectile_index.merged_db() gives the dump's values).
     """
     e = {}
 
@@ -382,20 +392,18 @@ def build_unit(name, u, ctype):
         # Vehicles: full 7 params per weapon slot via VehicleTurret
         vp = vehicle_projectiles.get(name, {})
 
-        # Turret field prefixes for reading dump stats (fi, spread, mag, reload)
-        # Default: pri→vt_, sec→vt2_. Override per-unit via turret_stats_prefix.
-        tsp = turret_stats_prefix.get(name, {})
-        pri_pf = tsp.get('pri', 'vt_')
-        sec_pf = tsp.get('sec', 'vt2_')
+        # Turret slots for the dump stats (fi, spread, mag, reload): the mod's
+        # pri / sec weapon, which is not always vt_ / vt2_ (turrets.PRIMARY_TURRET)
+        pri_t = turrets.primary(u) or turrets.EMPTY
+        sec_t = turrets.secondary(u) or turrets.EMPTY
 
         # Primary weapon
-        if u.get(pri_pf + 'fire_interval', u.get('vt_fire_interval', 0)) > 0 or vp.get('pri'):
-            pd_name = vp.get('pri', '')
+        # Projectile names: the dump slot's own, vehicle_projectiles where the slot has none
+        if pri_t.fire_interval > 0 or vp.get('pri'):
+            pd_name = pri_t.proj or vp.get('pri', '')
             e['_pri_weapon'] = fmt_weapon_vehicle(
-                pd_name,
-                u.get(pri_pf + 'fire_interval', 0), u.get(pri_pf + 'spread', 0),
-                u.get(pri_pf + 'magazine', 0), u.get(pri_pf + 'reload', 0))
-            emit_damage_keys(e, pd_name, 'pri_')
+                pd_name, pri_t.fire_interval, pri_t.spread, pri_t.magazine, pri_t.reload, db)
+            emit_damage_keys(e, pd_name, 'pri_', db)
             e['pri_proj_speed_mult'] = 1.00
             e['pri_proj_lifetime_mult'] = 1.00
             e['pri_accuracy_mult'] = 1.00
@@ -405,12 +413,10 @@ def build_unit(name, u, ctype):
 
         # Secondary weapon — require explicit mapping in vehicle_projectiles
         if vp.get('sec'):
-            pd_name = vp.get('sec', '')
+            pd_name = sec_t.proj or vp['sec']
             e['_sec_weapon'] = fmt_weapon_vehicle(
-                pd_name,
-                u.get(sec_pf + 'fire_interval', 0), u.get(sec_pf + 'spread', 0),
-                u.get(sec_pf + 'magazine', 0), u.get(sec_pf + 'reload', 0))
-            emit_damage_keys(e, pd_name, 'sec_')
+                pd_name, sec_t.fire_interval, sec_t.spread, sec_t.magazine, sec_t.reload, db)
+            emit_damage_keys(e, pd_name, 'sec_', db)
             e['sec_proj_speed_mult'] = 1.00
             e['sec_proj_lifetime_mult'] = 1.00
             e['sec_accuracy_mult'] = 1.00
@@ -427,8 +433,8 @@ def build_unit(name, u, ctype):
         atk_spread = ov.get('atk_spread', u.get('atk_spread', 0))
 
         if atk_proj:
-            e['_pri_weapon'] = fmt_weapon_creature_ranged(atk_proj, proj_speed, proj_life, atk_spread)
-            emit_damage_keys(e, atk_proj, 'pri_')
+            e['_pri_weapon'] = fmt_weapon_creature_ranged(atk_proj, proj_speed, proj_life, atk_spread, db)
+            emit_damage_keys(e, atk_proj, 'pri_', db)
             e['pri_proj_speed_mult'] = 1.00
             e['pri_proj_lifetime_mult'] = 1.00
             e['pri_accuracy_mult'] = 1.00
@@ -467,9 +473,9 @@ def build_unit(name, u, ctype):
         td = turret_data.get(name, {})
         if td:
             full_pd_name = f"ProjectileData_{td['proj']}"
-            dmg_str = fmt_damage_parts(full_pd_name)
+            dmg_str = fmt_damage_parts(full_pd_name, db)
             e['_weapon'] = f"{td['proj']} | {dmg_str} spd:{td['speed']} life:{td['life']} range:{td['range']}"
-            emit_damage_keys(e, full_pd_name, '')
+            emit_damage_keys(e, full_pd_name, '', db)
             e['proj_speed_mult'] = 1.00
             e['proj_lifetime_mult'] = 1.00
             e['range_mult'] = 1.00
@@ -574,126 +580,123 @@ def build_unit(name, u, ctype):
 # =============================================================================
 # BUILD CONFIG
 # =============================================================================
-config = {
-    "enabled": True,
-    "dump_fields": False,
-    "shrimp_disable_aim": False,
-    "revert_on_round_end": True,
-    "health_mult_enabled": False,  # Server-only: health changes are NOT synced to clients (health bars/cheat mode show vanilla values)
-    "description": "Vanilla base config. All multipliers at 1.00 = no change. _base/_pri_weapon/_sec_weapon show actual game values. Use !rebalance to hot-reload.",
-}
-
-config["tech_time"] = {
-    "_note": "Build time in seconds per tech tier research (all factions). Vanilla: 30s all tiers.",
-    "tier_1": 30, "tier_2": 30, "tier_3": 30, "tier_4": 30,
-    "tier_5": 30, "tier_6": 30, "tier_7": 30, "tier_8": 30,
-}
-
-uc = {}
-
-uc["_teleport"] = {"cooldown": 120, "duration": 5, "_note": "Teleportation: cooldown 120s, cast time 5s"}
-
-# SOL
-uc["_comment_sol_barracks"] = "========== SOL — Barracks =========="
-for n in ['Scout', 'Rifleman', 'Sniper', 'Heavy', 'Commando']:
-    uc[n] = build_unit(n, by_name[n], 'infantry')
-
-uc["_comment_sol_lf"] = "========== SOL — Light Factory =========="
-for n in ['Light Quad', 'Platoon Hauler', 'Heavy Quad', 'Light Striker', 'Heavy Striker', 'AA Truck']:
-    uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle')
-
-uc["_comment_sol_hf"] = "========== SOL — Heavy Factory =========="
-uc['Hover Tank'] = build_unit('Hover Tank', by_name['Hover Tank'], 'hovered_vehicle')
-for n in ['Barrage Truck', 'Railgun Tank', 'Pulse Truck']:
-    uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle')
-
-uc["_comment_sol_uhf"] = "========== SOL — Ultra Heavy Factory =========="
-uc['Sol Harvester'] = build_unit('Sol Harvester', by_name['Sol Harvester'], 'hovered_vehicle')
-uc['Siege Tank'] = build_unit('Siege Tank', by_name['Siege Tank'], 'wheeled_vehicle')
-
-uc["_comment_sol_air"] = "========== SOL — Air Factory =========="
-for n in ['Gunship', 'Dropship', 'Fighter', 'Bomber']:
-    uc[n] = build_unit(n, by_name[n], 'air_vehicle')
-
-uc["_comment_struct"] = "========== SOL/CENTAURI — Structures =========="
-uc['Headquarters'] = build_unit('Headquarters', by_name.get('Headquarters', by_name.get('Sol Headquarters')), 'structure')
-for n in ['Refinery', 'Research Facility', 'Barracks', 'Light Factory', 'Air Factory', 'Heavy Factory', 'Ultra Heavy Factory', 'Silo', 'Radar Station']:
-    uc[n] = build_unit(n, by_name[n], 'structure')
-for n in ['Turret', 'Heavy Turret', 'Anti-Air Rocket Turret']:
-    uc[n] = build_unit(n, by_name[n], 'structure_armed')
-
-# CENTAURI
-uc["_comment_cen_barracks"] = "========== CENTAURI — Barracks =========="
-for n in ['Militia', 'Trooper', 'Marksman', 'Juggernaut', 'Templar']:
-    uc[n] = build_unit(n, by_name[n], 'infantry')
-
-uc["_comment_cen_lf"] = "========== CENTAURI — Light Factory =========="
-for n in ['Light Raider', 'Squad Transport', 'Heavy Raider', 'Assault Car', 'Strike Tank', 'Flak Car']:
-    uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle')
-
-uc["_comment_cen_hf"] = "========== CENTAURI — Heavy Factory =========="
-for n in ['Combat Tank', 'Rocket Tank', 'Heavy Tank', 'Pyro Tank']:
-    uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle')
-
-uc["_comment_cen_uhf"] = "========== CENTAURI — Ultra Heavy Factory =========="
-uc['Cent Harvester'] = build_unit('Cent Harvester', by_name['Cent Harvester'], 'wheeled_vehicle')
-uc['Crimson Tank'] = build_unit('Crimson Tank', by_name['Crimson Tank'], 'wheeled_vehicle')
-
-uc["_comment_cen_air"] = "========== CENTAURI — Air Factory =========="
-for n in ['Shuttle', 'Dreadnought', 'Interceptor', 'Freighter']:
-    uc[n] = build_unit(n, by_name[n], 'air_vehicle')
-
-# HOVERBIKE
-uc["_comment_htp"] = "========== HTP — Hover Bike =========="
-uc['Hover Bike'] = build_unit('Hover Bike', by_name['Hover Bike'], 'hovered_vehicle')
-
-# ALIEN
-uc["_comment_alien_lesser"] = "========== ALIEN — Lesser Spawning Cyst =========="
-uc['Crab'] = build_unit('Crab', by_name['Crab'], 'creature_melee')
-uc['Shrimp'] = build_unit('Shrimp', by_name['Shrimp'], 'creature_ranged')
-uc['Shocker'] = build_unit('Shocker', by_name['Shocker'], 'creature_ranged')
-uc['Wasp'] = build_unit('Wasp', by_name['Wasp'], 'creature_flying_melee')
-uc['Dragonfly'] = build_unit('Dragonfly', by_name['Dragonfly'], 'creature_ranged')
-uc['Squid'] = build_unit('Squid', by_name['Squid'], 'creature_flying_melee')
-
-uc["_comment_alien_greater"] = "========== ALIEN — Greater Spawning Cyst =========="
-uc['Horned Crab'] = build_unit('Horned Crab', by_name['Horned Crab'], 'creature_melee')
-uc['Hunter'] = build_unit('Hunter', by_name['Hunter'], 'creature_melee')
-uc['Behemoth'] = build_unit('Behemoth', by_name['Behemoth'], 'creature_ranged')
-uc['Scorpion'] = build_unit('Scorpion', by_name['Scorpion'], 'creature_ranged')
-uc['Firebug'] = build_unit('Firebug', by_name['Firebug'], 'creature_ranged')
-
-uc["_comment_alien_grand"] = "========== ALIEN — Grand Spawning Cyst =========="
-uc['Goliath'] = build_unit('Goliath', by_name['Goliath'], 'creature_melee')
-
-uc["_comment_alien_colossal"] = "========== ALIEN — Colossal Spawning Cyst =========="
-uc['Defiler'] = build_unit('Defiler', by_name['Defiler'], 'creature_ranged')
-uc['Colossus'] = build_unit('Colossus', by_name['Colossus'], 'creature_ranged')
-
-uc["_comment_alien_nest"] = "========== ALIEN — Nest =========="
-uc['Queen'] = build_unit('Queen', by_name['Queen'], 'creature_ranged')
-
-uc["_comment_alien_struct"] = "========== ALIEN — Structures =========="
-for n in ['Nest', 'Node', 'Bio Cache', 'Lesser Spawning Cyst', 'Greater Spawning Cyst',
-          'Grand Spawning Cyst', 'Colossal Spawning Cyst', 'Quantum Cortex']:
-    uc[n] = build_unit(n, by_name[n], 'structure')
-for n in ['Hive Spire', 'Thorn Spire']:
-    uc[n] = build_unit(n, by_name[n], 'structure_armed')
-
-config["units"] = uc
+def build_default_config(by_name, db=None):
+    """Build the vanilla default config dict from a dump name index.
 
-out = 'C:/Users/schwe/Projects/Si_UnitBalanceUI/Si_UnitBalance_Config_Default.json'
-with open(out, 'w') as f:
-    json.dump(config, f, indent=4)
-
-real = {k: v for k, v in uc.items() if not k.startswith('_')}
-print(f"Written {out}")
-print(f"Total units/buildings: {len(real)}")
-total_p = sum(len([k for k in v.keys() if not k.startswith('_')]) for v in real.values())
-print(f"Total parameter fields: {total_p}")
+    db: projectile table (default projectile_db), see build_unit().
+    """
+    config = {
+        "enabled": True,
+        "dump_fields": False,
+        "shrimp_disable_aim": False,
+        "revert_on_round_end": True,
+        "health_mult_enabled": False,  # Server-only: health changes are NOT synced to clients (health bars/cheat mode show vanilla values)
+        "description": "Vanilla base config. All multipliers at 1.00 = no change. _base/_pri_weapon/_sec_weapon show actual game values. Use !rebalance to hot-reload.",
+    }
+
+    config["tech_time"] = {
+        "_note": "Build time in seconds per tech tier research (all factions). Vanilla: 30s all tiers.",
+        "tier_1": 30, "tier_2": 30, "tier_3": 30, "tier_4": 30,
+        "tier_5": 30, "tier_6": 30, "tier_7": 30, "tier_8": 30,
+    }
+
+    uc = {}
+
+    uc["_teleport"] = {"cooldown": 120, "duration": 5, "_note": "Teleportation: cooldown 120s, cast time 5s"}
+
+    # SOL
+    uc["_comment_sol_barracks"] = "========== SOL — Barracks =========="
+    for n in ['Scout', 'Rifleman', 'Sniper', 'Heavy', 'Commando']:
+        uc[n] = build_unit(n, by_name[n], 'infantry', db=db)
+
+    uc["_comment_sol_lf"] = "========== SOL — Light Factory =========="
+    for n in ['Light Quad', 'Platoon Hauler', 'Heavy Quad', 'Light Striker', 'Heavy Striker', 'AA Truck']:
+        uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle', db=db)
+
+    uc["_comment_sol_hf"] = "========== SOL — Heavy Factory =========="
+    uc['Hover Tank'] = build_unit('Hover Tank', by_name['Hover Tank'], 'hovered_vehicle', db=db)
+    for n in ['Barrage Truck', 'Railgun Tank', 'Pulse Truck']:
+        uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle', db=db)
+
+    uc["_comment_sol_uhf"] = "========== SOL — Ultra Heavy Factory =========="
+    uc['Sol Harvester'] = build_unit('Sol Harvester', by_name['Sol Harvester'], 'hovered_vehicle', db=db)
+    uc['Siege Tank'] = build_unit('Siege Tank', by_name['Siege Tank'], 'wheeled_vehicle', db=db)
+
+    uc["_comment_sol_air"] = "========== SOL — Air Factory =========="
+    for n in ['Gunship', 'Dropship', 'Fighter', 'Bomber']:
+        uc[n] = build_unit(n, by_name[n], 'air_vehicle', db=db)
+
+    uc["_comment_struct"] = "========== SOL/CENTAURI — Structures =========="
+    uc['Headquarters'] = build_unit('Headquarters', by_name.get('Headquarters', by_name.get('Sol Headquarters')), 'structure', db=db)
+    for n in ['Refinery', 'Research Facility', 'Barracks', 'Light Factory', 'Air Factory', 'Heavy Factory', 'Ultra Heavy Factory', 'Silo', 'Radar Station']:
+        uc[n] = build_unit(n, by_name[n], 'structure', db=db)
+    for n in ['Turret', 'Heavy Turret', 'Anti-Air Rocket Turret']:
+        uc[n] = build_unit(n, by_name[n], 'structure_armed', db=db)
+
+    # CENTAURI
+    uc["_comment_cen_barracks"] = "========== CENTAURI — Barracks =========="
+    for n in ['Militia', 'Trooper', 'Marksman', 'Juggernaut', 'Templar']:
+        uc[n] = build_unit(n, by_name[n], 'infantry', db=db)
+
+    uc["_comment_cen_lf"] = "========== CENTAURI — Light Factory =========="
+    for n in ['Light Raider', 'Squad Transport', 'Heavy Raider', 'Assault Car', 'Strike Tank', 'Flak Car']:
+        uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle', db=db)
+
+    uc["_comment_cen_hf"] = "========== CENTAURI — Heavy Factory =========="
+    for n in ['Combat Tank', 'Rocket Tank', 'Heavy Tank', 'Pyro Tank']:
+        uc[n] = build_unit(n, by_name[n], 'wheeled_vehicle', db=db)
+
+    uc["_comment_cen_uhf"] = "========== CENTAURI — Ultra Heavy Factory =========="
+    uc['Cent Harvester'] = build_unit('Cent Harvester', by_name['Cent Harvester'], 'wheeled_vehicle', db=db)
+    uc['Crimson Tank'] = build_unit('Crimson Tank', by_name['Crimson Tank'], 'wheeled_vehicle', db=db)
+
+    uc["_comment_cen_air"] = "========== CENTAURI — Air Factory =========="
+    for n in ['Shuttle', 'Dreadnought', 'Interceptor', 'Freighter']:
+        uc[n] = build_unit(n, by_name[n], 'air_vehicle', db=db)
+
+    # HOVERBIKE
+    uc["_comment_htp"] = "========== HTP — Hover Bike =========="
+    uc['Hover Bike'] = build_unit('Hover Bike', by_name['Hover Bike'], 'hovered_vehicle', db=db)
+
+    # ALIEN
+    uc["_comment_alien_lesser"] = "========== ALIEN — Lesser Spawning Cyst =========="
+    uc['Crab'] = build_unit('Crab', by_name['Crab'], 'creature_melee', db=db)
+    uc['Shrimp'] = build_unit('Shrimp', by_name['Shrimp'], 'creature_ranged', db=db)
+    uc['Shocker'] = build_unit('Shocker', by_name['Shocker'], 'creature_ranged', db=db)
+    uc['Wasp'] = build_unit('Wasp', by_name['Wasp'], 'creature_flying_melee', db=db)
+    uc['Dragonfly'] = build_unit('Dragonfly', by_name['Dragonfly'], 'creature_ranged', db=db)
+    uc['Squid'] = build_unit('Squid', by_name['Squid'], 'creature_flying_melee', db=db)
+
+    uc["_comment_alien_greater"] = "========== ALIEN — Greater Spawning Cyst =========="
+    uc['Horned Crab'] = build_unit('Horned Crab', by_name['Horned Crab'], 'creature_melee', db=db)
+    uc['Hunter'] = build_unit('Hunter', by_name['Hunter'], 'creature_melee', db=db)
+    uc['Behemoth'] = build_unit('Behemoth', by_name['Behemoth'], 'creature_ranged', db=db)
+    uc['Scorpion'] = build_unit('Scorpion', by_name['Scorpion'], 'creature_ranged', db=db)
+    uc['Firebug'] = build_unit('Firebug', by_name['Firebug'], 'creature_ranged', db=db)
+
+    uc["_comment_alien_grand"] = "========== ALIEN — Grand Spawning Cyst =========="
+    uc['Goliath'] = build_unit('Goliath', by_name['Goliath'], 'creature_melee', db=db)
+
+    uc["_comment_alien_colossal"] = "========== ALIEN — Colossal Spawning Cyst =========="
+    uc['Defiler'] = build_unit('Defiler', by_name['Defiler'], 'creature_ranged', db=db)
+    uc['Colossus'] = build_unit('Colossus', by_name['Colossus'], 'creature_ranged', db=db)
+
+    uc["_comment_alien_nest"] = "========== ALIEN — Nest =========="
+    uc['Queen'] = build_unit('Queen', by_name['Queen'], 'creature_ranged', db=db)
+
+    uc["_comment_alien_struct"] = "========== ALIEN — Structures =========="
+    for n in ['Nest', 'Node', 'Bio Cache', 'Lesser Spawning Cyst', 'Greater Spawning Cyst',
+              'Grand Spawning Cyst', 'Colossal Spawning Cyst', 'Quantum Cortex']:
+        uc[n] = build_unit(n, by_name[n], 'structure', db=db)
+    for n in ['Hive Spire', 'Thorn Spire']:
+        uc[n] = build_unit(n, by_name[n], 'structure_armed', db=db)
+
+    config["units"] = uc
+    return config
 
-# Audit: verify multiplier-to-base-value consistency per unit type
-print("\n=== AUDIT ===")
+# =============================================================================
+# AUDIT — verify multiplier-to-base-value consistency per unit type
+# =============================================================================
 
 # Define expected keys per unit type
 # Damage sub-type keys that count as "has damage multiplier"
@@ -795,33 +798,72 @@ for n in ['Headquarters', 'Refinery', 'Research Facility', 'Barracks', 'Light Fa
 for n in ['Turret', 'Heavy Turret', 'Anti-Air Rocket Turret', 'Hive Spire', 'Thorn Spire']:
     unit_types[n] = 'structure_armed'
 
-issues_found = False
-for uname, entry in real.items():
-    ut = unit_types.get(uname)
-    if not ut:
-        print(f"  WARNING: {uname} has no type mapping!")
-        issues_found = True
-        continue
-
-    issues = []
-
-    # Check expected keys present
-    exp = expected_keys.get(ut, {})
-    for group_keys in exp.values():
-        for k in group_keys:
-            if k not in entry:
-                issues.append(f"missing {k}")
-
-    # Check forbidden keys absent
-    forb = forbidden_keys.get(ut, [])
-    for k in forb:
-        if k in entry:
-            issues.append(f"should not have {k}")
-
-    if issues:
-        print(f"  {uname} ({ut}): {', '.join(issues)}")
-        issues_found = True
-
-if not issues_found:
-    print("  All units pass audit.")
-print("Audit complete.")
+def audit_config(config):
+    """Print key-consistency issues per unit type; return True if any found."""
+    print("\n=== AUDIT ===")
+    real = {k: v for k, v in config["units"].items() if not k.startswith('_')}
+    issues_found = False
+    for uname, entry in real.items():
+        ut = unit_types.get(uname)
+        if not ut:
+            print(f"  WARNING: {uname} has no type mapping!")
+            issues_found = True
+            continue
+
+        issues = []
+
+        # Check expected keys present
+        exp = expected_keys.get(ut, {})
+        for group_keys in exp.values():
+            for k in group_keys:
+                if k not in entry:
+                    issues.append(f"missing {k}")
+
+        # Check forbidden keys absent
+        forb = forbidden_keys.get(ut, [])
+        for k in forb:
+            if k in entry:
+                issues.append(f"should not have {k}")
+
+        if issues:
+            print(f"  {uname} ({ut}): {', '.join(issues)}")
+            issues_found = True
+
+    if not issues_found:
+        print("  All units pass audit.")
+    print("Audit complete.")
+    return issues_found
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Generate Si_UnitBalance_Config_Default.json from a dump.")
+    ap.add_argument("--dump", default=DUMP_PATH)
+    ap.add_argument("--output", default=OUTPUT_PATH)
+    ap.add_argument("--no-cache", action="store_true", help="parse the dump even if .cache/ has it")
+    ap.add_argument("--hand-table", action="store_true",
+                    help="take projectile values from projectile_db, not the dump")
+    args = ap.parse_args(argv)
+
+    table = load_dump(args.dump, use_cache=not args.no_cache)
+    db = None
+    if not args.hand_table:
+        import projectile_index
+        index = projectile_index.load_projectile_index(args.dump, use_cache=not args.no_cache)
+        db = projectile_index.merged_db(index)
+        print(f"\n=== PROJECTILES ({len(index)} from dump) ===")
+        projectile_index.print_report(projectile_index.reconcile(index, table['by_name']))
+    config = build_default_config(table['by_name'], db)
+    with open(args.output, 'w') as f:
+        json.dump(config, f, indent=4)
+
+    real = {k: v for k, v in config["units"].items() if not k.startswith('_')}
+    print(f"Written {args.output}")
+    print(f"Total units/buildings: {len(real)}")
+    total_p = sum(len([k for k in v.keys() if not k.startswith('_')]) for v in real.values())
+    print(f"Total parameter fields: {total_p}")
+
+    audit_config(config)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,22 @@
 Generate Silica tech tree block diagrams as PDF - one per faction.
 Shows original game values with proposed balance changes highlighted in amber.
 """
-import matplotlib
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
+import argparse
 import os
+import sys
+
+# matplotlib is imported on first render (_load_backend), so importing this
+# module for its faction data (ALIEN / SOL / CENTAURI, TECH_TIMES) stays cheap.
+plt = mpatches = None
+
+
+def _load_backend():
+    global plt, mpatches
+    if plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        import matplotlib.patches as mpatches
 
 OUTPUT_DIR = r"C:\Users\schwe\Projects\Si_UnitBalance"
 
@@ -421,6 +432,7 @@ def draw_arrow(ax, x1, y1, x2, y2, color):
 # Alien tech tree
 # ========================================
 def generate_alien_pdf(changes):
+    _load_backend()
     colors = COLORS["Alien"]
     chg_color = colors["change"]
     fig, ax = plt.subplots(1, 1, figsize=(26, 20))
@@ -613,6 +625,7 @@ def generate_alien_pdf(changes):
 # Human faction tech tree (Sol / Centauri)
 # ========================================
 def generate_human_pdf(faction_data, faction_name, changes):
+    _load_backend()
     colors = COLORS[faction_name]
     chg_color = colors["change"]
     fig, ax = plt.subplots(1, 1, figsize=(30, 20))
@@ -764,33 +777,71 @@ def generate_human_pdf(faction_data, faction_name, changes):
     return fig
 
 
-def main():
-    # Generate Alien PDF
-    print("Generating Alien tech tree...")
-    fig = generate_alien_pdf(ALIEN_CHANGES)
-    fig.savefig(os.path.join(OUTPUT_DIR, "alien_tech_tree.pdf"), format='pdf',
-                bbox_inches='tight', facecolor=fig.get_facecolor())
-    plt.close(fig)
-    print(f"  -> {os.path.join(OUTPUT_DIR, 'alien_tech_tree.pdf')}")
+# ========================================
+# Rendering — one independent figure per faction
+# ========================================
+FACTION_PDFS = {
+    "Alien": "alien_tech_tree.pdf",
+    "Sol": "sol_tech_tree.pdf",
+    "Centauri": "centauri_tech_tree.pdf",
+}
 
-    # Generate Sol PDF
-    print("Generating Sol tech tree...")
-    fig = generate_human_pdf(SOL, "Sol", SOL_CHANGES)
-    fig.savefig(os.path.join(OUTPUT_DIR, "sol_tech_tree.pdf"), format='pdf',
-                bbox_inches='tight', facecolor=fig.get_facecolor())
-    plt.close(fig)
-    print(f"  -> {os.path.join(OUTPUT_DIR, 'sol_tech_tree.pdf')}")
 
-    # Generate Centauri PDF
-    print("Generating Centauri tech tree...")
-    fig = generate_human_pdf(CENTAURI, "Centauri", CENTAURI_CHANGES)
-    fig.savefig(os.path.join(OUTPUT_DIR, "centauri_tech_tree.pdf"), format='pdf',
-                bbox_inches='tight', facecolor=fig.get_facecolor())
+def render_faction(faction, output_dir=OUTPUT_DIR):
+    """Render one faction's tech tree to <output_dir>/<faction>_tech_tree.pdf; return the path."""
+    if faction == "Alien":
+        fig = generate_alien_pdf(ALIEN_CHANGES)
+    elif faction == "Sol":
+        fig = generate_human_pdf(SOL, "Sol", SOL_CHANGES)
+    else:
+        fig = generate_human_pdf(CENTAURI, "Centauri", CENTAURI_CHANGES)
+    path = os.path.join(output_dir, FACTION_PDFS[faction])
+    fig.savefig(path, format='pdf', bbox_inches='tight', facecolor=fig.get_facecolor())
     plt.close(fig)
-    print(f"  -> {os.path.join(OUTPUT_DIR, 'centauri_tech_tree.pdf')}")
+    return path
+
+
+def main(output_dir=OUTPUT_DIR, serial=False):
+    """Render all faction PDFs, one worker process per faction unless serial.
+
+    Returns the list of factions that failed; the others are still written.
+    """
+    factions = list(FACTION_PDFS)
+    workers = min(len(factions), os.cpu_count() or 1)
+    failed = []
+
+    def report(faction, path=None, err=None):
+        if err is None:
+            print(f"  {faction}: -> {path}")
+        else:
+            print(f"  {faction}: FAILED ({type(err).__name__}: {err})")
+            failed.append(faction)
+
+    if serial or workers <= 1:
+        for faction in factions:
+            print(f"Generating {faction} tech tree...")
+            try:
+                report(faction, render_faction(faction, output_dir))
+            except Exception as err:
+                report(faction, err=err)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        print(f"Generating {', '.join(factions)} tech trees ({workers} workers)...")
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {f: pool.submit(render_faction, f, output_dir) for f in factions}
+            for faction, fut in futures.items():
+                try:
+                    report(faction, fut.result())
+                except Exception as err:
+                    report(faction, err=err)
 
-    print("Done!")
+    print("Done!" if not failed else f"Done with {len(failed)} failure(s).")
+    return failed
 
 
 if __name__ == "__main__":
-    main()
+    ap = argparse.ArgumentParser(description="Render the faction tech-tree PDFs.")
+    ap.add_argument("--output-dir", default=OUTPUT_DIR)
+    ap.add_argument("--serial", action="store_true", help="render in this process, one at a time")
+    args = ap.parse_args()
+    sys.exit(1 if main(args.output_dir, serial=args.serial) else 0)
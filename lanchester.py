@@ -0,0 +1,279 @@
+"""
+Lanchester group combat: N-vs-M fights between unit groups of two factions.
+
+Per-unit TTK (combat_engine.py) treats a Crab swarm like one Crab. Here a
+group of n_a units of type a fights n_b units of type b, both in range from
+the start. Each group focuses fire, so its damage goes into one enemy at a
+time and its firepower is the number of units still alive:
+
+  dH_b/dt = -alive_a * rate_a(alive_b)      alive = ceil(H / hp)
+
+with H a group's remaining HP pool (modded HP x units). rate_a(k) is one a's
+damage per second on a group of k: its sustained DPS, plus the splash part
+of every splash slot again on each neighbour inside the splash disc:
+
+  rate_a(k) = dps_a + sum over slots of splash_dps * min(k - 1, reach)
+
+reach is the sum of the splash shares the neighbours of the unit that is
+hit take, on a square grid SPACING metres apart (splash.py, with the modded
+splash radii). Aimed fire thus follows Lanchester's square law and splash
+into a big group tends to the linear law.
+
+Between two kills every rate is constant, so the fights are integrated
+exactly from kill to kill (at most n_a + n_b steps). All of them run as one
+batch: configs x faction pairs x unit pairs x SIZES x SIZES lanes, one
+NumPy step per kill event. Range, speed and armour are not modelled.
+
+Per config and size pair the result holds, for every (a, b):
+  outcome      +1 a's group wins, -1 b's wins, 0 draw (neither can hurt
+               the other, or both die in the same instant)
+  cost traded  cost of b's units killed / cost of a's units killed
+               (inf when a loses nothing)
+
+Run: E:/Anaconda/python.exe lanchester.py [--size N] [--vs M] [--factions A,B]
+         [--show] [--top N] [--csv PATH] [--dump PATH] [--config PATH]
+  without --size, prints the share of matchups each faction wins at every
+  size in SIZES; --show prints the win/loss matrix of each faction pair
+"""
+import argparse
+import csv
+import itertools
+import time
+
+import numpy as np
+
+from combat_engine import CombatModel, combat_units
+from dump_cache import FACTIONS, load_indexed_dump
+from splash import falloff_profile, formation_shares, radius_grid
+
+SIZES = (1, 5, 10, 20)
+# Metres between neighbours in a group, for the units a splash reaches
+SPACING = 10.0
+
+# ══════════════════════════════════════════════════════════════
+# SPLASH
+# ══════════════════════════════════════════════════════════════
+
+def splash_reach(out, spacing=SPACING):
+    """(..., n, slots) full-splash equivalents a hit deals to its neighbours.
+
+    Neighbours sit on a square grid spacing metres apart (splash.py), so
+    this is the most a splash can add, whatever the group size.
+    """
+    radii = radius_grid(out["splash_r_max"].max(initial=0.0))
+    profile = falloff_profile(out["splash_r_min"], out["splash_r_max"], out["splash_r_pow"], radii)
+    reach = formation_shares(profile, radii, [spacing])[1][..., 0]
+    return np.where(out["splash_share"] > 0, reach, 0.0)
+
+# ══════════════════════════════════════════════════════════════
+# BATCH
+# ══════════════════════════════════════════════════════════════
+
+def faction_groups(units, armed):
+    """Faction -> indices into units of its armed mobile units."""
+    groups = {f: [] for f in FACTIONS}
+    for i, u in enumerate(units):
+        if armed[i] and u.get("faction") in groups:
+            groups[u["faction"]].append(i)
+    return groups
+
+def lanes(groups, pairs, sizes):
+    """Flat lane arrays (pair, a, b, n_a, n_b) covering pairs x unit pairs x sizes^2."""
+    cols = [[] for _ in range(5)]
+    for p, (fa, fb) in enumerate(pairs):
+        ia, ib, na, nb = np.meshgrid(groups[fa], groups[fb], sizes, sizes, indexing="ij")
+        for col, a in zip(cols, (np.full(ia.size, p), ia, ib, na, nb)):
+            col.append(a.ravel())
+    return [np.concatenate(c).astype(int) if c else np.zeros(0, dtype=int) for c in cols]
+
+def fight(hp_a, hp_b, dps_a, dps_b, splash_a, splash_b, reach_a, reach_b, n_a, n_b):
+    """Integrate every lane to its end; arrays broadcast to one lane shape.
+
+    splash_* / reach_* are (..., slots): each slot's splash DPS and the
+    neighbours it reaches. Returns (alive_a, alive_b, seconds) at the end.
+    """
+    pool_a = hp_a * n_a
+    pool_b = hp_b * n_b
+    t = np.zeros(np.broadcast(pool_a, pool_b).shape)
+    pool_a, pool_b = pool_a + t, pool_b + t
+
+    def alive(pool, hp):
+        return np.where(hp > 0, np.ceil(pool / np.where(hp > 0, hp, 1.0) - 1e-9), 0.0)
+
+    def rate(dps, splash, reach, k):
+        extra = (splash * np.minimum(np.maximum(k - 1, 0)[..., None], reach)).sum(axis=-1)
+        return dps + extra
+
+    for _ in range(int(np.max(n_a, initial=0) + np.max(n_b, initial=0)) + 1):
+        k_a, k_b = alive(pool_a, hp_a), alive(pool_b, hp_b)
+        into_b = k_a * rate(dps_a, splash_a, reach_a, k_b)
+        into_a = k_b * rate(dps_b, splash_b, reach_b, k_a)
+        live = (k_a > 0) & (k_b > 0) & ((into_a > 0) | (into_b > 0))
+        if not live.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Time until each side's focused unit dies
+            next_a = np.where(into_a > 0, (pool_a - (k_a - 1) * hp_a) / into_a, np.inf)
+            next_b = np.where(into_b > 0, (pool_b - (k_b - 1) * hp_b) / into_b, np.inf)
+        dt = np.where(live, np.minimum(next_a, next_b), 0.0)
+        t += dt
+        pool_a = np.where(live, np.where(next_a <= dt, (k_a - 1) * hp_a, pool_a - into_a * dt),
+                          pool_a)
+        pool_b = np.where(live, np.where(next_b <= dt, (k_b - 1) * hp_b, pool_b - into_b * dt),
+                          pool_b)
+    return alive(pool_a, hp_a), alive(pool_b, hp_b), t
+
+def simulate(units, configs, sizes=SIZES, pairs=None, spacing=SPACING):
+    """All group fights of units for each units_cfg in configs, in one batch.
+
+    Returns dict(units, pairs, groups, sizes, lane arrays pair / a / b / n_a /
+    n_b, and (configs, lanes) arrays outcome, cost_traded, alive_a, alive_b,
+    seconds).
+    """
+    model = CombatModel(units)
+    ms = [model.resolve(cfg) for cfg in configs]
+    m = {q: np.stack([x[q] for x in ms]) for q in ms[0]}
+    out = model.evaluate(m)
+    hp, dps, cost = out["hp"], out["dps"], out["cost"]
+    splash = out["slot_dps"] * out["splash_share"]
+    reach = splash_reach(out, spacing)
+
+    armed = ((dps > 0).any(axis=0)) & (hp > 0).all(axis=0)
+    groups = faction_groups(units, armed)
+    pairs = pairs or list(itertools.combinations(FACTIONS, 2))
+    pair, a, b, n_a, n_b = lanes(groups, pairs, sizes)
+
+    alive_a, alive_b, seconds = fight(
+        hp[:, a], hp[:, b], dps[:, a], dps[:, b], splash[:, a], splash[:, b],
+        reach[:, a], reach[:, b], n_a, n_b)
+    outcome = np.where(alive_b == 0, np.where(alive_a > 0, 1, 0),
+                       np.where(alive_a == 0, -1, 0))
+    lost_a = (n_a - alive_a) * cost[:, a]
+    lost_b = (n_b - alive_b) * cost[:, b]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        traded = np.where(lost_a > 0, lost_b / lost_a, np.where(lost_b > 0, np.inf, np.nan))
+    return dict(units=units, pairs=pairs, groups=groups, sizes=tuple(sizes),
+                pair=pair, a=a, b=b, n_a=n_a, n_b=n_b, outcome=outcome,
+                cost_traded=traded, alive_a=alive_a, alive_b=alive_b, seconds=seconds)
+
+def matrix(result, key, config, pair, size_a, size_b):
+    """(a names, b names, (a, b) array of result[key]) for one pair and size pair."""
+    fa, fb = result["pairs"][pair]
+    ga, gb = result["groups"][fa], result["groups"][fb]
+    sel = (result["pair"] == pair) & (result["n_a"] == size_a) & (result["n_b"] == size_b)
+    # Lanes of a pair are laid out a-major, then b
+    values = result[key][config][sel].reshape(len(ga), len(gb))
+    names = [u["name"] for u in result["units"]]
+    return [names[i] for i in ga], [names[i] for i in gb], values
+
+# ══════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════
+
+def _traded(x):
+    return f"{x:8.2f}" if np.isfinite(x) else f"{'inf' if x > 0 else '-':>8s}"
+
+def write_csv(result, labels, path):
+    """One row per config and lane."""
+    names = [u["name"] for u in result["units"]]
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["config", "faction_a", "unit_a", "n_a", "faction_b", "unit_b", "n_b",
+                    "outcome", "alive_a", "alive_b", "seconds", "cost_traded"])
+        for c, label in enumerate(labels):
+            for k in range(len(result["pair"])):
+                fa, fb = result["pairs"][result["pair"][k]]
+                x = result["cost_traded"][c, k]
+                w.writerow([label, fa, names[result["a"][k]], int(result["n_a"][k]),
+                            fb, names[result["b"][k]], int(result["n_b"][k]),
+                            int(result["outcome"][c, k]), int(result["alive_a"][c, k]),
+                            int(result["alive_b"][c, k]), round(float(result["seconds"][c, k]), 2),
+                            round(float(x), 3) if np.isfinite(x) else ("inf" if x > 0 else "")])
+
+def print_shares(result, labels):
+    """Share of matchups each side wins, per pair and equal group size."""
+    for p, (fa, fb) in enumerate(result["pairs"]):
+        print(f"{fa} vs {fb}: share of matchups won ({fa} / {fb})")
+        print(f"  {'size':>6s}" + "".join(f"{label:>16s}" for label in labels))
+        for n in result["sizes"]:
+            sel = (result["pair"] == p) & (result["n_a"] == n) & (result["n_b"] == n)
+            cells = ""
+            for c in range(len(labels)):
+                o = result["outcome"][c][sel]
+                cells += f"{(o > 0).mean() if o.size else 0:>9.0%} / {(o < 0).mean() if o.size else 0:4.0%}"
+            print(f"  {n:6d}{cells}")
+
+def print_matrix(result, labels, size_a, size_b):
+    mark = {1: "W", -1: "L", 0: "="}
+    for p, (fa, fb) in enumerate(result["pairs"]):
+        for c, label in enumerate(labels):
+            na, nb, o = matrix(result, "outcome", c, p, size_a, size_b)
+            print(f"\n{size_a} {fa} vs {size_b} {fb} ({label}), W = row group wins")
+            print(f"  {'':22s}" + "".join(f" {n[:4]:>4s}" for n in nb))
+            for name, row in zip(na, o):
+                print(f"  {name[:22]:22s}" + "".join(f" {mark[int(x)]:>4s}" for x in row))
+
+def print_flips(result, labels, size_a, size_b, top):
+    """Matchups whose outcome differs between the first and last config."""
+    names = [u["name"] for u in result["units"]]
+    sel = np.flatnonzero((result["n_a"] == size_a) & (result["n_b"] == size_b)
+                         & (result["outcome"][0] != result["outcome"][-1]))
+    print(f"\n{len(sel)} matchup(s) change outcome at {size_a} vs {size_b} "
+          f"({labels[0]} -> {labels[-1]}):")
+    word = {1: "win", -1: "loss", 0: "draw"}
+    print(f"  {'group a':26s} {'group b':26s} {'outcome':>12s} {'cost traded':>19s}")
+    for k in sel[:top]:
+        a, b = names[result["a"][k]], names[result["b"][k]]
+        v, m = result["outcome"][0, k], result["outcome"][-1, k]
+        print(f"  {a[:26]:26s} {b[:26]:26s} {word[v]:>5s} -> {word[m]:4s} "
+              f"{_traded(result['cost_traded'][0, k])} -> {_traded(result['cost_traded'][-1, k])}")
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Lanchester N-vs-M group fights between factions.")
+    ap.add_argument("--size", type=int, default=None, help="group size of the first faction")
+    ap.add_argument("--vs", type=int, default=None, help="group size of the second (default: --size)")
+    ap.add_argument("--factions", default=None, help="one pair, e.g. Sol,Alien (default: all)")
+    ap.add_argument("--show", action="store_true", help="print win/loss matrices")
+    ap.add_argument("--top", type=int, default=15, help="print up to N changed matchups")
+    ap.add_argument("--csv", default=None, help="write every fight here")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    args = ap.parse_args(argv)
+
+    pairs = None
+    if args.factions:
+        pair = tuple(s.strip() for s in args.factions.split(","))
+        if len(pair) != 2 or not set(pair) <= set(FACTIONS) or pair[0] == pair[1]:
+            ap.error(f"--factions wants two of: {', '.join(FACTIONS)}")
+        pairs = [pair]
+    sizes = list(SIZES)
+    size_a = args.size
+    size_b = args.vs if args.vs is not None else size_a
+    for n in (size_a, size_b):
+        if n is not None:
+            if n < 1:
+                ap.error("group sizes must be at least 1")
+            if n not in sizes:
+                sizes.append(n)
+    if size_a is None and size_b is not None:
+        ap.error("--vs needs --size")
+
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    labels = ("vanilla", "modded")
+    t = time.perf_counter()
+    result = simulate(combat_units(table), [{}, config.get("units", {})], sorted(sizes), pairs)
+    print(f"{result['outcome'].size} fights in {time.perf_counter() - t:.2f}s")
+
+    print_shares(result, labels)
+    if size_a is not None:
+        if args.show:
+            print_matrix(result, labels, size_a, size_b)
+        print_flips(result, labels, size_a, size_b, args.top)
+    if args.csv:
+        write_csv(result, labels, args.csv)
+        print(f"Written {args.csv}")
+
+if __name__ == "__main__":
+    main()
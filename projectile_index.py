@@ -0,0 +1,264 @@
+"""
+Projectile index extracted from the dump, reconciled against the hand table.
+
+Every weapon slot of a dump record names its ProjectileData (the
+VehicleTurret slots in u.turrets, atk_proj, atk2_proj, hha_proj) next to that
+projectile's damage parts, speed and lifetime. Many units share one
+ProjectileData, so the index keeps one record per name with the
+(unit, slot) pairs that use it. Users that disagree on a value are kept as
+conflicts; the first user's values stand. Fields a slot does not dump (pen
+for creature attacks; ricochet, splash and pen for hand weapons) are None,
+filled in by a later user that dumps them, and never compared.
+
+reconcile() compares the index with gen_default_config's hand tables:
+
+  new        in the dump, not in projectile_db
+  changed    a damage part, speed or lifetime differs from projectile_db
+  unused     in projectile_db, no unit in the dump fires it
+  mapping    vehicle_projectiles / turret_data / infantry_weapons name a
+             different projectile than the dump slot they describe
+  conflict   units of the dump disagree on a shared projectile
+
+merged_db() is projectile_db with every dumped projectile's values taken
+from the dump. The dump has no splash radii; those stay as the hand table
+has them (game defaults when it has none), as do fields no slot dumps.
+
+The index is cached per dump content under .cache/, so after a game patch
+gen_default_config.py only needs the new dump.
+
+Run: E:/Anaconda/python.exe projectile_index.py [--dump PATH] [--no-cache]
+         [--show NAME]
+  prints the reconciliation report, or one projectile and its users
+"""
+import argparse
+import os
+import pickle
+
+import turrets
+from dump_cache import CACHE_DIR, dump_hash, load_indexed_dump, prune
+
+# Bump when the extraction rules below change
+CACHE_VERSION = 3
+
+FIELDS = ("impact", "ricochet", "splash", "pen", "speed", "life", "instant")
+# Non-turret weapon slot -> dump field per FIELDS entry (None = not dumped
+# for the slot). VehicleTurret slots come from u.turrets.
+SLOT_FIELDS = {
+    "atk":  ("proj_impact_dmg", "proj_ricochet_dmg", "proj_splash_dmg", None,
+             "proj_speed", "proj_lifetime", "instant_hit"),
+    "atk2": ("proj2_impact_dmg", "proj2_ricochet_dmg", "proj2_splash_dmg", None,
+             "proj2_speed", "proj2_lifetime", "instant_hit2"),
+    "hha":  ("hha_impact_dmg", None, None, None,
+             "hha_proj_speed", "hha_proj_lifetime", "hha_instant_hit"),
+}
+SLOT_PROJ = {slot: f"{slot}_proj" for slot in SLOT_FIELDS}
+# projectile_db fields compared by reconcile()
+COMPARED = ("impact", "ricochet", "splash", "pen", "speed", "life")
+PREFIX = "ProjectileData_"
+
+# ══════════════════════════════════════════════════════════════
+# EXTRACTION
+# ══════════════════════════════════════════════════════════════
+
+class Projectile:
+    """One ProjectileData as the dump reports it, with every slot that fires it."""
+    __slots__ = ("name", "impact", "ricochet", "splash", "pen", "speed", "life",
+                 "instant", "users", "conflicts")
+
+    def __init__(self, name, values):
+        self.name = name
+        for f, v in zip(FIELDS, values):
+            setattr(self, f, v)
+        self.users = []      # (unit name, slot)
+        self.conflicts = []  # (field, value, unit name, slot) that disagree
+
+    def values(self):
+        return tuple(getattr(self, f) for f in FIELDS)
+
+def slot_values(u, fields):
+    """FIELDS values of one dump slot (None where the slot has no field)."""
+    out = []
+    for f, key in zip(FIELDS, fields):
+        if key is None:
+            out.append(None)
+            continue
+        v = u.get(key)
+        out.append(bool(v) if f == "instant" else float(v or 0))
+    return tuple(out)
+
+def turret_values(t):
+    """FIELDS values of one turrets.Turret slot."""
+    return tuple(bool(t.instant) if f == "instant" else float(getattr(t, f)) for f in FIELDS)
+
+def weapon_slots(u):
+    """(slot, projectile name, FIELDS values) for every projectile slot of a record."""
+    for t in u.turrets:
+        if t.proj:
+            yield t.slot, t.proj, turret_values(t)
+    for slot, fields in SLOT_FIELDS.items():
+        name = u.get(SLOT_PROJ[slot])
+        if name:
+            yield slot, name, slot_values(u, fields)
+
+def extract(units):
+    """name -> Projectile for every projectile slot of the dump records."""
+    index = {}
+    for u in units:
+        for slot, name, values in weapon_slots(u):
+            p = index.get(name)
+            if p is None:
+                p = index[name] = Projectile(name, values)
+            else:
+                for f, v, w in zip(FIELDS, values, p.values()):
+                    if w is None:
+                        setattr(p, f, v)
+                    elif v is not None and v != w:
+                        p.conflicts.append((f, v, u["name"], slot))
+            p.users.append((u["name"], slot))
+    return index
+
+def cache_path(digest):
+    return os.path.join(CACHE_DIR, f"proj_v{CACHE_VERSION}_{digest}.pickle")
+
+def load_projectile_index(path, use_cache=True):
+    """The projectile index of the dump at path, from .cache/ if possible."""
+    if not use_cache:
+        return extract(load_indexed_dump(path, use_cache=False)["units"])
+    with open(path, "rb") as f:
+        cpath = cache_path(dump_hash(f.read()))
+    try:
+        with open(cpath, "rb") as f:
+            index = pickle.load(f)
+        os.utime(cpath)  # keep it from being pruned
+        return index
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+        pass
+
+    index = extract(load_indexed_dump(path)["units"])
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = cpath + ".tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(index, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, cpath)
+    prune("proj_v", f"proj_v{CACHE_VERSION}_")
+    return index
+
+# ══════════════════════════════════════════════════════════════
+# RECONCILIATION
+# ══════════════════════════════════════════════════════════════
+
+def _num(v):
+    """Whole numbers as int, as the hand table writes them."""
+    return int(v) if float(v).is_integer() else v
+
+def db_entry(p, hand=None):
+    """projectile_db-style dict of p: non-zero damage parts, speed, life and
+    the hand table's splash radii. Fields no slot dumps keep the hand value."""
+    hand = hand or {}
+    vals = {f: hand.get(f, 0) if getattr(p, f) is None else getattr(p, f) for f in COMPARED}
+    e = {f: _num(vals[f]) for f in ("impact", "ricochet", "splash", "pen") if vals[f]}
+    if vals["splash"]:
+        e.update({k: v for k, v in hand.items() if k.startswith("splash_r_")})
+    e["speed"] = _num(vals["speed"])
+    e["life"] = _num(vals["life"])
+    return e
+
+def merged_db(index, hand=None):
+    """projectile_db with the dump's values for every dumped projectile."""
+    from gen_default_config import projectile_db
+    hand = projectile_db if hand is None else hand
+    db = dict(hand)
+    for name, p in index.items():
+        db[name] = db_entry(p, hand.get(name))
+    return db
+
+def dump_slot(units_by_name, unit, slot):
+    """(unit, slot) -> projectile name in the dump, '' if the slot is empty."""
+    u = units_by_name.get(unit)
+    if u is None:
+        return ""
+    if slot in SLOT_PROJ:
+        return u.get(SLOT_PROJ[slot]) or ""
+    return next((t.proj for t in u.turrets if t.slot == slot), "")
+
+def reconcile(index, by_name):
+    """Differences between the index and the hand tables, as (kind, name, detail)."""
+    import gen_default_config as g
+    out = []
+    for name, p in sorted(index.items()):
+        hand = g.projectile_db.get(name)
+        if hand is None:
+            out.append(("new", name, ", ".join(f"{k} {v:g}" for k, v in db_entry(p).items())))
+            continue
+        dumped = [(f, getattr(p, f)) for f in COMPARED if getattr(p, f) is not None]
+        diffs = [f"{f} {hand.get(f, 0):g} -> {v:g}" for f, v in dumped
+                 if abs(hand.get(f, 0) - v) > 1e-6 * max(1.0, abs(v))]
+        if diffs:
+            out.append(("changed", name, ", ".join(diffs)))
+        for f, v, unit, slot in p.conflicts:
+            out.append(("conflict", name, f"{unit} {slot} has {f} {v:g}, "
+                                          f"{p.users[0][0]} {p.users[0][1]} has {getattr(p, f):g}"))
+    for name in sorted(set(g.projectile_db) - set(index)):
+        out.append(("unused", name, "no dump slot fires it"))
+
+    for unit, vp in g.vehicle_projectiles.items():
+        if unit not in by_name:
+            continue
+        u = by_name[unit]
+        for scope, t in (("pri", turrets.primary(u)), ("sec", turrets.secondary(u))):
+            want, got = vp.get(scope, ""), t.proj if t else ""
+            if want != got:
+                out.append(("mapping", unit, f"vehicle_projectiles {scope} {want or '-'}, "
+                                             f"dump {t.slot if t else scope} {got or '-'}"))
+    for table, slot, kind in ((g.turret_data, "vt", "turret_data"),
+                              (g.infantry_weapons, "hha", "infantry_weapons")):
+        for unit, w in table.items():
+            got = dump_slot(by_name, unit, slot)
+            if got and got != PREFIX + w["proj"]:
+                out.append(("mapping", unit, f"{kind} {w['proj']}, dump {slot}_proj "
+                                             f"{got.replace(PREFIX, '')}"))
+    return out
+
+# ══════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════
+
+def print_report(report):
+    kinds = ("new", "changed", "mapping", "conflict", "unused")
+    for kind in kinds:
+        rows = [(name, detail) for k, name, detail in report if k == kind]
+        if rows:
+            print(f"{kind} ({len(rows)})")
+            for name, detail in rows:
+                print(f"  {name.replace(PREFIX, ''):32s} {detail}")
+    if not report:
+        print("Hand tables match the dump.")
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Projectile index from the dump vs the hand table.")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--show", default=None, help="print one projectile (with or without "
+                                                 "the ProjectileData_ prefix) and its users")
+    ap.add_argument("--no-cache", action="store_true", help="re-extract even if .cache/ has it")
+    args = ap.parse_args(argv)
+
+    index = load_projectile_index(args.dump, use_cache=not args.no_cache)
+    if args.show:
+        p = index.get(args.show) or index.get(PREFIX + args.show)
+        if p is None:
+            ap.error(f"no projectile {args.show!r} in the dump")
+        print(p.name)
+        for f in FIELDS:
+            v = getattr(p, f)
+            print(f"  {f:9s} {'-' if v is None else format(v, 'g')}")
+        print("  users    " + ", ".join(f"{u} {s}" for u, s in p.users))
+        return
+    table = load_indexed_dump(args.dump, use_cache=not args.no_cache)
+    print(f"{len(index)} projectiles in {sum(len(p.users) for p in index.values())} slots")
+    print_report(reconcile(index, table["by_name"]))
+
+if __name__ == "__main__":
+    main()
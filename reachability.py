@@ -0,0 +1,180 @@
+"""
+Tech-gating reachability index: when does a config make each unit reachable?
+
+A min_tier override (Gunship -> 0, Barrage Truck -> 7, Ultra Heavy Factory
+-> 6) also moves everything built at that structure. ReachIndex walks each
+faction's production graph (built_at / production_tree) in topological
+order once, carrying the tier every item needs:
+
+  earliest tier = max(own min_tier, earliest tier of its producer)
+
+and the research seconds to get there from tech_time (build_order.TechTree
+applies tech_time.tier_N and the modded min_tier values). Items whose
+producer can never be built stay unreachable (tier None).
+
+Queries are dictionary lookups:
+
+  idx = ReachIndex(table, config)        # config=None: vanilla
+  idx.earliest("Siege Tank")             # -> (tier, research seconds)
+  idx.earliest("Light Factory", "Centauri")
+  idx.unlocks(6, "Sol")                  # -> names first reachable at tier 6
+
+Run: E:/Anaconda/python.exe reachability.py [--unit NAME] [--tier N]
+         [--faction NAME] [--dump PATH] [--config PATH]
+  with neither --unit nor --tier, prints every change against vanilla
+"""
+import argparse
+import sys
+from collections import deque
+
+from build_order import TechTree
+from dump_cache import FACTIONS, load_indexed_dump
+
+# ══════════════════════════════════════════════════════════════
+# INDEX
+# ══════════════════════════════════════════════════════════════
+
+class Reach:
+    """Index entry: how soon one item of one faction is reachable.
+
+    kind is the TechTree kind, or "start" for the structures a faction
+    begins with (reachable at tier 0 whatever their own min_tier).
+    """
+    __slots__ = ("name", "kind", "producer", "min_tier", "tier", "seconds", "order")
+
+    def __init__(self, name, kind, producer, min_tier, tier, seconds, order):
+        self.name = name
+        self.kind = kind
+        self.producer = producer
+        self.min_tier = min_tier  # the item's own (modded) min_tier
+        self.tier = tier          # earliest tier, None if unreachable
+        self.seconds = seconds    # research seconds to reach that tier
+        self.order = order        # position in the faction's topological order
+
+def topological(tree):
+    """Item names of tree, producers before what they build (Kahn's algorithm).
+
+    Items on a producer cycle or under an unknown producer are left out.
+    """
+    children = {}
+    for name, it in tree.items.items():
+        if name not in tree.start:
+            children.setdefault(it.producer, []).append(name)
+    indeg = {name: 0 if name in tree.start else 1 for name in tree.items}
+    queue = deque(tree.start)
+    out = []
+    while queue:
+        n = queue.popleft()
+        out.append(n)
+        for c in children.get(n, ()):
+            indeg[c] -= 1
+            if indeg[c] == 0:
+                queue.append(c)
+    return out
+
+class ReachIndex:
+    """Earliest tier / research time of every item, per faction."""
+
+    def __init__(self, table, config=None):
+        self.entries = {f: {} for f in FACTIONS}
+        self.by_tier = {f: {} for f in FACTIONS}
+        self.tier_seconds = {}
+        for faction in FACTIONS:
+            self._build(faction, TechTree.from_table(table, faction, config))
+
+    def _build(self, faction, tree):
+        research = tree.research_items()
+        seconds, total = [0.0], 0.0
+        for k in range(1, 9):
+            total += research[k].time if k in research else float("inf")
+            seconds.append(total)
+        self.tier_seconds[faction] = seconds
+
+        entries = self.entries[faction]
+        for pos, name in enumerate(topological(tree)):
+            it = tree.items[name]
+            if name in tree.start:
+                tier = 0
+            else:
+                parent = entries.get(it.producer)
+                tier = None if parent is None or parent.tier is None else \
+                    max(parent.tier, it.min_tier, 0)
+            if tier is not None and seconds[min(tier, 8)] == float("inf"):
+                tier = None  # needs research the faction does not have
+            kind = "start" if name in tree.start else it.kind
+            entries[name] = Reach(name, kind, it.producer, it.min_tier, tier,
+                                  seconds[min(tier, 8)] if tier is not None else None, pos)
+            if tier is not None:
+                self.by_tier[faction].setdefault(tier, []).append(name)
+        for name, it in tree.items.items():
+            if name not in entries:
+                entries[name] = Reach(name, it.kind, it.producer, it.min_tier, None, None,
+                                      len(entries))
+
+    def entry(self, name, faction=None):
+        """The Reach entry of name (first faction in FACTIONS that has it)."""
+        for f in [faction] if faction else FACTIONS:
+            e = self.entries.get(f, {}).get(name)
+            if e is not None:
+                return e
+        raise KeyError(name)
+
+    def earliest(self, name, faction=None):
+        """(earliest tier, research seconds) for name; (None, None) if unreachable."""
+        e = self.entry(name, faction)
+        return e.tier, e.seconds
+
+    def unlocks(self, tier, faction):
+        """Names that first become reachable at tier, in topological order."""
+        return self.by_tier[faction].get(tier, [])
+
+def reach_index(table, config=None):
+    """Library entry point: ReachIndex for a config (None = vanilla)."""
+    return ReachIndex(table, config)
+
+# ══════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════
+
+def _tier(e):
+    return f"T{e.tier} {e.seconds:6.0f}s" if e.tier is not None else "unreachable"
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Earliest tier / research time of every unit.")
+    ap.add_argument("--unit", default=None, help="show one unit")
+    ap.add_argument("--tier", type=int, default=None, help="show what unlocks at this tier")
+    ap.add_argument("--faction", default=None, help="one of: " + ", ".join(FACTIONS))
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    args = ap.parse_args(argv)
+    if args.faction and args.faction not in FACTIONS:
+        ap.error(f"unknown faction {args.faction!r}")
+
+    table = load_indexed_dump(args.dump)
+    van = ReachIndex(table)
+    mod = ReachIndex(table, build_balance_sheet.load_config(args.config))
+    factions = [args.faction] if args.faction else list(FACTIONS)
+
+    if args.unit:
+        for f in factions:
+            if args.unit in mod.entries[f]:
+                print(f"{f} {args.unit}: vanilla {_tier(van.entry(args.unit, f))}, "
+                      f"modded {_tier(mod.entry(args.unit, f))}")
+        return 0
+    if args.tier is not None:
+        for f in factions:
+            head = f"{f}, tier {args.tier}: "
+            print(f"{head}vanilla {', '.join(van.unlocks(args.tier, f)) or '-'}")
+            print(f"{' ' * len(head)}modded  {', '.join(mod.unlocks(args.tier, f)) or '-'}")
+        return 0
+    for f in factions:
+        changed = [(n, van.entries[f].get(n), e) for n, e in mod.entries[f].items()
+                   if van.entries[f].get(n) is None or van.entries[f][n].tier != e.tier]
+        print(f"{f}: {len(changed)} item(s) reachable at a different tier")
+        for n, v, m in changed:
+            print(f"  {n:26s} {_tier(v) if v else '-':>14s} -> {_tier(m)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Regenerate every derived artifact from one parse of the dump + active config.
+
+Stages (run concurrently, one worker process each):
+  sheet    build_balance_sheet.build_workbook  -> Si_UnitBalance_Sheet.xlsx
+  default  gen_default_config.build_default_config -> Si_UnitBalance_Config_Default.json
+           (projectile values from the dump, projectile_index.merged_db)
+  pdf      generate_tech_trees.render_faction   -> <faction>_tech_tree.pdf
+           (one job per faction)
+
+The dump is parsed (or loaded from .cache/) and the config read once in this
+process; each worker receives only the part of that model it needs. A full
+regen takes about as long as the slowest stage.
+
+Run: E:/Anaconda/python.exe regen_all.py [--dump PATH] [--config PATH]
+         [--default-dump PATH] [--pdf-dir DIR] [--only sheet,default,pdf]
+         [--stream] [--serial]
+  --default-dump  dump for the default config (defaults to --dump)
+  --serial        run the stages one after another in this process
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+
+import build_balance_sheet
+import gen_default_config
+import projectile_index
+
+STAGES = ("sheet", "default", "pdf")
+# generate_tech_trees.FACTION_PDFS keys, kept here so the parent process
+# never imports matplotlib
+PDF_FACTIONS = ("Alien", "Sol", "Centauri")
+
+# ══════════════════════════════════════════════════════════════
+# STAGES — top-level so worker processes can unpickle them.
+# Each returns the stage's captured stdout.
+# ══════════════════════════════════════════════════════════════
+
+def _captured(fn, *args):
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        fn(*args)
+    return buf.getvalue()
+
+def _sheet(table, config, output_path, stream):
+    wb = build_balance_sheet.build_workbook(table, config, output_path, stream=stream)
+    print(f"Saved: {output_path} ({len(wb.sheetnames)} sheets)")
+
+def _default_config(by_name, db, output_path):
+    config = gen_default_config.build_default_config(by_name, db)
+    with open(output_path, "w") as f:
+        json.dump(config, f, indent=4)
+    print(f"Written {output_path}")
+    gen_default_config.audit_config(config)
+
+def _tech_tree(faction, output_dir):
+    import generate_tech_trees  # matplotlib is only needed in this worker
+    path = generate_tech_trees.render_faction(faction, output_dir or generate_tech_trees.OUTPUT_DIR)
+    print(f"-> {path}")
+
+def run_stage(name, args):
+    fn = {"sheet": _sheet, "default": _default_config, "pdf": _tech_tree}[name.split(":")[0]]
+    t = time.perf_counter()
+    log = _captured(fn, *args)
+    return log, time.perf_counter() - t
+
+# ══════════════════════════════════════════════════════════════
+# PIPELINE
+# ══════════════════════════════════════════════════════════════
+
+def stage_args(only, table, config, default_table, opts):
+    """Stage name -> positional args, built from the shared model."""
+    args = {}
+    if "sheet" in only:
+        args["sheet"] = (table, config, opts.output, opts.stream)
+    if "default" in only:
+        db = projectile_index.merged_db(projectile_index.extract(default_table["units"]))
+        args["default"] = (default_table["by_name"], db, opts.default_output)
+    if "pdf" in only:
+        # One job per faction so the three figures render side by side
+        for faction in PDF_FACTIONS:
+            args[f"pdf:{faction}"] = (faction, opts.pdf_dir)
+    return args
+
+def run_pipeline(jobs, serial=False):
+    """Run {stage: args}; return {stage: (ok, log_or_error, seconds)}.
+
+    Falls back to in-process serial runs on a single core, where worker
+    start-up would only add time.
+    """
+    results = {}
+    workers = min(len(jobs), os.cpu_count() or 1)
+    if serial or workers <= 1:
+        for name, args in jobs.items():
+            try:
+                log, secs = run_stage(name, args)
+                results[name] = (True, log, secs)
+            except Exception as ex:
+                results[name] = (False, f"{type(ex).__name__}: {ex}", 0.0)
+        return results
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(run_stage, name, args) for name, args in jobs.items()}
+        for name, fut in futures.items():
+            try:
+                log, secs = fut.result()
+                results[name] = (True, log, secs)
+            except Exception as ex:
+                results[name] = (False, f"{type(ex).__name__}: {ex}", 0.0)
+    return results
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Regenerate sheet, default config and tech-tree PDFs.")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    ap.add_argument("--default-dump", default=None)
+    ap.add_argument("--output", default=build_balance_sheet.OUTPUT_PATH)
+    ap.add_argument("--default-output", default=gen_default_config.OUTPUT_PATH)
+    ap.add_argument("--pdf-dir", default=None,
+                    help="tech-tree PDF directory (default: generate_tech_trees.OUTPUT_DIR)")
+    ap.add_argument("--only", default=",".join(STAGES),
+                    help="comma-separated subset of: " + ", ".join(STAGES))
+    ap.add_argument("--stream", action="store_true", help="write-only workbook")
+    ap.add_argument("--no-cache", action="store_true", help="parse the dump even if .cache/ has it")
+    ap.add_argument("--serial", action="store_true", help="no worker processes")
+    opts = ap.parse_args(argv)
+
+    only = [s.strip() for s in opts.only.split(",") if s.strip()]
+    unknown = [s for s in only if s not in STAGES]
+    if unknown:
+        ap.error(f"unknown stage(s): {', '.join(unknown)}")
+
+    t0 = time.perf_counter()
+    use_cache = not opts.no_cache
+    table = config = default_table = None
+    if "sheet" in only or ("default" in only and not opts.default_dump):
+        table = build_balance_sheet.load_dump(opts.dump, use_cache=use_cache)
+    if "sheet" in only:
+        config = build_balance_sheet.load_config(opts.config)
+    if "default" in only:
+        default_table = (gen_default_config.load_dump(opts.default_dump, use_cache=use_cache)
+                         if opts.default_dump else table)
+    print(f"Loaded model in {time.perf_counter() - t0:.2f}s")
+
+    jobs = stage_args(only, table, config, default_table, opts)
+    results = run_pipeline(jobs, serial=opts.serial)
+
+    failed = []
+    for name in jobs:
+        ok, log, secs = results[name]
+        print(f"\n── {name} ({'ok' if ok else 'FAILED'}, {secs:.2f}s) ──")
+        print(log.rstrip())
+        if not ok:
+            failed.append(name)
+    print(f"\nTotal: {time.perf_counter() - t0:.2f}s")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Sensitivity (Jacobian) report: which multiplier moves which metric most.
+
+For every unit and every *_mult key build_unit() emits for it (see
+gen_default_config.py), nudges the key around its value in the active
+config and measures the elasticity of the unit's derived metrics, i.e. the
+% change of the metric per % change of the key:
+
+  range         longest effective weapon range (speed x lifetime, or the
+                instant-hit distance)
+  dps           sustained DPS, summed over weapons
+  ttk           mean time for the unit to kill a mobile unit
+  ttd           mean time for an armed mobile unit to kill it
+  cost_per_hp   modded cost / modded HP
+  availability  research seconds to the earliest tier it is reachable at
+                (its own min_tier or its producer chain's, reachability.py)
+                + its build time (s); producer build times are not counted
+
+Elasticities come from central finite differences: every value the key
+controls is scaled by 1 +- STEP. An unset key is nudged around the value it
+inherits (e.g. sec_damage_mult from damage_mult), which is what setting it
+would start from.
+All perturbed configs form one batch on combat_engine.CombatModel, one
+candidate row per nudge, so the whole report is a few vectorised
+evaluations rather than a recomputation per key. Integer quantities
+(magazine, HP) are rounded like the mod does, so a key can show 0 when a
+STEP nudge does not change the rounded value.
+
+Keys the combat model does not use (movement, vision, ...) are listed in
+the JSON with "modelled": false and left out of the sheet.
+
+Run: E:/Anaconda/python.exe sensitivity.py [--dump PATH] [--config PATH]
+         [--json PATH] [--top N]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+from combat_engine import CombatModel
+from dump_cache import load_indexed_dump
+from sweep import Param, Sweep
+
+METRICS = ("range", "dps", "ttk", "ttd", "cost_per_hp", "availability")
+METRIC_LABELS = {"range": "Eff. range", "dps": "DPS", "ttk": "TTK", "ttd": "TTD",
+                 "cost_per_hp": "Cost/HP", "availability": "Avail. time"}
+# Relative nudge of each key for the central difference
+STEP = 0.05
+# Multiplier array elements (rows x units x slots) per evaluated batch
+BATCH_ELEMENTS = 2_000_000
+
+# ══════════════════════════════════════════════════════════════
+# INPUTS
+# ══════════════════════════════════════════════════════════════
+
+def emitted_keys(by_name, db=None):
+    """Unit name -> the *_mult keys build_unit() emits for it.
+
+    db is the projectile table build_default_config() reads (default
+    projectile_db). Raises KeyError (naming the unit) when the dump lacks a
+    unit that build_default_config() lists.
+    """
+    from gen_default_config import build_default_config
+    units = build_default_config(by_name, db)["units"]
+    return {name: [k for k in e if k.endswith("_mult")]
+            for name, e in units.items() if isinstance(e, dict) and not name.startswith("_")}
+
+def unlock_times(table, config, units):
+    """Research seconds until each unit is reachable (nan if it never is)."""
+    from reachability import reach_index
+    idx = reach_index(table, config)
+    return np.array([idx.entry(u["name"], u["faction"]).seconds for u in units], dtype=float)
+
+# ══════════════════════════════════════════════════════════════
+# METRICS
+# ══════════════════════════════════════════════════════════════
+
+def unit_metrics(out, mobile, unlock):
+    """(..., n, metrics) derived metrics from a CombatModel.evaluate() result.
+
+    ttk / ttd are the means of the finite entries of a ttk_matrix() row /
+    column over mobile units, in closed form so no (n x n) matrix is built.
+    """
+    hp, dps = out["hp"], out["dps"]
+    defenders = mobile & (hp > 0)
+    attackers = mobile & (dps > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean_hp = (hp * defenders).sum(axis=-1, keepdims=True) / defenders.sum(axis=-1, keepdims=True)
+        ttk = np.where(dps > 0, mean_hp / dps, np.nan)
+        inv = np.where(attackers, 1.0 / dps, 0.0)
+        mean_inv = inv.sum(axis=-1, keepdims=True) / attackers.sum(axis=-1, keepdims=True)
+        ttd = np.where(hp > 0, hp * mean_inv, np.nan)
+        cost_per_hp = np.where(hp > 0, out["cost"] / hp, np.nan)
+    cols = dict(range=out["range"], dps=dps, ttk=ttk, ttd=ttd, cost_per_hp=cost_per_hp,
+                availability=unlock + out["build_time"])
+    return np.stack([np.broadcast_to(cols[k], hp.shape) for k in METRICS], axis=-1)
+
+def elasticity(lo, base, hi, step=STEP):
+    """d ln(metric) / d ln(key) from a central difference (nan where undefined)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        e = (hi - lo) / (2 * step * base)
+    return np.where(np.isfinite(e), e, np.nan)
+
+# ══════════════════════════════════════════════════════════════
+# REPORT
+# ══════════════════════════════════════════════════════════════
+
+def jacobian(table, config, step=STEP):
+    """Elasticity of every listed unit's metrics to each of its emitted keys.
+
+    Returns dict(step, metrics, base={unit: {metric: value}},
+    rows=[dict(unit, faction, key, value, modelled, elasticity)]) with rows
+    in faction-sheet order; elasticity is {metric: float or None}.
+    """
+    import projectile_index
+
+    units_cfg = config.get("units", {})
+    units = [u for structures, mobile in table["factions"].values() for u in structures + mobile]
+    is_mobile = np.zeros(len(units), dtype=bool)
+    k = 0
+    for structures, mobile in table["factions"].values():
+        is_mobile[k + len(structures):k + len(structures) + len(mobile)] = True
+        k += len(structures) + len(mobile)
+
+    model = CombatModel(units)
+    sweep = Sweep(model, units_cfg)
+    # The dump's projectile values, as gen_default_config writes the default config
+    db = projectile_index.merged_db(projectile_index.extract(table["units"]))
+    keys = emitted_keys(table["by_name"], db)
+    unlock = unlock_times(table, config, units)
+
+    base = unit_metrics(model.evaluate(sweep.base), is_mobile, unlock)
+
+    # One entry per (unit, key); bound entries get two batch rows (-, +)
+    rows, nudges = [], []
+    for i, u in enumerate(units):
+        name = u["name"]
+        if model.index[name] != i:
+            continue  # duplicate name: the config entry applies to the first
+        for key in keys.get(name, ()):
+            try:
+                targets = sweep.bind(Param(name, key, 1.0, 1.0))
+            except ValueError:
+                targets = None
+            # What the key effectively is now; an unset key inherits from a
+            # broader one (sec_damage_mult from damage_mult, ...)
+            value = (sweep.current(targets) if targets
+                     else (units_cfg.get(name) or {}).get(key, 1.0))
+            rows.append(dict(unit=name, faction=u.get("faction", ""), key=key,
+                             value=value, modelled=targets is not None, index=i))
+            if targets is not None:
+                rows[-1]["batch"] = len(nudges)
+                nudges.append((targets, 1 - step))
+                nudges.append((targets, 1 + step))
+
+    per_batch = max(1, BATCH_ELEMENTS // max(1, model.n * len(model.slots)))
+    metrics = np.empty((len(nudges), len(METRICS)))
+    unit_of = np.array([r["index"] for r in rows if r["modelled"] for _ in (0, 1)], dtype=int)
+    for lo in range(0, len(nudges), per_batch):
+        chunk = nudges[lo:lo + per_batch]
+        c = len(chunk)
+        m = {q: np.broadcast_to(a, (c,) + a.shape).copy() for q, a in sweep.base.items()}
+        for r, (targets, factor) in enumerate(chunk):
+            for q, idx in targets:
+                m[q][(r,) + idx] *= factor
+        out = unit_metrics(model.evaluate(m), is_mobile, unlock)
+        metrics[lo:lo + c] = out[np.arange(c), unit_of[lo:lo + c]]
+
+    for r in rows:
+        i = r.pop("index")
+        b = r.pop("batch", None)
+        e = (elasticity(metrics[b], base[i], metrics[b + 1], step) if b is not None
+             else np.full(len(METRICS), np.nan))
+        r["elasticity"] = {k: (None if np.isnan(x) else round(float(x), 4))
+                           for k, x in zip(METRICS, e)}
+
+    base_out = {}
+    for i, u in enumerate(units):
+        if model.index[u["name"]] == i:
+            base_out[u["name"]] = {k: (None if not np.isfinite(x) else round(float(x), 3))
+                                   for k, x in zip(METRICS, base[i])}
+    return dict(step=step, metrics=list(METRICS), base=base_out, rows=rows)
+
+def leverage(row):
+    """Largest |elasticity| of a report row (0 if it moves nothing)."""
+    return max((abs(x) for x in row["elasticity"].values() if x is not None), default=0.0)
+
+def write_json(report, path):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=1)
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Elasticity of derived metrics to every multiplier key.")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    ap.add_argument("--json", default=None, help="write the full report here")
+    ap.add_argument("--top", type=int, default=15, help="print the N highest-leverage keys")
+    args = ap.parse_args(argv)
+
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    t = time.perf_counter()
+    try:
+        report = jacobian(table, config)
+    except KeyError as ex:
+        ap.error(f"dump has no unit {ex}, which gen_default_config lists")
+    rows = report["rows"]
+    modelled = sum(r["modelled"] for r in rows)
+    print(f"{len(rows)} keys ({modelled} modelled) in {time.perf_counter() - t:.2f}s")
+
+    print(f"  {'unit':22s} {'key':28s}" + "".join(f"{METRIC_LABELS[k]:>12s}" for k in METRICS))
+    for r in sorted(rows, key=leverage, reverse=True)[:args.top]:
+        cells = "".join(f"{x:12.3f}" if x is not None else f"{'':12s}"
+                        for x in r["elasticity"].values())
+        print(f"  {r['unit'][:22]:22s} {r['key'][:28]:28s}{cells}")
+    if args.json:
+        write_json(report, args.json)
+        print(f"Written {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Splash falloff: damage against distance, and against formations.
+
+A splash projectile deals its splash damage (m_fSplashDamageMax) in full
+inside splash_r_min and falls off to 0 at splash_r_max with the power
+splash_r_pow (combat_engine.splash_falloff). The radii come from
+gen_default_config.projectile_db and scale with splash_radius_max_mult /
+_min_mult / _pow_mult (pri_ / sec_ first), as the mod applies them.
+
+Every splash weapon slot of every unit is evaluated at once, vanilla and
+modded, on one shared radius grid (RADIUS_STEP apart, out to the largest
+modded radius): one (configs, units, slots, radii) falloff array.
+
+Formations are square grids of units a fixed spacing apart (FORMATIONS).
+The lattice neighbours of the unit that is hit are counted once per radius
+bin of the grid, so the expected splash on the rest of a formation is the
+falloff profile times those counts:
+
+  neighbours hit   units other than the one hit that take any splash
+  equivalents      sum of their damage shares (1 = one extra full splash)
+  damage           splash damage x equivalents, per shot
+
+Run: E:/Anaconda/python.exe splash.py [--unit NAME] [--dump PATH]
+         [--config PATH]
+  without --unit, lists every splash weapon with its radii and formation
+  damage, vanilla -> modded
+"""
+import argparse
+
+import numpy as np
+
+from combat_engine import SPLASH_RADIUS, CombatModel, splash_falloff
+from dump_cache import load_indexed_dump
+
+RADIUS_STEP = 0.25
+# Formation name -> metres between neighbours
+FORMATIONS = {"tight": 5.0, "standard": 10.0, "loose": 20.0}
+# Distances (m) shown in profiles
+PROFILE_RADII = (0, 1, 2, 5, 10, 20, 50, 100)
+
+# ══════════════════════════════════════════════════════════════
+# GRID
+# ══════════════════════════════════════════════════════════════
+
+def radius_grid(r_top, step=RADIUS_STEP):
+    """Shared radii 0, step, ... covering r_top."""
+    return np.arange(0.0, max(float(r_top), 0.0) + 2 * step, step)
+
+def lattice_counts(radii, spacing):
+    """Lattice neighbours (centre excluded) per radius bin of a square grid.
+
+    Bin k collects the neighbours closer to radii[k] than to any other grid
+    radius.
+    """
+    step = radii[1] - radii[0]
+    n = int(radii[-1] // spacing) + 1
+    k = np.arange(-n, n + 1) * spacing
+    d = np.hypot(k[:, None], k[None, :]).ravel()
+    d = d[(d > 0) & (d <= radii[-1] + step / 2)]
+    return np.bincount(np.rint(d / step).astype(int), minlength=len(radii))[:len(radii)]
+
+def falloff_profile(r_min, r_max, power, radii):
+    """(..., radii) damage share at every grid radius (0 where r_max is 0)."""
+    r_min, r_max, power = (np.asarray(a, dtype=float)[..., None] for a in (r_min, r_max, power))
+    return np.where(r_max > 0, splash_falloff(radii, r_min, r_max, power), 0.0)
+
+def formation_shares(profile, radii, spacings):
+    """(..., formations) (neighbours hit, equivalents) of a falloff profile."""
+    counts = np.stack([lattice_counts(radii, s) for s in spacings], axis=-1)
+    return (profile > 0).astype(float) @ counts, profile @ counts
+
+# ══════════════════════════════════════════════════════════════
+# REPORT
+# ══════════════════════════════════════════════════════════════
+
+def evaluate_splash(units, configs):
+    """Splash arrays for units under each units_cfg in configs, in one batch.
+
+    Returns dict(radii, damage (configs, n, slots) splash damage per
+    projectile, splash_r_max / _min / _pow, profile (configs, n, slots,
+    radii), hit and equivalent (configs, n, slots, formations), proj
+    (projectile name per [unit][slot]), slots (the model's slot names)).
+    """
+    model = CombatModel(units)
+    ms = [model.resolve(cfg) for cfg in configs]
+    out = model.evaluate({q: np.stack([x[q] for x in ms]) for q in ms[0]})
+    radii = radius_grid(out["splash_r_max"].max(initial=0.0))
+    profile = falloff_profile(out["splash_r_min"], out["splash_r_max"], out["splash_r_pow"], radii)
+    hit, equiv = formation_shares(profile, radii, FORMATIONS.values())
+    damage = out["per_shot"] * out["splash_share"] / model.shots
+    return dict(radii=radii, damage=damage, profile=profile, hit=hit, equivalent=equiv,
+                proj=model.proj, slots=model.slots, **{q: out[q] for q in SPLASH_RADIUS})
+
+def splash_report(units, units_cfg):
+    """Vanilla / modded splash of every splash slot, one {slot: dict} per record.
+
+    Each dict holds proj, damage, r_max, r_min, r_pow as (vanilla, modded)
+    floats, radii (the PROFILE_RADII up to the larger r_max) with profile,
+    the (vanilla, modded) damage at each, and formations {name: (hit,
+    damage)} with (vanilla, modded) neighbours hit and splash damage on them
+    per shot.
+    """
+    s = evaluate_splash(units, [{}, units_cfg])
+    radii = s["radii"]
+    report = [{} for _ in units]
+    top = s["splash_r_max"].max(axis=0)
+    for i, j in zip(*np.nonzero(top > 0)):
+        dmg = s["damage"][:, i, j]
+        if not (dmg > 0).any():
+            continue
+        shown = [r for r in PROFILE_RADII if r <= top[i, j]]
+        at = np.searchsorted(radii, shown)
+        profile = tuple([float(dmg[c] * s["profile"][c, i, j, k]) for k in at] for c in (0, 1))
+        report[i][s["slots"][j]] = dict(
+            proj=s["proj"][i][j],
+            damage=tuple(float(x) for x in dmg),
+            r_max=tuple(float(x) for x in s["splash_r_max"][:, i, j]),
+            r_min=tuple(float(x) for x in s["splash_r_min"][:, i, j]),
+            r_pow=tuple(float(x) for x in s["splash_r_pow"][:, i, j]),
+            radii=shown, profile=profile,
+            formations={name: (tuple(float(x) for x in s["hit"][:, i, j, f]),
+                               tuple(float(dmg[c] * s["equivalent"][c, i, j, f]) for c in (0, 1)))
+                        for f, name in enumerate(FORMATIONS)},
+        )
+    return report
+
+# ══════════════════════════════════════════════════════════════
+# CLI
+# ══════════════════════════════════════════════════════════════
+
+def _pair(v, fmt="{:g}"):
+    a, b = (fmt.format(x) for x in v)
+    return a if a == b else f"{a} -> {b}"
+
+def print_profile(name, slot, w):
+    print(f"{name} {slot} ({w['proj']}): splash {_pair(w['damage'], '{:.0f}')}, "
+          f"r_min {_pair(w['r_min'])}, r_max {_pair(w['r_max'])}, pow {_pair(w['r_pow'])}")
+    print(f"  {'radius':>8s} {'vanilla':>10s} {'modded':>10s}")
+    for r, a, b in zip(w["radii"], *w["profile"]):
+        print(f"  {r:8g} {a:10.0f} {b:10.0f}")
+    for f, (hit, dmg) in w["formations"].items():
+        print(f"  {f} ({FORMATIONS[f]:g} m): {_pair(hit, '{:.0f}')} neighbours hit, "
+              f"{_pair(dmg, '{:.0f}')} splash on them per shot")
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Splash falloff profiles and formation damage.")
+    ap.add_argument("--unit", default=None, help="print the profiles of one unit's weapons")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    args = ap.parse_args(argv)
+
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    units = [u for structures, mobile in table["factions"].values() for u in structures + mobile]
+    report = splash_report(units, config.get("units", {}))
+
+    if args.unit:
+        found = [slots for u, slots in zip(units, report) if u["name"] == args.unit and slots]
+        if not found:
+            ap.error(f"no splash weapon on {args.unit!r}")
+        for slot, w in found[0].items():
+            print_profile(args.unit, slot, w)
+        return
+
+    names = list(FORMATIONS)
+    print(f"  {'unit':22s} {'slot':5s} {'splash':>15s} {'r_max':>11s}"
+          + "".join(f"{'dmg on ' + n:>22s}" for n in names))
+    for u, slots in zip(units, report):
+        for slot, w in slots.items():
+            cells = "".join(f"{_pair(w['formations'][n][1], '{:.0f}'):>22s}" for n in names)
+            print(f"  {u['name'][:22]:22s} {slot:5s} {_pair(w['damage'], '{:.0f}'):>15s} "
+                  f"{_pair(w['r_max']):>11s}{cells}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Batch "what-if" sweeps over config multipliers.
+
+Evaluates thousands of candidate configs in one batched array computation
+on the combat model (combat_engine.CombatModel) and ranks them by the
+objectives you pick.
+
+A parameter is one config key of one unit, swept over [lo, hi]:
+  "Barrage Truck:pri_proj_speed_mult=1.0:2.0"       (grid: --steps values)
+  "Barrage Truck:pri_proj_speed_mult=1.0:2.0:21"    (grid: 21 values)
+Several parameters form the full grid, or --samples N draws N random
+candidates uniformly inside the bounds instead.
+
+An objective is "<unit>.<metric>:max" or ":min". Metrics:
+  dps, burst, hp, cost, build_time, range  (modded, see CombatModel.evaluate)
+  dps_per_cost, hp_per_cost                (cost-efficiency)
+  ttk:<defender>                           time for <unit> to kill <defender>
+  ttd:<attacker>                           time for <attacker> to kill <unit>
+Candidates are ranked by their mean rank over all objectives; the "pareto"
+column marks candidates no other candidate beats on every objective.
+
+Each swept key replaces the value the mod would resolve for every weapon
+slot / unit field where that key is the most specific one set, judged
+against the base config (see Sweep.bind).
+
+Run: E:/Anaconda/python.exe sweep.py --param SPEC [--param SPEC ...]
+         --objective OBJ [--objective OBJ ...] [--samples N] [--steps N]
+         [--seed N] [--top N] [--csv PATH] [--workers N] [--dump PATH]
+         [--config PATH]
+  --workers  processes for large sweeps (default: 1; chunks of CHUNK
+             candidates are evaluated per process)
+"""
+import argparse
+import csv
+import time
+
+import numpy as np
+
+from combat_engine import CombatModel, ttk_matrix
+from dump_cache import load_indexed_dump
+
+DEFAULT_STEPS = 11
+# Candidates per batch: bounds the (chunk, units, slots) temporaries
+CHUNK = 2048
+# Any value that no config would contain, used to trace a key's targets
+_PROBE = 12345.678
+
+BASE_METRICS = ("dps", "burst", "hp", "cost", "build_time", "range")
+METRICS = BASE_METRICS + ("dps_per_cost", "hp_per_cost", "ttk", "ttd")
+
+class Param:
+    """One swept config key of one unit."""
+    __slots__ = ("unit", "key", "lo", "hi", "steps")
+
+    def __init__(self, unit, key, lo, hi, steps=DEFAULT_STEPS):
+        self.unit = unit
+        self.key = key
+        self.lo = lo
+        self.hi = hi
+        self.steps = steps
+
+    @property
+    def label(self):
+        return f"{self.unit}:{self.key}"
+
+    def values(self):
+        return np.linspace(self.lo, self.hi, self.steps)
+
+def parse_param(spec, steps=DEFAULT_STEPS):
+    """'Unit:key=lo:hi[:steps]' -> Param."""
+    try:
+        target, rng = spec.rsplit("=", 1)
+        unit, key = target.rsplit(":", 1)
+        bounds = rng.split(":")
+        lo, hi = float(bounds[0]), float(bounds[1])
+        if len(bounds) > 2:
+            steps = int(bounds[2])
+    except (ValueError, IndexError):
+        raise ValueError(f"bad parameter {spec!r} (want 'Unit:key=lo:hi[:steps]')")
+    return Param(unit.strip(), key.strip(), lo, hi, steps)
+
+def parse_metric(ref):
+    """'Unit.metric[:other]' -> (unit, metric)."""
+    if "." not in ref:
+        raise ValueError(f"bad metric {ref!r} (want 'Unit.metric')")
+    unit, metric = ref.split(".", 1)
+    name, _, other = metric.partition(":")
+    if name.strip() not in METRICS or (name.strip() in ("ttk", "ttd")) != bool(other.strip()):
+        raise ValueError(f"unknown metric {metric!r} in {ref!r}")
+    return unit.strip(), f"{name.strip()}:{other.strip()}" if other else name.strip()
+
+def parse_objective(spec):
+    """'Unit.metric:max' -> (unit, metric, +1 for max / -1 for min)."""
+    body, _, sense = spec.rpartition(":")
+    if sense not in ("max", "min"):
+        raise ValueError(f"bad objective {spec!r} (want 'Unit.metric:max' or ':min')")
+    unit, metric = parse_metric(body)
+    return unit, metric, 1 if sense == "max" else -1
+
+def grid_candidates(params):
+    """Full grid over every Param's values: (candidates, params)."""
+    axes = np.meshgrid(*[p.values() for p in params], indexing="ij")
+    return np.stack([a.ravel() for a in axes], axis=1)
+
+def random_candidates(params, n, seed=0):
+    """n uniform random candidates inside the Params' bounds."""
+    rng = np.random.default_rng(seed)
+    lo = np.array([p.lo for p in params])
+    hi = np.array([p.hi for p in params])
+    return lo + rng.random((n, len(params))) * (hi - lo)
+
+# ══════════════════════════════════════════════════════════════
+# EVALUATION
+# ══════════════════════════════════════════════════════════════
+
+class Sweep:
+    """Batched evaluation of candidate values for a set of Params."""
+
+    def __init__(self, model, units_cfg):
+        self.model = model
+        self.units_cfg = units_cfg
+        self.base = model.resolve(units_cfg)
+
+    def unit_index(self, name):
+        try:
+            return self.model.index[name]
+        except KeyError:
+            raise ValueError(f"unknown unit {name!r}")
+
+    def bind(self, param):
+        """[(quantity, index)] of the multiplier entries param's key controls.
+
+        Found by resolving the unit's entry with the key set to a probe value
+        and seeing where the probe comes through, so the mod's precedence
+        rules live in one place (CombatModel.resolve_unit).
+        """
+        i = self.unit_index(param.unit)
+        cfg = dict(self.units_cfg.get(param.unit) or {})
+        cfg[param.key] = _PROBE
+        scratch = {q: a.copy() for q, a in self.base.items()}
+        self.model.resolve_unit(scratch, i, cfg)
+        targets = []
+        for q, a in scratch.items():
+            for idx in zip(*np.nonzero(a == _PROBE)):
+                targets.append((q, tuple(int(x) for x in idx)))
+        if not targets:
+            raise ValueError(f"{param.label} does not change anything the combat model uses "
+                             f"(or a more specific key overrides it)")
+        return targets
+
+    def current(self, targets):
+        """The value a bound key has in the loaded config: the resolved
+        multiplier at its first entry, so an unset key gives what it inherits
+        (sec_damage_mult from damage_mult, ...)."""
+        q, idx = targets[0]
+        return float(self.base[q][idx])
+
+    def multipliers(self, bindings, values):
+        """Batched multiplier arrays for candidate rows values (c, params)."""
+        c = len(values)
+        m = dict(self.base)
+        for q in {q for targets in bindings for q, _ in targets}:
+            m[q] = np.broadcast_to(self.base[q], (c,) + self.base[q].shape).copy()
+        for k, targets in enumerate(bindings):
+            for q, idx in targets:
+                m[q][(slice(None),) + idx] = values[:, k]
+        return m
+
+    def metrics(self, out, objectives, c):
+        """(c, objectives) metric values from an evaluate() result."""
+        cols = []
+        for unit, metric, _ in objectives:
+            i = self.unit_index(unit)
+            name, _, other = metric.partition(":")
+            if name in BASE_METRICS:
+                col = out[name][..., i]
+            elif name == "dps_per_cost":
+                col = out["dps"][..., i] / np.maximum(out["cost"][..., i], 1.0)
+            elif name == "hp_per_cost":
+                col = out["hp"][..., i] / np.maximum(out["cost"][..., i], 1.0)
+            elif name == "ttk":
+                j = self.unit_index(other)
+                col = ttk_matrix(out["dps"][..., [i]], out["hp"][..., [j]])[..., 0, 0]
+            else:  # ttd
+                j = self.unit_index(other)
+                col = ttk_matrix(out["dps"][..., [j]], out["hp"][..., [i]])[..., 0, 0]
+            cols.append(np.broadcast_to(col, (c,)))
+        return np.stack(cols, axis=-1)
+
+    def evaluate_chunk(self, bindings, values, objectives):
+        out = self.model.evaluate(self.multipliers(bindings, values))
+        return self.metrics(out, objectives, len(values))
+
+    def run(self, params, candidates, objectives, workers=1):
+        """(candidates, objectives) metric values, evaluated in chunks.
+
+        Chunks go to a pool of up to `workers` processes when there is more
+        than one chunk; with workers=1 (default) they run in this process,
+        which is faster than pickling the model to each worker unless the
+        sweep is very large.
+        """
+        bindings = [self.bind(p) for p in params]
+        chunks = [candidates[k:k + CHUNK] for k in range(0, len(candidates), CHUNK)]
+        workers = min(len(chunks), max(1, workers))
+        if workers <= 1:
+            parts = [self.evaluate_chunk(bindings, ch, objectives) for ch in chunks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                parts = list(pool.map(self.evaluate_chunk, [bindings] * len(chunks), chunks,
+                                      [objectives] * len(chunks)))
+        return np.concatenate(parts, axis=0)
+
+# ══════════════════════════════════════════════════════════════
+# RANKING
+# ══════════════════════════════════════════════════════════════
+
+def pareto_mask(scores):
+    """True for rows of scores (higher = better) that no other row dominates.
+
+    Each kept point removes everything it dominates, so the cost grows with
+    the size of the front rather than with candidates squared.
+    """
+    idx = np.arange(len(scores))
+    rest = scores
+    k = 0
+    while k < len(rest):
+        keep = (rest > rest[k]).any(axis=1)
+        keep[k] = True
+        idx, rest = idx[keep], rest[keep]
+        k = int(keep[:k].sum()) + 1
+    mask = np.zeros(len(scores), dtype=bool)
+    mask[idx] = True
+    return mask
+
+def rank(values, senses):
+    """Order candidates best first by mean per-objective rank.
+
+    Returns (order, mean_rank, pareto) with mean_rank 0 = best on every
+    objective. Non-finite values (no kill possible) rank last.
+    """
+    scores = values * np.asarray(senses, dtype=float)
+    scores = np.where(np.isfinite(scores), scores, -np.inf)
+    ranks = np.empty_like(scores)
+    for k in range(scores.shape[1]):
+        ranks[np.argsort(-scores[:, k], kind="stable"), k] = np.arange(len(scores))
+    mean_rank = ranks.mean(axis=1) / max(len(scores) - 1, 1)
+    order = np.argsort(mean_rank, kind="stable")
+    return order, mean_rank, pareto_mask(scores)
+
+def write_csv(path, params, objectives, candidates, values, order, mean_rank, pareto):
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["rank"] + [p.label for p in params]
+                   + [f"{u}.{m}" for u, m, _ in objectives] + ["score", "pareto"])
+        for r, c in enumerate(order, 1):
+            w.writerow([r] + [round(float(x), 4) for x in candidates[c]]
+                       + [round(float(x), 3) if np.isfinite(x) else "" for x in values[c]]
+                       + [round(1 - float(mean_rank[c]), 4), int(pareto[c])])
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Rank candidate multiplier values by derived metrics.")
+    ap.add_argument("--param", action="append", required=True,
+                    help="'Unit:key=lo:hi[:steps]' (repeatable)")
+    ap.add_argument("--objective", action="append", required=True,
+                    help="'Unit.metric:max|min' (repeatable)")
+    ap.add_argument("--samples", type=int, default=0, help="random candidates instead of a grid")
+    ap.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="grid steps per parameter")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--top", type=int, default=10)
+    ap.add_argument("--csv", default=None, help="write every ranked candidate here")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="chunk worker processes (default 1: in-process)")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    args = ap.parse_args(argv)
+
+    try:
+        params = [parse_param(s, args.steps) for s in args.param]
+        objectives = [parse_objective(s) for s in args.objective]
+    except ValueError as ex:
+        ap.error(str(ex))
+
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    units = [u for structures, mobile in table["factions"].values() for u in structures + mobile]
+    sweep = Sweep(CombatModel(units), config.get("units", {}))
+    candidates = (random_candidates(params, args.samples, args.seed) if args.samples
+                  else grid_candidates(params))
+
+    t = time.perf_counter()
+    try:
+        values = sweep.run(params, candidates, objectives, args.workers)
+    except ValueError as ex:
+        ap.error(str(ex))
+    order, mean_rank, pareto = rank(values, [s for _, _, s in objectives])
+    print(f"{len(candidates)} candidates in {time.perf_counter() - t:.2f}s "
+          f"({int(pareto.sum())} on the Pareto front)")
+
+    heads = [p.label for p in params] + [f"{u}.{m}" for u, m, _ in objectives]
+    print("  #  " + "  ".join(f"{h[-22:]:>22s}" for h in heads) + "  pareto")
+    for r, c in enumerate(order[:args.top], 1):
+        cells = [f"{x:22.4g}" for x in candidates[c]] + [f"{x:22.4g}" for x in values[c]]
+        print(f"{r:3d}  " + "  ".join(cells) + ("  *" if pareto[c] else ""))
+    if args.csv:
+        write_csv(args.csv, params, objectives, candidates, values, order, mean_rank, pareto)
+        print(f"Written {args.csv}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Per-tab cache for incremental workbook rebuilds.
+
+build_workbook(..., incremental=True) fingerprints the inputs of every tab
+(the unit records it shows, their units_cfg entries including projectiles
+overrides, the tech_time table, the production tree) and only runs the
+writers of tabs whose fingerprint has no cached XML. Unchanged tabs are
+written as empty placeholders and their worksheet XML is spliced back in
+from .cache/tabs/ after save.
+
+This relies on the workbook being write-only: openpyxl then writes strings
+inline, so a worksheet part does not reference sharedStrings.xml and can be
+moved between workbooks as-is. Cell style indices are kept stable by
+register_styles(), which interns every named style in STYLE_DEFS order.
+
+Fingerprints also cover the source of the sheet code and the openpyxl
+version, so editing a writer invalidates every cached tab.
+"""
+import hashlib
+import json
+import os
+import time
+import zipfile
+
+from dump_cache import CACHE_DIR
+
+TAB_DIR = os.path.join(CACHE_DIR, "tabs")
+# Cached tabs not used for this long are deleted by prune()
+MAX_AGE_DAYS = 7
+# Modules whose code decides what a tab looks like
+SOURCES = ("build_balance_sheet.py", "accuracy.py", "balance_engine.py", "build_order.py",
+           "combat_engine.py", "gen_default_config.py", "reachability.py",
+           "sensitivity.py", "splash.py", "sweep.py", "tab_cache.py", "turrets.py",
+           "unit_records.py")
+
+_salt = None
+
+def code_salt():
+    """Hash of the sheet code + openpyxl version, computed once per process."""
+    global _salt
+    if _salt is None:
+        import openpyxl
+        h = hashlib.blake2b(openpyxl.__version__.encode(), digest_size=16)
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in SOURCES:
+            with open(os.path.join(here, name), "rb") as f:
+                h.update(f.read())
+        _salt = h.hexdigest()
+    return _salt
+
+def fingerprint(title, *inputs):
+    """Stable hash of a tab's title and everything its writer reads."""
+    raw = json.dumps([code_salt(), title, inputs], sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+def tab_path(fp):
+    return os.path.join(TAB_DIR, f"{fp}.xml")
+
+def has_tab(fp):
+    return os.path.exists(tab_path(fp))
+
+def sheet_part(index):
+    """Archive name openpyxl gives the index-th worksheet (0-based)."""
+    return f"xl/worksheets/sheet{index + 1}.xml"
+
+def splice(path, tabs):
+    """Fix up a just-saved workbook in place.
+
+    tabs is [(fingerprint, reused)] in worksheet order. Freshly written tabs
+    are copied into the cache; reused ones have their placeholder part
+    replaced by the cached XML.
+    """
+    os.makedirs(TAB_DIR, exist_ok=True)
+    parts = {sheet_part(i): (fp, reused) for i, (fp, reused) in enumerate(tabs)}
+    tmp = path + ".tmp"
+    with zipfile.ZipFile(path) as src, \
+            zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as dst:
+        for info in src.infolist():
+            data = src.read(info.filename)
+            entry = parts.get(info.filename)
+            if entry is not None:
+                fp, reused = entry
+                cpath = tab_path(fp)
+                if reused:
+                    with open(cpath, "rb") as f:
+                        data = f.read()
+                    os.utime(cpath)  # keep it from being pruned
+                else:
+                    with open(cpath + ".tmp", "wb") as f:
+                        f.write(data)
+                    os.replace(cpath + ".tmp", cpath)
+            dst.writestr(info, data)
+    os.replace(tmp, path)
+
+def prune(max_age_days=MAX_AGE_DAYS):
+    """Delete cached tabs that no build has used recently. Returns the count."""
+    if not os.path.isdir(TAB_DIR):
+        return 0
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for entry in os.scandir(TAB_DIR):
+        if entry.name.endswith(".xml") and entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+            removed += 1
+    return removed
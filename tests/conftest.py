@@ -0,0 +1,15 @@
+import os
+import sys
+
+import pytest
+
+# The tools are flat scripts in the repo root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Small dump: a few units of each faction, with their production tree
+FIXTURE_DUMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "dump_small.json")
+
+@pytest.fixture(scope="session")
+def table():
+    from dump_cache import load_indexed_dump
+    return load_indexed_dump(FIXTURE_DUMP, use_cache=False)
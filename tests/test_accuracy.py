@@ -0,0 +1,58 @@
+import math
+import os
+
+import numpy as np
+import pytest
+
+from accuracy import DISTANCES, SAMPLES, SIZE_CLASSES, HitTables, hit_probability, weapon_report
+from combat_engine import combat_units
+
+def test_zero_spread_always_hits_in_range():
+    p = hit_probability([0.0], [1e9])
+    assert (p == 1.0).all()
+
+def test_nan_beyond_range():
+    p = hit_probability([1.0], [100.0])[0]
+    d = np.array(DISTANCES)
+    assert np.isnan(p[:, d > 100]).all()
+    assert not np.isnan(p[:, d <= 100]).any()
+
+def test_monte_carlo_matches_cone_area():
+    # The cone's cross-section (radius R = d tan(spread)) covers the whole
+    # silhouette, so P = silhouette area / disc area (within 4 sigma)
+    spread = 2.0
+    p = hit_probability([spread], [1e9])[0]
+    for c, (hw, hh) in enumerate(SIZE_CLASSES.values()):
+        for k, d in enumerate(DISTANCES):
+            r = d * math.tan(math.radians(spread))
+            if math.hypot(hw, hh) < r:
+                want = 4 * hw * hh / (math.pi * r * r)
+                sigma = math.sqrt(want * (1 - want) / SAMPLES)
+                assert p[c, k] == pytest.approx(want, abs=4 * sigma)
+
+def test_hit_chance_falls_with_distance():
+    p = hit_probability([0.5, 3.0], [1e9, 1e9])
+    assert (np.diff(p, axis=-1) <= 0).all()
+    assert (p[1] <= p[0]).all()
+
+def test_tables_round_trip(tmp_path):
+    path = str(tmp_path / "hit_current.pickle")
+    (tmp_path / "hit_other_model.pickle").write_bytes(b"")
+    tables = HitTables(path)
+    key = HitTables.key("ProjectileData_Test", 1.0, 500.0)
+    first = tables.lookup([key])[0]
+    tables.save()
+    assert os.listdir(tmp_path) == ["hit_current.pickle"]
+    again = HitTables(path)
+    assert not again.dirty
+    np.testing.assert_array_equal(again.lookup([key])[0], first)
+
+def test_accuracy_mult_skips_infantry(table, tmp_path):
+    units = combat_units(table)
+    cfg = {"Marksman": {"accuracy_mult": 2.0}, "Light Quad": {"accuracy_mult": 2.0}}
+    report = weapon_report(units, cfg, HitTables(str(tmp_path / "hit.pickle")))
+    names = [u.name for u in units]
+    hha = report[names.index("Marksman")]["hha"]
+    vt = report[names.index("Light Quad")]["vt"]
+    assert hha["spread"][0] == hha["spread"][1]
+    assert vt["spread"][1] == 2 * vt["spread"][0]
@@ -0,0 +1,85 @@
+import random
+
+import numpy as np
+
+from balance_engine import FIELD_RULES, TURRET_RULES, BalanceTable, py_round
+
+# Scalar rules of the detail tabs before BalanceTable (build_balance_sheet
+# _m / _mi / _div and modded_proj_dmg): the baseline the columns must match.
+
+def _m(val, mult, key):
+    if abs(mult - 1.0) > 0.001 and val > 0:
+        return round(val * mult, 2), key
+    return val, "-"
+
+def _mi(val, mult, key):
+    if abs(mult - 1.0) > 0.001 and val > 0:
+        return max(1, round(val * mult)), key
+    return val, "-"
+
+def _div(val, mult, key):
+    if abs(mult - 1.0) > 0.001 and val > 0:
+        return round(val / mult, 4), key
+    return val, "-"
+
+def _whole(val, mult, key):
+    m, s = _m(val, mult, key)
+    return round(m), s
+
+SCALAR = {"mul": _m, "int": _mi, "div": _div, "whole": _whole}
+
+MULTS = (0.5, 0.75, 0.9995, 1.0, 1.0005, 1.13, 1.25, 1.5, 2.0, 3.33)
+
+def random_config(names, seed):
+    rnd = random.Random(seed)
+    keys = {k for k, _ in FIELD_RULES.values()} | {k for k, _ in TURRET_RULES.values()}
+    keys |= {"damage_mult", "cost_mult", "build_time_mult", "health_mult"}
+    return {name: {k: rnd.choice(MULTS) for k in sorted(keys)} for name in names}
+
+def test_py_round_matches_round():
+    rnd = random.Random(1)
+    xs = [rnd.uniform(0, 500) for _ in range(2000)]
+    # Exact and near ties in the last kept digit
+    xs += [k / 200 for k in range(2000)] + [k * 0.005 + 1e-12 for k in range(500)]
+    x = np.array(xs)
+    for nd in (0, 1, 2, 4):
+        assert py_round(x, nd).tolist() == [float(round(v, nd)) for v in xs]
+
+def test_columns_match_scalar_rules(table):
+    units = table["units"]
+    cfg = random_config({u.name for u in units}, seed=7)
+    bt = BalanceTable(units, cfg)
+    for i, u in enumerate(units):
+        c = cfg[u.name]
+        for field, (key, rule) in FIELD_RULES.items():
+            mod, src = SCALAR[rule](u.get(field, 0), c[key], key)
+            assert (bt.modded[field][i], bt.source[field][i]) == (mod, src), (u.name, field)
+        for t in u.turrets:
+            for attr, (key, rule) in TURRET_RULES.items():
+                mod, src = SCALAR[rule](getattr(t, attr), c[key], key)
+                col = f"{t.slot}_{attr}"
+                assert (bt.modded[col][i], bt.source[col][i]) == (mod, src), (u.name, col)
+
+def test_sheet_columns_and_projectile_damage(table):
+    units = table["units"]
+    cfg = random_config({u.name for u in units}, seed=11)
+    bt = BalanceTable(units, cfg)
+    for i, u in enumerate(units):
+        c = cfg[u.name]
+        assert bt.modded["sheet_cost"][i] == (max(1, round(u.cost * c["cost_mult"])) if u.cost > 0 else 0)
+        assert bt.modded["sheet_hp"][i] == (max(1, round(u.hp * c["health_mult"])) if u.hp > 0 else 0)
+        assert bt.modded["sheet_build_time"][i] == (
+            round(u.build_time * c["build_time_mult"], 1) if u.build_time > 0 else 0)
+        for t in u.turrets:
+            v = t.impact
+            want = round(v * c["damage_mult"], 1) if c["damage_mult"] != 1.0 and v > 0 else v
+            assert bt.modded[f"{t.slot}.impact"][i] == want
+
+def test_absolute_projectile_override(table):
+    units = table["units"]
+    quad = next(u for u in units if u.name == "Light Quad")
+    proj = quad.turrets[0].proj
+    cfg = {"Light Quad": {"damage_mult": 2.0, "projectiles": {proj: {"m_fImpactDamage": 123.0}}}}
+    v = BalanceTable(units, cfg).of(quad)
+    assert v.mod("vt.impact") == 123.0
+    assert v.src("vt.impact") == "absolute"
@@ -0,0 +1,17 @@
+import pytest
+
+from build_balance_sheet import STYLE_DEFS, register_styles
+
+def test_style_indices_follow_style_defs():
+    openpyxl = pytest.importorskip("openpyxl")
+    from openpyxl.cell import WriteOnlyCell
+
+    for write_only in (True, False):
+        wb = openpyxl.Workbook(write_only=write_only)
+        register_styles(wb)
+        ws = wb.create_sheet("t")
+        # Reverse order: the index must not depend on which style a tab uses first
+        for k, name in reversed(list(enumerate(STYLE_DEFS, 1))):
+            cell = WriteOnlyCell(ws)
+            cell.style = name
+            assert cell.style_id == k
@@ -0,0 +1,30 @@
+from build_order import INF, TechTree, fielding_times, plan, simulate
+
+def test_plan_and_simulate(table):
+    tree = TechTree.from_table(table, "Sol")
+    assert tree.start == ["Headquarters"]
+    order = plan(tree, "Heavy Quad")
+    assert order == ["Research Facility", "Mark I", "Light Factory", "Mark II", "Heavy Quad"]
+    # Research Facility 30 s, tiers 30 s each (DEFAULT_TECH_TIME) queued at
+    # the lab, Light Factory 30 s once tier 1 is in, Heavy Quad 15 s
+    assert simulate(tree, order) == [30.0, 60.0, 90.0, 90.0, 105.0]
+
+def test_producer_queue_is_serial(table):
+    tree = TechTree.from_table(table, "Sol")
+    finish = simulate(tree, ["Barracks", "Scout", "Scout", "Scout"])
+    assert finish == [30.0, 40.0, 50.0, 60.0]
+
+def test_income_gates_the_order(table):
+    tree = TechTree.from_table(table, "Sol")
+    # Barracks costs 1000: 10 s of income at 100/s, then 30 s to build
+    assert simulate(tree, ["Barracks"], start=0.0, income=100.0) == [40.0]
+    assert simulate(tree, ["Barracks"], start=0.0, income=0.0) == [INF]
+
+def test_fielding_times(table):
+    tree = TechTree.from_table(table, "Sol")
+    times = fielding_times(tree, ["Headquarters", "Scout", "Light Quad", "Hover Tank"])
+    assert times == {"Headquarters": 0.0, "Scout": 40.0, "Light Quad": 100.0, "Hover Tank": INF}
+
+def test_tech_time_config(table):
+    tree = TechTree.from_table(table, "Sol", {"tech_time": {"tier_1": 90}})
+    assert fielding_times(tree, ["Light Quad"])["Light Quad"] == 160.0
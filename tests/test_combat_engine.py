@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from combat_engine import CombatModel, combat_units, ttk_matrix
+from turrets import load_turrets
+from unit_records import load_units
+
+def turret_unit(name, slots, interval=1.0, impact=100.0):
+    d = {"name": name, "faction": "Sol", "hp": 1000, "cost": 500}
+    for k in range(slots):
+        p = "vt_" if k == 0 else f"vt{k + 1}_"
+        d.update({p + "proj": f"ProjectileData_Test{k}", p + "fire_interval": interval,
+                  p + "impact_dmg": impact})
+    return d
+
+def records(*dicts):
+    units = load_units(dicts)
+    for u in units:
+        u.turrets = load_turrets(u)
+    return units
+
+def test_fourth_turret_slot_is_modelled():
+    units = records(turret_unit("Quad", 4), turret_unit("Single", 1))
+    model = CombatModel(units)
+    assert model.turret_slots == ("vt", "vt2", "vt3", "vt4")
+    assert model.slots[:4] == model.turret_slots
+    out = model.evaluate(model.resolve({}))
+    np.testing.assert_allclose(out["slot_dps"][0, :4], 100.0)
+    assert out["dps"][0] == 400.0
+    assert out["dps"][1] == 100.0
+
+def test_fourth_turret_slot_takes_sec_multipliers():
+    model = CombatModel(records(turret_unit("Quad", 4)))
+    out = model.evaluate(model.resolve({"Quad": {"sec_damage_mult": 2.0}}))
+    # vt is VT[0].Primary ("pri"); vt2..vt4 are "sec"
+    np.testing.assert_allclose(out["slot_dps"][0, :4], [100.0, 200.0, 200.0, 200.0])
+
+def test_three_slot_axis_without_extra_turrets():
+    model = CombatModel(records(turret_unit("Single", 1)))
+    assert model.turret_slots == ("vt", "vt2", "vt3")
+
+def slot_dps(per_shot, interval, magazine, reload):
+    """Sustained DPS of one slot, as in the combat_engine docstring."""
+    if magazine > 0:
+        return per_shot * magazine / (magazine * interval + reload)
+    return per_shot / interval
+
+def test_vanilla_dps_matches_formula(table):
+    units = combat_units(table)
+    model = CombatModel(units)
+    out = model.evaluate(model.resolve({}))
+    for i, u in enumerate(units):
+        want = sum(slot_dps((t.impact + t.splash) * max(1, t.shot_count), t.fire_interval,
+                            t.magazine, t.reload)
+                   for t in u.turrets if t.fire_interval > 0 and t.proj)
+        for n in ("atk", "atk2"):
+            if u.get(f"{n}_cooldown", 0) > 0 and not u.get(f"{n}_proj") and u.get(f"{n}_damage", 0) > 0:
+                want += u[f"{n}_damage"] / u[f"{n}_cooldown"]
+        if u.get("hha_proj"):
+            want += slot_dps(u["hha_impact_dmg"], u["hha_fire_delay"], u.get("hha_magazine", 0),
+                             u.get("hha_reload_time", 0))
+        assert out["dps"][i] == pytest.approx(want), u.name
+
+def test_gunship_turret_scopes(table):
+    # Gunship: vt3 is its primary weapon (damage scope "pri"), but fire rate
+    # follows the cycle scope, which is "pri" only for VT[0].Primary
+    units = [table["by_name"]["Gunship"]]
+    model = CombatModel(units)
+    vt3 = model.slots.index("vt3")
+
+    def vt3_dps(cfg):
+        return model.evaluate(model.resolve({"Gunship": cfg}))["slot_dps"][0, vt3]
+
+    base = vt3_dps({})
+    assert base == pytest.approx(slot_dps(240.0, 0.1, 40, 4.0))
+    assert vt3_dps({"pri_fire_rate_mult": 2.0}) == base
+    assert vt3_dps({"sec_fire_rate_mult": 2.0}) == pytest.approx(slot_dps(240.0, 0.05, 40, 4.0))
+    assert vt3_dps({"pri_damage_mult": 2.0}) == pytest.approx(2 * base)
+    assert vt3_dps({"sec_damage_mult": 2.0}) == base
+
+def test_ttk_matrix(table):
+    units = combat_units(table)
+    model = CombatModel(units)
+    out = model.evaluate(model.resolve({"Crab": {"health_mult": 1.5}}))
+    ttk = ttk_matrix(out["dps"], out["hp"])
+    names = model.names
+    quad, crab, scout = names.index("Light Quad"), names.index("Crab"), names.index("Scout")
+    assert out["hp"][crab] == 9000.0
+    assert ttk[quad, crab] == pytest.approx(9000.0 / out["dps"][quad])
+    assert np.isinf(ttk[scout]).all()  # unarmed
@@ -0,0 +1,34 @@
+import os
+import time
+
+import dump_cache
+from conftest import FIXTURE_DUMP
+from dump_cache import CACHE_VERSION, load_indexed_dump, prune
+
+def touch(path, age_days=0):
+    with open(path, "wb"):
+        pass
+    t = time.time() - age_days * 86400
+    os.utime(path, (t, t))
+
+def test_prune_other_versions_and_old_entries(tmp_path):
+    keep = f"dump_v{CACHE_VERSION}_"
+    for name, age in [(keep + "new.pickle", 0), (keep + "old.pickle", 30),
+                      ("dump_v1_x.pickle", 0), ("proj_v1_x.pickle", 30), ("notes.txt", 30)]:
+        touch(tmp_path / name, age)
+    assert prune("dump_v", keep, str(tmp_path)) == 2
+    assert sorted(os.listdir(tmp_path)) == [keep + "new.pickle", "notes.txt", "proj_v1_x.pickle"]
+
+def test_cache_hit_is_kept_fresh(tmp_path, monkeypatch):
+    monkeypatch.setattr(dump_cache, "CACHE_DIR", str(tmp_path))
+    stale = tmp_path / "dump_v1_stale.pickle"
+    touch(stale)
+    first = load_indexed_dump(FIXTURE_DUMP)
+    assert not stale.exists()
+    cached, = os.listdir(tmp_path)
+    path = tmp_path / cached
+    old = time.time() - 30 * 86400
+    os.utime(path, (old, old))
+    again = load_indexed_dump(FIXTURE_DUMP)
+    assert [u.name for u in again["units"]] == [u.name for u in first["units"]]
+    assert path.stat().st_mtime > old + 86400
@@ -0,0 +1,60 @@
+from field_dump import FieldIndex, scan
+
+LOG = """\
+[12:00:00.000] [Si_UnitBalance] ========== Field Discovery ==========
+[12:00:00.001] [Si_UnitBalance]   [ObjectInfo] Type: ObjectInfo
+[12:00:00.002] [Si_UnitBalance]   [ObjectInfo] field String  DisplayName = Crab
+[12:00:00.003] [Si_UnitBalance]   --- CRAB DEEP COMPONENT DUMP ---
+[12:00:00.004] [Si_UnitBalance]   Crab has 3 root components:
+[12:00:00.005] [Si_UnitBalance]   --- Referenced Object: AttackPrimary (type CreatureAttack) ---
+[12:00:00.006] [Si_UnitBalance]   [CreatureAttack:AttackPrimary] Type: CreatureAttack
+[12:00:00.007] [Si_UnitBalance]   [CreatureAttack:AttackPrimary] field Single  Damage = 240
+[12:00:00.008] [Si_UnitBalance]   [CreatureAttack:AttackPrimary] prop  Boolean IsMelee = True
+[12:00:00.009] [Si_UnitBalance]   [CreatureAttack:AttackSecondary] Type: CreatureAttack
+[12:00:00.010] [Si_UnitBalance]   [CreatureAttack:AttackSecondary] field Single  Damage = 500
+[12:00:00.011] [Si_UnitBalance]   --- END CRAB DUMP ---
+[12:00:00.012] [Si_UnitBalance]   === ProjectileData: ProjectileData_Test ===
+[12:00:00.013] [Si_UnitBalance]   [ProjectileData] Type: ProjectileData
+[12:00:00.014] [Si_UnitBalance]   [ProjectileData] field Single  m_fImpactDamage = 70
+[12:00:00.015] [Si_UnitBalance] ========== End Field Discovery ==========
+"""
+
+def write_log(tmp_path):
+    path = tmp_path / "Latest.log"
+    path.write_bytes(LOG.encode("utf-8"))
+    return str(path)
+
+def test_block_offsets(tmp_path):
+    path = write_log(tmp_path)
+    with open(path, "rb") as f:
+        blocks = scan(f)
+    raw = LOG.encode("utf-8")
+    lines = raw.splitlines(keepends=True)
+    starts = [sum(map(len, lines[:k])) for k in range(len(lines) + 1)]
+    got = [(b.run, b.unit, b.component, b.label, b.start, b.end) for b in blocks]
+    assert got == [
+        (1, "", "ObjectInfo", "", starts[1], starts[3]),
+        (1, "Crab", "CreatureAttack:AttackPrimary",
+         "Referenced Object: AttackPrimary (type CreatureAttack)", starts[6], starts[9]),
+        (1, "Crab", "CreatureAttack:AttackSecondary",
+         "Referenced Object: AttackPrimary (type CreatureAttack)", starts[9], starts[11]),
+        (1, "ProjectileData_Test", "ProjectileData", "", starts[13], starts[15]),
+    ]
+
+def test_find_and_read(tmp_path):
+    idx = FieldIndex.build(write_log(tmp_path))
+    assert idx.units() == ["Crab", "ProjectileData_Test"]
+    assert [b.component for b in idx.find("crab", "CreatureAttack")] == \
+        ["CreatureAttack:AttackPrimary", "CreatureAttack:AttackSecondary"]
+    block, = idx.find("Crab", "creatureattack:attackprimary")
+    assert idx.read(block) == ("CreatureAttack", [("field", "Single", "Damage", "240"),
+                                                  ("prop", "Boolean", "IsMelee", "True")])
+
+def test_cached_index_is_reused(tmp_path, monkeypatch):
+    import field_dump
+    monkeypatch.setattr(field_dump, "CACHE_DIR", str(tmp_path / "cache"))
+    path = write_log(tmp_path)
+    first = FieldIndex.load(path)
+    monkeypatch.setattr(field_dump, "scan", None)  # a rebuild would fail
+    again = FieldIndex.load(path)
+    assert [(b.start, b.end) for b in again.blocks] == [(b.start, b.end) for b in first.blocks]
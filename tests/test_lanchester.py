@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+from combat_engine import combat_units
+from lanchester import fight, simulate
+
+def one_lane(hp_a, hp_b, dps_a, dps_b, n_a, n_b, splash_a=0.0, reach_a=0.0):
+    arr = np.array
+    return fight(arr([hp_a]), arr([hp_b]), arr([dps_a]), arr([dps_b]),
+                 arr([[splash_a]]), arr([[0.0]]), arr([[reach_a]]), arr([[0.0]]),
+                 arr([n_a]), arr([n_b]))
+
+def test_duel():
+    alive_a, alive_b, t = one_lane(100.0, 100.0, 10.0, 5.0, 1, 1)
+    assert (alive_a[0], alive_b[0]) == (1, 0)
+    assert t[0] == pytest.approx(10.0)
+
+def test_focus_fire_square_law():
+    # Two a's focus the single b: it dies at t=5 after dealing 50 damage
+    alive_a, alive_b, t = one_lane(100.0, 100.0, 10.0, 10.0, 2, 1)
+    assert (alive_a[0], alive_b[0]) == (2, 0)
+    assert t[0] == pytest.approx(5.0)
+
+def test_kill_by_kill_integration():
+    # 1 a (dps 30) vs 3 b (hp 30, dps 1): one kill per second
+    alive_a, alive_b, t = one_lane(1000.0, 30.0, 30.0, 1.0, 1, 3)
+    assert (alive_a[0], alive_b[0]) == (1, 0)
+    assert t[0] == pytest.approx(3.0)
+
+def test_splash_hits_neighbours():
+    # 10 of splash DPS again on up to 2 neighbours: 30 / s into 3 b's,
+    # 20 / s into 2, 10 / s into the last (1 + 1.5 + 3 s, not 9 s)
+    alive_a, alive_b, t = one_lane(1000.0, 30.0, 10.0, 0.0, 1, 3, splash_a=10.0, reach_a=2.0)
+    assert alive_b[0] == 0
+    assert t[0] == pytest.approx(5.5)
+
+def test_no_damage_is_a_draw():
+    alive_a, alive_b, t = one_lane(100.0, 100.0, 0.0, 0.0, 5, 5)
+    assert (alive_a[0], alive_b[0], t[0]) == (5, 5, 0.0)
+
+def test_simulate_fixture(table):
+    units = combat_units(table)
+    r = simulate(units, [{}], sizes=(1, 5), pairs=[("Sol", "Alien")])
+    names = [u.name for u in units]
+    lane = [k for k in range(len(r["a"]))
+            if names[r["a"][k]] == "Gunship" and names[r["b"][k]] == "Shrimp"
+            and r["n_a"][k] == 1 and r["n_b"][k] == 1]
+    assert r["outcome"][0, lane] == [1]
+    # Scout is unarmed, so it has no group
+    assert names.index("Scout") not in r["groups"]["Sol"]
@@ -0,0 +1,28 @@
+from build_order import TechTree
+from reachability import reach_index, topological
+
+def test_topological_puts_producers_first(table):
+    tree = TechTree.from_table(table, "Sol")
+    order = topological(tree)
+    assert order[0] == "Headquarters"
+    pos = {name: k for k, name in enumerate(order)}
+    for name in order:
+        if name not in tree.start:
+            assert pos[tree.items[name].producer] < pos[name]
+
+def test_vanilla_reach(table):
+    idx = reach_index(table)
+    assert idx.earliest("Headquarters", "Sol") == (0, 0.0)
+    assert idx.earliest("Scout", "Sol") == (0, 0.0)
+    assert idx.earliest("Light Quad", "Sol") == (1, 30.0)  # built at Light Factory (T1)
+    assert idx.earliest("Heavy Quad", "Sol") == (2, 60.0)
+    # Heavy Factory needs tier 4; the fixture only has Mark I-III
+    assert idx.earliest("Hover Tank", "Sol") == (None, None)
+    assert idx.unlocks(1, "Sol") == ["Light Factory", "Mark II", "Light Quad", "Platoon Hauler"]
+
+def test_min_tier_override_moves_children(table):
+    config = {"units": {"Light Factory": {"min_tier": 3}, "Heavy Factory": {"min_tier": 2}},
+              "tech_time": {"tier_3": 45}}
+    idx = reach_index(table, config)
+    assert idx.earliest("Light Quad", "Sol") == (3, 105.0)
+    assert idx.earliest("Hover Tank", "Sol") == (2, 60.0)
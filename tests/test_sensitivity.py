@@ -0,0 +1,12 @@
+import math
+
+from sensitivity import unlock_times
+
+def test_unlock_follows_the_producer_chain(table):
+    by_name = {(u.faction, u.name): u for u in table["units"]}
+    names = [("Sol", "Scout"), ("Sol", "Light Quad"), ("Sol", "Hover Tank"), ("Alien", "Horned Crab")]
+    t = unlock_times(table, {"tech_time": {"tier_2": 45}}, [by_name[k] for k in names])
+    # Light Quad has no min_tier of its own; its Light Factory needs tier 1
+    assert t[:2].tolist() == [0.0, 30.0]
+    assert math.isnan(t[2])  # Heavy Factory needs tier 4, past the fixture's Mark III
+    assert t[3] == 75.0      # Greater Spawning Cyst: tier 2
@@ -0,0 +1,23 @@
+from combat_engine import CombatModel, combat_units
+from sweep import Param, Sweep
+from tune import Tuner, parse_target
+
+def tuner(table, units_cfg, params, targets):
+    sweep = Sweep(CombatModel(combat_units(table)), units_cfg)
+    return Tuner(sweep, params, [parse_target(t) for t in targets])
+
+def test_start_inherits_broader_keys(table):
+    cfg = {"Light Quad": {"damage_mult": 1.5, "sec_fire_rate_mult": 0.8}}
+    t = tuner(table, cfg, [Param("Light Quad", "pri_damage_mult", 0.5, 2.0),
+                           Param("Light Quad", "sec_fire_rate_mult", 0.5, 2.0),
+                           Param("Light Quad", "cost_mult", 0.5, 2.0)],
+              ["Light Quad.dps >= 100"])
+    assert t.start.tolist() == [1.5, 0.8, 1.0]
+
+def test_solve_hits_target(table):
+    t = tuner(table, {}, [Param("Light Quad", "pri_damage_mult", 0.5, 2.0)],
+              ["Light Quad.dps = 700 +-1%"])
+    x, loss = t.solve(population=32, generations=60)
+    # 350 DPS vanilla; the pull towards 1.0 keeps it near the low edge of +-1%
+    assert abs(350 * x[0] - 700) / 700 < 0.02
+    assert loss < 1e-3
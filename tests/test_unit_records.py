@@ -0,0 +1,41 @@
+import json
+
+from conftest import FIXTURE_DUMP
+from unit_records import CORE, column, load_units
+
+def raw_units():
+    with open(FIXTURE_DUMP, encoding="utf-8") as f:
+        return json.load(f)["units"]
+
+def test_records_read_like_dicts():
+    raw = raw_units()
+    for d, u in zip(raw, load_units(raw)):
+        assert list(u) == list(d)
+        assert len(u) == len(d)
+        assert list(u.keys()) == list(d.keys())
+        assert dict(u.items()) == d
+        for k, v in d.items():
+            assert u[k] == v and u.get(k) == v and k in u
+        assert "no_such_field" not in u
+        assert u.get("no_such_field", 7) == 7
+
+def test_core_attributes_and_defaults():
+    u = load_units([{"name": "Thing", "cost": 50, "min_tier": None}])[0]
+    assert (u.name, u.cost, u.min_tier, u.faction, u.is_structure) == ("Thing", 50, -1, "", False)
+    assert set(CORE) <= set(u.__slots__)
+
+def test_shared_shapes_and_values():
+    units = load_units(raw_units())
+    assert len({id(u.shape) for u in units}) < len(units)
+    zeros = {id(v) for u in units for v in u.row if type(v) is float and v == 0.0}
+    assert len(zeros) == 1
+
+def test_column():
+    raw = raw_units() + [{"name": "Odd"}]
+    units = load_units(raw)
+    assert column(units, "hp", 0) == [d.get("hp", 0) for d in raw]
+    assert column(units, "missing", "x") == ["x"] * len(raw)
+
+def test_repr_is_stable():
+    raw = raw_units()[:2]
+    assert repr(load_units(raw)) == repr(load_units(raw))
@@ -0,0 +1,268 @@
+"""
+Multiplier auto-tuner: solve for config values that hit target stats.
+
+Instead of hand-tuning cost_mult / pri_impact_damage_mult until a unit
+"feels right", state the goal and let the tuner search the keys you free:
+
+  tune.py --param "Light Striker:pri_fire_rate_mult=0.5:2" \\
+          --target "Light Striker.ttk:Crab = Hover Bike.ttk:Crab +-10%"
+
+A target compares a metric (same names as sweep.py: dps, burst, hp, cost,
+build_time, range, dps_per_cost, hp_per_cost, ttk:<defender>,
+ttd:<attacker>) with a number or with another metric, scaled or not:
+
+  "Heavy.range >= 1.2 * Sniper.range"
+  "Crab.hp_per_cost <= 3.5"
+  "Light Striker.dps = 450 +-5%"        (+-P% is the tolerance of '=')
+
+Targets can also come from a JSON file holding a list of these strings.
+
+The search runs in the [lo, hi] box of every --param with a batched
+evolution strategy (diagonal CMA-style: weighted elite mean, per-parameter
+step sizes) on combat_engine.CombatModel through sweep.Sweep, so one
+generation is one vectorised evaluation. The loss is the squared relative
+violation of each target plus a small pull towards the current config
+values, so once every target holds the tuner prefers the smallest change.
+
+The result is a config patch {"units": {unit: {key: value}}} with values
+rounded to 3 decimals (re-checked after rounding); merge it into the config
+or copy the values into apply_config.py.
+
+Run: E:/Anaconda/python.exe tune.py --param SPEC [--param SPEC ...]
+         --target T [--target T ...] [--targets FILE] [--output PATH]
+         [--population N] [--generations N] [--seed N] [--dump PATH]
+         [--config PATH]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+
+import numpy as np
+
+from combat_engine import CombatModel
+from dump_cache import load_indexed_dump
+from sweep import Sweep, parse_metric, parse_param
+
+POPULATION = 128
+GENERATIONS = 80
+# Weight of the pull towards the current config values (in box units)
+STAY_WEIGHT = 1e-3
+# Loss charged for a target whose metric is infinite (e.g. no kill possible)
+NO_VALUE_LOSS = 1e3
+DECIMALS = 3
+
+_TARGET_RE = re.compile(r"^(?P<lhs>.+?)\s*(?P<op><=|>=|=)\s*(?P<rhs>.+?)"
+                        r"(?:\s*(?:\+-|±)\s*(?P<tol>[\d.]+)\s*%)?$")
+_SCALED_RE = re.compile(r"^(?:(?P<pre>[\d.eE+-]+)\s*\*\s*)?(?P<ref>.+?)(?:\s*\*\s*(?P<post>[\d.eE+-]+))?$")
+
+# ══════════════════════════════════════════════════════════════
+# TARGETS
+# ══════════════════════════════════════════════════════════════
+
+class Target:
+    """lhs <op> scale * rhs (rhs a metric, or None for a plain number)."""
+    __slots__ = ("text", "lhs", "op", "rhs", "scale", "tol")
+
+    def __init__(self, text, lhs, op, rhs, scale, tol):
+        self.text = text
+        self.lhs = lhs
+        self.op = op
+        self.rhs = rhs
+        self.scale = scale
+        self.tol = tol
+
+    def refs(self):
+        return [self.lhs] + ([self.rhs] if self.rhs else [])
+
+def parse_target(text):
+    """'Unit.metric OP [k *] (number | Unit.metric) [+-P%]' -> Target."""
+    m = _TARGET_RE.match(text.strip())
+    if not m:
+        raise ValueError(f"bad target {text!r} (want 'Unit.metric <=|>=|= value')")
+    lhs = parse_metric(m["lhs"])
+    tol = float(m["tol"]) / 100 if m["tol"] else 0.0
+    if tol and m["op"] != "=":
+        raise ValueError(f"tolerance only applies to '=' targets: {text!r}")
+    try:
+        return Target(text, lhs, m["op"], None, float(m["rhs"]), tol)
+    except ValueError:
+        pass
+    s = _SCALED_RE.match(m["rhs"])
+    if s["pre"] and s["post"]:
+        raise ValueError(f"bad target {text!r} (one scale factor at most)")
+    scale = float(s["pre"] or s["post"] or 1.0)
+    return Target(text, lhs, m["op"], parse_metric(s["ref"]), scale, tol)
+
+def load_targets(path):
+    with open(path) as f:
+        texts = json.load(f)
+    if not isinstance(texts, list) or not all(isinstance(t, str) for t in texts):
+        raise ValueError(f"{path}: want a JSON list of target strings")
+    return [parse_target(t) for t in texts]
+
+def violations(targets, col, values):
+    """(c, targets) relative violation of each target, 0 where it holds.
+
+    col maps a metric ref to its column in values (c, refs).
+    """
+    out = []
+    for t in targets:
+        lhs = values[:, col[t.lhs]]
+        rhs = t.scale * (values[:, col[t.rhs]] if t.rhs else 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = lhs / rhs
+        if t.op == "<=":
+            v = np.maximum(ratio - 1, 0)
+        elif t.op == ">=":
+            v = np.maximum(1 - ratio, 0)
+        else:
+            v = np.maximum(np.abs(ratio - 1) - t.tol, 0)
+        both_inf = np.isinf(lhs) & np.isinf(rhs)
+        v = np.where(both_inf, 0.0, v)
+        out.append(np.where(np.isfinite(v), v, np.sqrt(NO_VALUE_LOSS)))
+    return np.stack(out, axis=-1)
+
+# ══════════════════════════════════════════════════════════════
+# SOLVER
+# ══════════════════════════════════════════════════════════════
+
+class Tuner:
+    """Loss over candidate values of params, evaluated in batches."""
+
+    def __init__(self, sweep, params, targets):
+        self.sweep = sweep
+        self.params = params
+        self.targets = targets
+        self.refs = list(dict.fromkeys(r for t in targets for r in t.refs()))
+        self.col = {r: k for k, r in enumerate(self.refs)}
+        self.objectives = [(u, m, 1) for u, m in self.refs]
+        self.bindings = [sweep.bind(p) for p in params]
+        self.lo = np.array([p.lo for p in params])
+        self.hi = np.array([p.hi for p in params])
+        # Start from what each key resolves to now (an unset key inherits)
+        self.start = np.clip([sweep.current(b) for b in self.bindings], self.lo, self.hi)
+        self.evals = 0
+
+    def values(self, x):
+        """Metric values (c, refs) of candidates x (c, params)."""
+        self.evals += len(x)
+        return self.sweep.evaluate_chunk(self.bindings, x, self.objectives)
+
+    def loss(self, x):
+        viol = violations(self.targets, self.col, self.values(x))
+        stay = ((x - self.start) / np.maximum(self.hi - self.lo, 1e-9)) ** 2
+        return (viol ** 2).sum(axis=1) + STAY_WEIGHT * stay.sum(axis=1)
+
+    def solve(self, population=POPULATION, generations=GENERATIONS, seed=0):
+        """Best candidate found, searched in the unit box [0, 1]^params.
+
+        Each generation samples around the mean with per-parameter step
+        sizes, keeps the best half weighted by log rank, and moves the mean
+        and step sizes towards them. Stops early once the steps shrink
+        below the 3-decimal rounding of the result.
+        """
+        rng = np.random.default_rng(seed)
+        span = np.maximum(self.hi - self.lo, 1e-9)
+        n = len(self.params)
+        mu = population // 2
+        w = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+        w /= w.sum()
+        mean = (self.start - self.lo) / span
+        sigma = np.full(n, 0.3)
+        best_z, best_loss = mean.copy(), float(self.loss(self.lo + mean[None] * span)[0])
+        for _ in range(generations):
+            z = np.clip(mean + sigma * rng.standard_normal((population, n)), 0, 1)
+            z[0] = best_z  # elitism: the best point so far always competes
+            loss = self.loss(self.lo + z * span)
+            order = np.argsort(loss, kind="stable")
+            if loss[order[0]] < best_loss:
+                best_z, best_loss = z[order[0]].copy(), float(loss[order[0]])
+            elite = z[order[:mu]]
+            new_mean = w @ elite
+            spread = np.sqrt(w @ (elite - mean) ** 2)
+            sigma = np.clip(0.7 * sigma + 0.3 * spread, 1e-6, 0.5)
+            mean = new_mean
+            if np.all(sigma * span < 0.5 * 10.0 ** -DECIMALS):
+                break
+        return self.lo + best_z * span, best_loss
+
+    def report(self, x):
+        """[(target, lhs value, rhs value, violation)] for one candidate."""
+        vals = self.values(x[None])
+        viol = violations(self.targets, self.col, vals)[0]
+        rows = []
+        for t, v in zip(self.targets, viol):
+            lhs = vals[0, self.col[t.lhs]]
+            rhs = t.scale * (vals[0, self.col[t.rhs]] if t.rhs else 1.0)
+            rows.append((t, float(lhs), float(rhs), float(v)))
+        return rows
+
+def config_patch(params, x):
+    """{"units": {unit: {key: value}}} for the solved values."""
+    units = {}
+    for p, v in zip(params, x):
+        units.setdefault(p.unit, {})[p.key] = round(float(v), DECIMALS)
+    return {"units": units}
+
+def print_report(title, rows):
+    print(title)
+    for t, lhs, rhs, v in rows:
+        state = "ok" if v == 0 else f"off by {v:.1%}"
+        print(f"  {t.text:50s} {lhs:10.4g} vs {rhs:10.4g}  {state}")
+
+def main(argv=None):
+    import build_balance_sheet
+    ap = argparse.ArgumentParser(description="Solve config multipliers for target stats.")
+    ap.add_argument("--param", action="append", required=True,
+                    help="free key 'Unit:key=lo:hi' (repeatable)")
+    ap.add_argument("--target", action="append", default=[],
+                    help="'Unit.metric <=|>=|= value [+-P%%]' (repeatable)")
+    ap.add_argument("--targets", default=None, help="JSON list of target strings")
+    ap.add_argument("--output", default=None, help="write the config patch here (default: stdout)")
+    ap.add_argument("--population", type=int, default=POPULATION)
+    ap.add_argument("--generations", type=int, default=GENERATIONS)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    args = ap.parse_args(argv)
+
+    try:
+        params = [parse_param(s) for s in args.param]
+        targets = [parse_target(t) for t in args.target]
+        if args.targets:
+            targets += load_targets(args.targets)
+    except (OSError, ValueError) as ex:
+        ap.error(str(ex))
+    if not targets:
+        ap.error("give at least one --target or --targets FILE")
+
+    table = load_indexed_dump(args.dump)
+    config = build_balance_sheet.load_config(args.config)
+    units = [u for structures, mobile in table["factions"].values() for u in structures + mobile]
+    sweep = Sweep(CombatModel(units), config.get("units", {}))
+    try:
+        tuner = Tuner(sweep, params, targets)
+        before = tuner.report(tuner.start)
+    except ValueError as ex:
+        ap.error(str(ex))
+
+    t = time.perf_counter()
+    x, _ = tuner.solve(args.population, args.generations, args.seed)
+    x = np.round(x, DECIMALS)
+    print_report("Current config:", before)
+    rows = tuner.report(x)
+    print_report(f"Tuned ({tuner.evals} candidates, {time.perf_counter() - t:.2f}s):", rows)
+
+    patch = json.dumps(config_patch(params, x), indent=4)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(patch + "\n")
+        print(f"Written {args.output}")
+    else:
+        print(patch)
+    return 0 if all(v == 0 for *_, v in rows) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Normalised VehicleTurret weapon records.
+
+The dump flattens every VehicleTurret weapon into prefixed keys: vt_ and vt2_
+are the first VehicleTurret's Primary / Secondary weapon, vt3_ the second
+VehicleTurret's Primary. The numbering continues the same way (vt4_ = second
+turret's Secondary, vt5_ = third turret's Primary, ...), so weapon slot k
+(0-based) sits on VehicleTurret k // 2.
+
+load_turrets() turns those keys into a tuple of Turret records, one per
+weapon slot the record has, in slot order. dump_cache attaches them to every
+unit as u.turrets when it indexes the dump, so the scripts read
+t.fire_interval instead of building "vt3_fire_interval" strings per unit.
+
+Each slot has two config scopes, as the mod resolves them (Overrides.cs):
+
+  scope        damage, projectile speed / lifetime, range and splash radii
+               (_vtPriIndex): on the unit's primary VehicleTurret
+               (PRIMARY_TURRET, default the first) the Primary weapon is "pri"
+               and the Secondary "sec"; every weapon on any other turret is "sec"
+  cycle_scope  fire rate, magazine, reload and accuracy: the first
+               VehicleTurret's Primary weapon is "pri", every other weapon
+               "sec", whatever PRIMARY_TURRET says
+"""
+import re
+
+# Weapon fields of one slot: Turret attribute -> dump key suffix
+FIELDS = {
+    "proj":          "proj",
+    "fire_interval": "fire_interval",
+    "spread":        "spread",
+    "magazine":      "magazine",
+    "reload":        "reload",
+    "shot_count":    "shot_count",
+    "impact":        "impact_dmg",
+    "ricochet":      "ricochet_dmg",
+    "splash":        "splash_dmg",
+    "pen":           "pen_dmg",
+    "has_splash":    "has_splash",
+    "has_pen":       "has_pen",
+    "speed":         "proj_speed",
+    "life":          "proj_lifetime",
+    "instant":       "instant_hit",
+}
+# Unit name -> VehicleTurret index of its primary weapon (mirrors the mod's
+# _vtPriIndex; not listed = 0)
+PRIMARY_TURRET = {
+    "Bomber": 1,          # cannon on 2nd VT, bombs on 1st
+    "Freighter": 1,       # cannon on 2nd VT, bomb on 1st
+    "Shuttle": 1,         # cannon on 2nd VT (only weapon)
+    "Gunship": 1,         # gun on 2nd VT
+    "Platoon Hauler": 1,  # weapon on 2nd VT
+}
+
+_SLOT_KEY = re.compile(r"vt(\d*)_(?:proj|fire_interval)$")
+
+def slot_name(k):
+    """Dump slot name of weapon slot k: vt, vt2, vt3, ..."""
+    return "vt" if k == 0 else f"vt{k + 1}"
+
+def slot_number(slot):
+    """Inverse of slot_name()."""
+    return int(slot[2:] or 1) - 1
+
+class Turret:
+    """One VehicleTurret weapon slot of a unit record."""
+    __slots__ = ("slot", "prefix", "index", "weapon", "scope", "cycle_scope") + tuple(FIELDS)
+
+    def __init__(self, u, k, pri_index):
+        self.slot = slot_name(k)
+        self.prefix = self.slot + "_"
+        self.index = k // 2                                    # VehicleTurret index
+        self.weapon = "Primary" if k % 2 == 0 else "Secondary"
+        self.scope = "pri" if self.index == pri_index and self.weapon == "Primary" else "sec"
+        self.cycle_scope = "pri" if k == 0 else "sec"          # VT[0].Primary only
+        for attr, suffix in FIELDS.items():
+            v = u.get(self.prefix + suffix)
+            if attr == "proj":
+                v = v or ""
+            elif attr in ("has_splash", "has_pen", "instant"):
+                v = bool(v)
+            else:
+                v = v or 0
+            setattr(self, attr, v)
+
+    def __repr__(self):
+        # Content only, so it reads the same in every run
+        fields = ", ".join(f"{a}={getattr(self, a)!r}" for a in FIELDS)
+        return f"Turret({self.slot}, {self.scope}, {self.cycle_scope}, {fields})"
+
+    def key(self, field):
+        """Flat dump key of one of this slot's fields ("vt3_" + field)."""
+        return self.prefix + field
+
+    @property
+    def armed(self):
+        return self.fire_interval > 0 or bool(self.proj)
+
+def load_turrets(u):
+    """Tuple of Turret records for every weapon slot a dump record has."""
+    found = [m.group(1) for m in map(_SLOT_KEY.match, u) if m]
+    if not found:
+        return ()
+    count = max(int(n or 1) for n in found)
+    pri = PRIMARY_TURRET.get(u["name"], 0)
+    return tuple(Turret(u, k, pri) for k in range(count))
+
+# All-zero slot, for units without the slot asked for
+EMPTY = Turret({}, 0, 0)
+
+def primary(u):
+    """The unit's "pri" turret slot, or None."""
+    for t in u.turrets:
+        if t.scope == "pri":
+            return t
+    return None
+
+def secondary(u):
+    """The unit's first armed "sec" turret slot (first "sec" slot if none is armed)."""
+    sec = [t for t in u.turrets if t.scope == "sec"]
+    return next((t for t in sec if t.armed), sec[0] if sec else None)
@@ -0,0 +1,112 @@
+"""
+Compact unit records for the parsed dump.
+
+json.load gives every unit its own dict of ~90 keys (more with dump_fields),
+so a dump holds one hash table per unit, and every script re-reads the same
+fields with .get() and a default. load_units() packs each unit into a
+UnitRecord instead:
+
+  - the fields every script classifies and sorts by (CORE) are typed
+    __slots__ attributes with their defaults resolved once, at load time:
+    u.name, u.faction, u.cost, u.min_tier, ...
+  - all dump keys keep their values in a tuple; the key -> position map is a
+    Shape shared by every record with the same keys (a dump has one or two)
+  - repeated scalars (0.0, faction and projectile names, ...) are stored once
+    per dump
+
+Records still read like the dump dicts they replace: u["hp"],
+u.get("vt2_spread", 0), "atk_proj" in u and iteration in dump order keep the
+raw dump's semantics. column() reads one field of many records with one
+position lookup per run of records that share a Shape.
+"""
+import math
+
+# Typed fields resolved at load time: name -> default where the dump has none
+CORE = {
+    "name":         "",
+    "faction":      "",
+    "team":         "",
+    "built_at":     "",
+    "veh_type":     "",
+    "is_structure": False,
+    "min_tier":     -1,
+    "cost":         0,
+    "hp":           0,
+    "build_time":   0,
+}
+
+class Shape:
+    """Key layout shared by every record with the same dump keys."""
+    __slots__ = ("keys", "index")
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.index = {k: i for i, k in enumerate(keys)}
+
+class UnitRecord:
+    """One dump unit: CORE attributes, turret slots and the raw dump values."""
+    __slots__ = tuple(CORE) + ("turrets", "shape", "row")
+
+    def __init__(self, shape, row):
+        self.shape = shape
+        self.row = row
+        index = shape.index
+        for f, default in CORE.items():
+            i = index.get(f)
+            setattr(self, f, default if i is None or row[i] is None else row[i])
+        self.turrets = ()
+
+    def __getitem__(self, key):
+        return self.row[self.shape.index[key]]
+
+    def get(self, key, default=None):
+        i = self.shape.index.get(key)
+        return default if i is None else self.row[i]
+
+    def __contains__(self, key):
+        return key in self.shape.index
+
+    def __iter__(self):
+        return iter(self.shape.keys)
+
+    def __len__(self):
+        return len(self.row)
+
+    def keys(self):
+        return self.shape.keys
+
+    def items(self):
+        return zip(self.shape.keys, self.row)
+
+    def __repr__(self):
+        # Stable across runs: tab_cache fingerprints records through it
+        return f"UnitRecord({dict(self.items())!r})"
+
+def _shared(v, memo):
+    """v, or the equal scalar seen before (type and sign of zero kept)."""
+    if isinstance(v, (list, dict)):
+        return v
+    key = (type(v), v, math.copysign(1.0, v) if type(v) is float else 0)
+    return memo.setdefault(key, v)
+
+def load_units(units):
+    """UnitRecords for a list of parsed dump unit dicts, in the same order."""
+    shapes, memo, out = {}, {}, []
+    for d in units:
+        keys = tuple(d)
+        shape = shapes.get(keys)
+        if shape is None:
+            shape = shapes[keys] = Shape(keys)
+        out.append(UnitRecord(shape, tuple(_shared(v, memo) for v in d.values())))
+    return out
+
+def column(records, field, default=0):
+    """[r.get(field, default) for r in records], one lookup per run of equal Shapes."""
+    out = []
+    shape = i = None
+    for r in records:
+        if r.shape is not shape:
+            shape = r.shape
+            i = shape.index.get(field)
+        out.append(default if i is None else r.row[i])
+    return out
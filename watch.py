@@ -0,0 +1,266 @@
+"""
+Watch mode: regenerate the derived artifacts whenever their inputs are saved.
+
+Keeps the parsed dump(s) and the last config in memory and polls the input
+files. A burst of writes (an editor's save, or the in-game `!b` -> JSON menu
+writing the config) is debounced into one event; then only the affected
+outputs are rebuilt:
+
+  config saved            diff against the previous config; if anything
+                          changed, rebuild the sheet incrementally (only the
+                          tabs of the changed units, see tab_cache.py)
+  dump replaced           reload it (via .cache/), rebuild the sheet, and the
+                          default config when it is built from the same dump
+  --default-dump replaced rebuild the default config
+  generate_tech_trees.py  reload it and re-render the tech-tree PDFs (their
+                          data and proposed changes live in that script)
+
+A config that does not parse (e.g. caught mid-write) is reported and the
+previous one kept until the next save.
+
+Run: E:/Anaconda/python.exe watch.py [--dump PATH] [--config PATH]
+         [--default-dump PATH] [--output PATH] [--default-output PATH]
+         [--pdf-dir DIR] [--only sheet,default,pdf] [--poll S] [--debounce S]
+  --only  outputs to keep up to date (default: all); each is built once at
+          start-up, then on change. Stop with Ctrl+C.
+"""
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+import build_balance_sheet
+import gen_default_config
+
+OUTPUTS = ("sheet", "default", "pdf")
+PDF_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generate_tech_trees.py")
+POLL_S = 0.1       # how often the input files are stat'ed
+DEBOUNCE_S = 0.25  # quiet time after the last write before rebuilding
+
+# ══════════════════════════════════════════════════════════════
+# FILE EVENTS
+# ══════════════════════════════════════════════════════════════
+
+def stat_key(path):
+    """(mtime_ns, size) of path, or None while it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def wait_for_changes(paths, seen, poll=POLL_S, debounce=DEBOUNCE_S):
+    """Block until some of paths change, then until they stay quiet.
+
+    seen is {path: stat_key} from the previous call and is updated in place.
+    Returns the set of paths that changed.
+    """
+    changed = set()
+    quiet_since = None
+    while True:
+        time.sleep(poll)
+        for path in paths:
+            key = stat_key(path)
+            if key != seen.get(path):
+                seen[path] = key
+                changed.add(path)
+                quiet_since = time.monotonic()
+        if changed and time.monotonic() - quiet_since >= debounce:
+            return changed
+
+# ══════════════════════════════════════════════════════════════
+# CONFIG DIFF
+# ══════════════════════════════════════════════════════════════
+
+def config_diff(old, new):
+    """Names of the units whose entries differ, and the other top-level keys that do."""
+    old_units, new_units = old.get("units", {}), new.get("units", {})
+    units = sorted(n for n in set(old_units) | set(new_units)
+                   if old_units.get(n) != new_units.get(n))
+    keys = sorted(k for k in set(old) | set(new)
+                  if k != "units" and old.get(k) != new.get(k))
+    return units, keys
+
+def describe_diff(units, keys):
+    parts = []
+    if units:
+        shown = ", ".join(units[:5]) + (f" (+{len(units) - 5})" if len(units) > 5 else "")
+        parts.append(f"units: {shown}")
+    if keys:
+        parts.append(", ".join(keys))
+    return "; ".join(parts)
+
+# ══════════════════════════════════════════════════════════════
+# SESSION — the resident model and the rebuild steps
+# ══════════════════════════════════════════════════════════════
+
+class Session:
+    def __init__(self, opts):
+        self.opts = opts
+        self.only = opts.only
+        self.table = None          # sheet dump
+        self.default_table = None  # default-config dump (may be self.table)
+        self.config = None
+        self.tech_trees = None     # generate_tech_trees, imported on first render
+
+    def watched(self):
+        """Input file -> what to do when it changes."""
+        paths = {}
+        if "sheet" in self.only:
+            paths[self.opts.config] = "config"
+        if "sheet" in self.only or ("default" in self.only and not self.opts.default_dump):
+            paths[self.opts.dump] = "dump"
+        if "default" in self.only and self.opts.default_dump:
+            paths[self.opts.default_dump] = "default_dump"
+        if "pdf" in self.only:
+            paths[PDF_SOURCE] = "pdf_source"
+        return paths
+
+    def load(self):
+        if "sheet" in self.only or ("default" in self.only and not self.opts.default_dump):
+            self.table = build_balance_sheet.load_dump(self.opts.dump)
+        if "sheet" in self.only:
+            self.config = build_balance_sheet.load_config(self.opts.config)
+        if "default" in self.only:
+            self.default_table = (gen_default_config.load_dump(self.opts.default_dump)
+                                  if self.opts.default_dump else self.table)
+
+    # ── Rebuild steps (each prints one line) ──
+
+    def _timed(self, label, fn):
+        t = time.perf_counter()
+        try:
+            detail = fn()
+        except Exception as ex:
+            print(f"  {label}: FAILED ({type(ex).__name__}: {ex})")
+            return
+        print(f"  {label}: {detail} ({time.perf_counter() - t:.2f}s)")
+
+    def build_sheet(self):
+        def run():
+            wb = build_balance_sheet.build_workbook(self.table, self.config, self.opts.output,
+                                                   incremental=True)
+            return f"{len(wb.rebuilt_tabs)}/{len(wb.sheetnames)} tabs -> {self.opts.output}"
+        self._timed("sheet", run)
+
+    def build_default(self):
+        def run():
+            config = gen_default_config.build_default_config(self.default_table["by_name"])
+            with open(self.opts.default_output, "w") as f:
+                json.dump(config, f, indent=4)
+            return f"-> {self.opts.default_output}"
+        self._timed("default", run)
+
+    def build_pdfs(self, reload=False):
+        if self.tech_trees is None:
+            import generate_tech_trees
+            self.tech_trees = generate_tech_trees
+        elif reload:
+            self.tech_trees = importlib.reload(self.tech_trees)
+        out_dir = self.opts.pdf_dir or self.tech_trees.OUTPUT_DIR
+        for faction in self.tech_trees.FACTION_PDFS:
+            self._timed(f"pdf:{faction}",
+                        lambda f=faction: f"-> {self.tech_trees.render_faction(f, out_dir)}")
+
+    def build_all(self):
+        if "sheet" in self.only:
+            self.build_sheet()
+        if "default" in self.only:
+            self.build_default()
+        if "pdf" in self.only:
+            self.build_pdfs()
+
+    # ── Events ──
+
+    def handle(self, events):
+        """Rebuild what the changed inputs ({'config', 'dump', ...}) affect."""
+        sheet = default = pdf = False
+        if "dump" in events:
+            try:
+                table = build_balance_sheet.load_dump(self.opts.dump)
+            except (OSError, ValueError) as ex:
+                print(f"  dump not readable, keeping the previous one ({ex})")
+            else:
+                self.table = table
+                print("  dump reloaded")
+                sheet = "sheet" in self.only
+                if "default" in self.only and not self.opts.default_dump:
+                    self.default_table = self.table
+                    default = True
+        if "default_dump" in events:
+            try:
+                table = gen_default_config.load_dump(self.opts.default_dump)
+            except (OSError, ValueError) as ex:
+                print(f"  default dump not readable, keeping the previous one ({ex})")
+            else:
+                self.default_table = table
+                print("  default dump reloaded")
+                default = True
+        if "config" in events:
+            try:
+                config = build_balance_sheet.load_config(self.opts.config)
+            except (OSError, ValueError) as ex:
+                print(f"  config not readable, keeping the previous one ({ex})")
+            else:
+                units, keys = config_diff(self.config, config)
+                self.config = config
+                if units or keys:
+                    print(f"  config changed: {describe_diff(units, keys)}")
+                    sheet = True
+                elif not sheet:
+                    print("  config saved without changes")
+        if "pdf_source" in events:
+            pdf = True
+
+        if sheet:
+            self.build_sheet()
+        if default:
+            self.build_default()
+        if pdf:
+            self.build_pdfs(reload=True)
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Rebuild sheet, default config and PDFs on save.")
+    ap.add_argument("--dump", default=build_balance_sheet.DUMP_PATH)
+    ap.add_argument("--config", default=build_balance_sheet.CONFIG_PATH)
+    ap.add_argument("--default-dump", default=None)
+    ap.add_argument("--output", default=build_balance_sheet.OUTPUT_PATH)
+    ap.add_argument("--default-output", default=gen_default_config.OUTPUT_PATH)
+    ap.add_argument("--pdf-dir", default=None,
+                    help="tech-tree PDF directory (default: generate_tech_trees.OUTPUT_DIR)")
+    ap.add_argument("--only", default=",".join(OUTPUTS),
+                    help="comma-separated subset of: " + ", ".join(OUTPUTS))
+    ap.add_argument("--poll", type=float, default=POLL_S, help="seconds between checks")
+    ap.add_argument("--debounce", type=float, default=DEBOUNCE_S,
+                    help="quiet seconds after the last write before rebuilding")
+    opts = ap.parse_args(argv)
+
+    opts.only = [s.strip() for s in opts.only.split(",") if s.strip()]
+    unknown = [s for s in opts.only if s not in OUTPUTS]
+    if unknown:
+        ap.error(f"unknown output(s): {', '.join(unknown)}")
+
+    session = Session(opts)
+    session.load()
+    watched = session.watched()
+    seen = {path: stat_key(path) for path in watched}
+    print("Initial build:")
+    session.build_all()
+
+    print(f"Watching {len(watched)} file(s), Ctrl+C to stop:")
+    for path, kind in watched.items():
+        print(f"  {kind:13s} {path}")
+    try:
+        while True:
+            changed = wait_for_changes(list(watched), seen, opts.poll, opts.debounce)
+            print(f"[{time.strftime('%H:%M:%S')}] "
+                  + ", ".join(os.path.basename(p) for p in sorted(changed)))
+            session.handle({watched[p] for p in changed})
+    except KeyboardInterrupt:
+        print("Stopped.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())